@@ -0,0 +1,103 @@
+"""
+Agent Pool — build each CrewAI agent once and reuse it across requests.
+
+Constructing an Agent also builds its LLM client and CrewAI internals, so
+doing it on every HTTP call is pure overhead. Agents are not safe to run
+concurrently (a Crew mutates the agent it kicks off), so the pool hands
+out exclusive leases: an idle agent is reused, and a new one is built
+only when every pooled agent of that kind (and model, and sampling
+settings) is busy. An agent whose run raised (or was cancelled) is
+dropped rather than pooled.
+
+A reused agent keeps CrewAI's running token count from its earlier runs;
+crew_runner.py reports each run's usage as the difference, so the pool
+never touches agent internals.
+"""
+
+import threading
+from typing import Optional
+from collections import defaultdict
+from contextlib import contextmanager
+
+from agents import (
+    LLM_MODEL,
+    create_screening_agent,
+    create_technical_agent,
+    create_scenario_agent,
+    create_hiring_committee_agent,
+)
+
+AGENT_FACTORIES = {
+    "screening": create_screening_agent,
+    "technical": create_technical_agent,
+    "scenario": create_scenario_agent,
+    "hiring_committee": create_hiring_committee_agent,
+}
+
+
+class AgentPool:
+    """Per-process pool of agents, keyed by (kind, streaming, model, sampling)."""
+
+    def __init__(self, max_idle_per_kind: int = 8):
+        self.max_idle_per_kind = max_idle_per_kind
+        self._idle = defaultdict(list)
+        self._lock = threading.Lock()
+        self.stats = {"created": 0, "reused": 0, "discarded": 0}
+
+    @staticmethod
+    def _key(kind: str, stream: bool, model: Optional[str], sampling: Optional[dict]) -> tuple:
+        return (kind, stream, model or LLM_MODEL, tuple(sorted((sampling or {}).items())))
+
+    def acquire(
+        self,
+        kind: str,
+        stream: bool = False,
+        model: Optional[str] = None,
+        sampling: Optional[dict] = None,
+    ):
+        key = self._key(kind, stream, model, sampling)
+        with self._lock:
+            if self._idle[key]:
+                self.stats["reused"] += 1
+                return self._idle[key].pop()
+            self.stats["created"] += 1
+        return AGENT_FACTORIES[kind](stream=stream, model=model, **(sampling or {}))
+
+    def release(
+        self,
+        kind: str,
+        stream: bool,
+        agent,
+        model: Optional[str] = None,
+        sampling: Optional[dict] = None,
+    ) -> None:
+        key = self._key(kind, stream, model, sampling)
+        with self._lock:
+            if len(self._idle[key]) < self.max_idle_per_kind:
+                self._idle[key].append(agent)
+
+    @contextmanager
+    def lease(
+        self,
+        kind: str,
+        stream: bool = False,
+        model: Optional[str] = None,
+        sampling: Optional[dict] = None,
+    ):
+        """Exclusive use of a pooled agent for the duration of one crew run."""
+        agent = self.acquire(kind, stream, model, sampling)
+        try:
+            yield agent
+        except BaseException:
+            # A failed or cancelled run may have left the agent mid-task (or
+            # still running in a worker thread): never hand it out again
+            with self._lock:
+                self.stats["discarded"] += 1
+            raise
+        self.release(kind, stream, agent, model, sampling)
+
+    def warm(self) -> None:
+        """Pre-build one non-streaming agent of every kind."""
+        for kind in AGENT_FACTORIES:
+            with self.lease(kind):
+                pass
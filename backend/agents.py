@@ -5,18 +5,47 @@ Each agent has a clear, isolated responsibility and receives
 only the context it is explicitly given (AGENT CONTEXT principle).
 """
 
-from crewai import Agent
+import os
+from typing import TYPE_CHECKING, Optional
 
-# LLM model — Gemini 2.5 Flash via LiteLLM provider prefix
-LLM_MODEL = "gemini/gemini-2.5-flash"
+import prompts
 
+if TYPE_CHECKING:  # CrewAI is imported on first use (warmup.py)
+    from crewai import Agent
 
-def create_screening_agent() -> Agent:
+# LLM model — Gemini 2.5 Flash via LiteLLM provider prefix.
+# LLM_MODEL=fake/<name> swaps in the offline fake provider (fake_llm.py).
+LLM_MODEL = os.getenv("LLM_MODEL", "gemini/gemini-2.5-flash")
+if LLM_MODEL.startswith("fake/"):
+    import fake_llm
+
+    fake_llm.register()
+
+# CrewAI step-by-step console logging (costly on the hot path; off by default)
+CREW_VERBOSE = os.getenv("CREW_VERBOSE", "0") == "1"
+
+
+def _llm(stream: bool = False, model: Optional[str] = None, **sampling):
+    """
+    Model spec for an agent (LLM_MODEL unless routed elsewhere — see
+    model_router.py). sampling sets LLM parameters such as temperature / seed.
+    """
+    model = model or LLM_MODEL
+    if stream or sampling or prompts.uses_cached_context(model):
+        return prompts.llm_class(model)(model=model, stream=stream, **sampling)
+    return model
+
+
+def create_screening_agent(
+    stream: bool = False, model: Optional[str] = None, **sampling
+) -> "Agent":
     """
     Round 1 — Screening Agent.
     Input: Resume only.
     Evaluates: Role fit, skill coverage, experience level.
     """
+    from crewai import Agent
+
     return Agent(
         role="Senior Technical Recruiter",
         goal=(
@@ -30,19 +59,23 @@ def create_screening_agent() -> Agent:
             "education background, and career progression. You are thorough but fair, "
             "giving candidates the benefit of the doubt when evidence is borderline."
         ),
-        llm=LLM_MODEL,
-        verbose=True,
+        llm=_llm(stream, model, **sampling),
+        verbose=CREW_VERBOSE,
         allow_delegation=False,
     )
 
 
-def create_technical_agent() -> Agent:
+def create_technical_agent(
+    stream: bool = False, model: Optional[str] = None, **sampling
+) -> "Agent":
     """
     Round 2 — Technical Agent.
-    Input: Resume + round1.txt verdict.
+    Input: Resume + round1 verdict.
     Asks: 2-3 role-specific technical questions.
     Evaluates: Correctness, depth, structure.
     """
+    from crewai import Agent
+
     return Agent(
         role="Senior Technical Interviewer",
         goal=(
@@ -57,19 +90,23 @@ def create_technical_agent() -> Agent:
             "clear reasoning, awareness of trade-offs, and practical problem-solving "
             "over memorized textbook answers."
         ),
-        llm=LLM_MODEL,
-        verbose=True,
+        llm=_llm(stream, model, **sampling),
+        verbose=CREW_VERBOSE,
         allow_delegation=False,
     )
 
 
-def create_scenario_agent() -> Agent:
+def create_scenario_agent(
+    stream: bool = False, model: Optional[str] = None, **sampling
+) -> "Agent":
     """
     Round 3 — Scenario / Behavioral Agent.
-    Input: Resume + round1.txt + round2.txt.
+    Input: Resume + round1 + round2.
     Asks: 1 realistic production/scenario question.
     Evaluates: Decision-making, trade-offs, practical thinking.
     """
+    from crewai import Agent
+
     return Agent(
         role="Engineering Manager — Scenario Interviewer",
         goal=(
@@ -84,19 +121,23 @@ def create_scenario_agent() -> Agent:
             "communicate trade-offs clearly, and make sound decisions under pressure. "
             "You design scenarios that test real-world judgment, not trivia."
         ),
-        llm=LLM_MODEL,
-        verbose=True,
+        llm=_llm(stream, model, **sampling),
+        verbose=CREW_VERBOSE,
         allow_delegation=False,
     )
 
 
-def create_hiring_committee_agent() -> Agent:
+def create_hiring_committee_agent(
+    stream: bool = False, model: Optional[str] = None, **sampling
+) -> "Agent":
     """
     Final Round — Hiring Committee Agent.
-    Input: ONLY verdict files (round1.txt + round2.txt + round3.txt).
+    Input: ONLY verdicts (round1 + round2 + round3).
     Does NOT see the resume or raw candidate answers.
     Makes: Final HIRE / HOLD / REJECT decision.
     """
+    from crewai import Agent
+
     return Agent(
         role="Hiring Committee Chair",
         goal=(
@@ -112,7 +153,7 @@ def create_hiring_committee_agent() -> Agent:
             "and consider the overall signal strength. You are calibrated, "
             "consistent, and prioritize evidence over gut feeling."
         ),
-        llm=LLM_MODEL,
-        verbose=True,
+        llm=_llm(stream, model, **sampling),
+        verbose=CREW_VERBOSE,
         allow_delegation=False,
     )
@@ -0,0 +1,76 @@
+"""
+Agent Pool Benchmark — per-request agent construction overhead.
+
+Compares building all four agents fresh on every "request" (the old
+behaviour) with leasing them from the AgentPool. No LLM calls are made;
+this isolates Agent / LLM client / CrewAI construction cost.
+
+Usage (from backend/):
+    python -m benchmarks.agent_pool_bench --requests 50
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crewai import Crew, Task  # noqa: E402
+
+from agent_pool import AGENT_FACTORIES, AgentPool  # noqa: E402
+
+
+def _one_request(get_agent) -> float:
+    """Build a one-task crew for every agent kind; return elapsed ms."""
+    start = time.perf_counter()
+    for kind in AGENT_FACTORIES:
+        agent = get_agent(kind)
+        task = Task(description="noop", expected_output="noop", agent=agent)
+        Crew(agents=[agent], tasks=[task], verbose=False)
+    return (time.perf_counter() - start) * 1000
+
+
+def _summary(samples: list) -> dict:
+    ordered = sorted(samples)
+    return {
+        "mean_ms": round(statistics.mean(ordered), 3),
+        "p50_ms": round(ordered[len(ordered) // 2], 3),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1], 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    fresh = [
+        _one_request(lambda kind: AGENT_FACTORIES[kind]())
+        for _ in range(args.requests)
+    ]
+
+    pool = AgentPool()
+    pool.warm()
+
+    def pooled_agent(kind):
+        agent = pool.acquire(kind)
+        pool.release(kind, False, agent)
+        return agent
+
+    pooled = [_one_request(pooled_agent) for _ in range(args.requests)]
+
+    fresh_stats, pooled_stats = _summary(fresh), _summary(pooled)
+    print(json.dumps({
+        "requests": args.requests,
+        "fresh": fresh_stats,
+        "pooled": pooled_stats,
+        "saved_per_request_ms": round(fresh_stats["mean_ms"] - pooled_stats["mean_ms"], 3),
+        "pool": pool.stats,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
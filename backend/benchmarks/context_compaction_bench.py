@@ -0,0 +1,235 @@
+"""
+Context Compaction Benchmark — prompt tokens per round, with and without compaction.
+
+Builds every round's task prompt twice — full resume + full verdicts, and
+compacted profile + verdict summaries — and reports the input tokens each
+one costs. Verdicts come from backend/verdicts/ (or --verdicts-dir). No
+LLM calls are made in this mode.
+
+--agreement N additionally runs the evaluation rounds N times each way
+against the live model and reports how often the two decisions agree,
+so compaction can be checked for quality as well as size.
+
+Usage (from backend/):
+    python -m benchmarks.context_compaction_bench --resume resume.txt
+    python -m benchmarks.context_compaction_bench --resume resume.txt --agreement 3
+"""
+
+import os
+import sys
+import json
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_pool import AGENT_FACTORIES  # noqa: E402
+from agents import LLM_MODEL  # noqa: E402
+from context_compaction import VERDICT_MODELS, compact_resume, verdict_context  # noqa: E402
+from schemas import (  # noqa: E402
+    ScreeningVerdict,
+    TechnicalVerdict,
+    ScenarioVerdict,
+    HiringDecision,
+    ScenarioQuestion,
+)
+from tasks import (  # noqa: E402
+    create_screening_task,
+    create_technical_question_task,
+    create_technical_evaluation_task,
+    create_scenario_question_task,
+    create_scenario_evaluation_task,
+    create_hiring_decision_task,
+)
+
+DEFAULT_VERDICTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "verdicts")
+SAMPLE_ANSWER = "(candidate answer — identical in both variants)"
+
+
+def _count_tokens(text: str) -> int:
+    try:
+        import litellm
+
+        return litellm.token_counter(model=LLM_MODEL, text=text)
+    except Exception:
+        return len(text) // 4
+
+
+def _contexts(resume: str, verdicts: dict, compact: bool) -> tuple:
+    """(resume context, {round name: verdict context}) for one variant."""
+    if not compact:
+        return resume, dict(verdicts)
+    return compact_resume(resume), {
+        name: verdict_context(name, text, None) for name, text in verdicts.items()
+    }
+
+
+def _round_prompts(resume: str, role: str, verdicts: dict, compact: bool) -> dict:
+    """Task description for every round, keyed by round step."""
+    agents = {kind: factory() for kind, factory in AGENT_FACTORIES.items()}
+    profile, ctx = _contexts(resume, verdicts, compact)
+    questions = "\n".join(
+        ScreeningVerdict.from_text(verdicts["round1"]).recommended_questions
+    )
+    builders = {
+        # Screening always reads the full resume
+        "screening": lambda: create_screening_task(agents["screening"], resume, role),
+        "technical_questions": lambda: create_technical_question_task(
+            agents["technical"], profile, ctx["round1"]
+        ),
+        "technical_evaluation": lambda: create_technical_evaluation_task(
+            agents["technical"], profile, ctx["round1"], questions, SAMPLE_ANSWER
+        ),
+        "scenario_question": lambda: create_scenario_question_task(
+            agents["scenario"], profile, ctx["round1"], ctx["round2"]
+        ),
+        "scenario_evaluation": lambda: create_scenario_evaluation_task(
+            agents["scenario"], profile, ctx["round1"], ctx["round2"],
+            "(scenario question)", SAMPLE_ANSWER,
+        ),
+        "hiring_committee": lambda: create_hiring_decision_task(
+            agents["hiring_committee"], ctx["round1"], ctx["round2"], ctx["round3"]
+        ),
+    }
+    return {step: build().description for step, build in builders.items()}
+
+
+def measure_tokens(resume: str, role: str, verdicts: dict) -> dict:
+    full = _round_prompts(resume, role, verdicts, compact=False)
+    compact = _round_prompts(resume, role, verdicts, compact=True)
+    report = {}
+    for step in full:
+        full_tokens, compact_tokens = _count_tokens(full[step]), _count_tokens(compact[step])
+        report[step] = {
+            "full_tokens": full_tokens,
+            "compact_tokens": compact_tokens,
+            "saved_tokens": full_tokens - compact_tokens,
+            "saved_pct": round(100 * (full_tokens - compact_tokens) / full_tokens, 1),
+        }
+    total_full = sum(r["full_tokens"] for r in report.values())
+    total_compact = sum(r["compact_tokens"] for r in report.values())
+    report["total"] = {
+        "full_tokens": total_full,
+        "compact_tokens": total_compact,
+        "saved_tokens": total_full - total_compact,
+        "saved_pct": round(100 * (total_full - total_compact) / total_full, 1),
+    }
+    return report
+
+
+# ── Agreement (live LLM) ────────────────────────────────────────────
+
+
+async def _evaluate_both_ways(resume: str, role: str, answers: dict) -> dict:
+    """
+    One live interview. Each evaluation round is judged twice, on full and on
+    compacted context; later rounds build on the full-context verdict.
+    """
+    from crew_runner import _run_task
+    import llm_cache
+
+    async def run(kind, build, model):
+        return model.from_output(await _run_task(kind, build))
+
+    async def both_ways(kind, build, model) -> dict:
+        results = {}
+        for compact in (False, True):
+            profile, ctx = _contexts(resume, verdicts, compact)
+            results[compact] = await run(kind, lambda a: build(a, profile, ctx), model)
+        return results
+
+    decisions = {}
+    with llm_cache.bypassing(True):
+        round1 = await run(
+            "screening", lambda a: create_screening_task(a, resume, role), ScreeningVerdict
+        )
+        verdicts = {"round1": round1.render(role)}
+        questions = "\n".join(round1.recommended_questions)
+
+        round2 = await both_ways(
+            "technical",
+            lambda a, p, c: create_technical_evaluation_task(
+                a, p, c["round1"], questions, answers["round2"]
+            ),
+            TechnicalVerdict,
+        )
+        decisions["technical_evaluation"] = (round2[False].decision, round2[True].decision)
+        verdicts["round2"] = round2[False].render()
+
+        scenario = (await run(
+            "scenario",
+            lambda a: create_scenario_question_task(
+                a, resume, verdicts["round1"], verdicts["round2"]
+            ),
+            ScenarioQuestion,
+        )).question
+        round3 = await both_ways(
+            "scenario",
+            lambda a, p, c: create_scenario_evaluation_task(
+                a, p, c["round1"], c["round2"], scenario, answers["round3"]
+            ),
+            ScenarioVerdict,
+        )
+        decisions["scenario_evaluation"] = (round3[False].decision, round3[True].decision)
+        verdicts["round3"] = round3[False].render()
+
+        final = await both_ways(
+            "hiring_committee",
+            lambda a, p, c: create_hiring_decision_task(
+                a, c["round1"], c["round2"], c["round3"]
+            ),
+            HiringDecision,
+        )
+        decisions["hiring_committee"] = (final[False].decision, final[True].decision)
+    return decisions
+
+
+def measure_agreement(resume: str, role: str, answers: dict, trials: int) -> dict:
+    report = {}
+    for _ in range(trials):
+        for step, (full, compact) in asyncio.run(
+            _evaluate_both_ways(resume, role, answers)
+        ).items():
+            entry = report.setdefault(step, {"trials": 0, "agreed": 0, "pairs": []})
+            entry["trials"] += 1
+            entry["agreed"] += full == compact
+            entry["pairs"].append({"full": full, "compact": compact})
+    for entry in report.values():
+        entry["agreement"] = round(entry["agreed"] / entry["trials"], 3)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resume", required=True, help="path to a plain-text resume")
+    parser.add_argument("--role", default="AI Engineer")
+    parser.add_argument("--verdicts-dir", default=DEFAULT_VERDICTS_DIR)
+    parser.add_argument("--answers", help='JSON file: {"round2": "...", "round3": "..."}')
+    parser.add_argument("--agreement", type=int, default=0, metavar="N",
+                        help="live trials per evaluation round (calls the LLM)")
+    args = parser.parse_args()
+
+    with open(args.resume) as f:
+        resume = f.read()
+    verdicts = {}
+    for name in VERDICT_MODELS:
+        with open(os.path.join(args.verdicts_dir, f"{name}.txt")) as f:
+            verdicts[name] = f.read()
+
+    output = {
+        "model": LLM_MODEL,
+        "resume_chars": len(resume),
+        "profile_chars": len(compact_resume(resume)),
+        "tokens_per_round": measure_tokens(resume, args.role, verdicts),
+    }
+    if args.agreement:
+        answers = {"round2": SAMPLE_ANSWER, "round3": SAMPLE_ANSWER}
+        if args.answers:
+            with open(args.answers) as f:
+                answers.update(json.load(f))
+        output["agreement"] = measure_agreement(resume, args.role, answers, args.agreement)
+    print(json.dumps(output, indent=2))
+
+
+if __name__ == "__main__":
+    main()
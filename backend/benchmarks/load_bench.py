@@ -0,0 +1,268 @@
+"""
+Load Benchmark — end-to-end interview throughput and latency.
+
+Drives complete interviews through the HTTP API at a fixed concurrency:
+/start → /round/2/answer → /round/3/answer → /final-decision. Reports
+p50/p95/p99 latency per endpoint, throughput and error rates, and can
+export the results as JSON to track regressions between commits.
+
+By default the app runs in-process on the fake LLM provider (fake_llm.py),
+with every data file in a temporary directory, the LLM cache and question
+bank off and the client-side rate limits disabled — so no quota is used
+and runs are repeatable. FAKE_LLM_* variables shape the provider (latency,
+token rate, injected 429s); any variable already set is left alone.
+--url benchmarks a running server instead (start it with LLM_MODEL=fake/...).
+
+Usage (from backend/):
+    python -m benchmarks.load_bench --interviews 50 --concurrency 10
+    FAKE_LLM_429_RATE=0.05 python -m benchmarks.load_bench --output bench.json
+    MODEL_ROUTING=cascade python -m benchmarks.load_bench --output cascade.json
+    FAKE_LLM_CACHE_MIN_TOKENS=256 PROMPT_CACHE=explicit python -m benchmarks.load_bench
+    python -m benchmarks.load_bench --url http://localhost:8000 --interviews 20
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from contextlib import asynccontextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ENDPOINTS = ["/start", "/round/2/answer", "/round/3/answer", "/final-decision"]
+
+SAMPLE_RESUME = """Candidate {n}
+SUMMARY
+Backend engineer with 4 years of experience building Python services.
+EXPERIENCE
+- Built FastAPI microservices on PostgreSQL and Redis serving 2k requests/s
+- Moved batch jobs to Kafka consumers running on Kubernetes
+- Cut p99 latency by 40% with query tuning and caching
+SKILLS
+Python, Go, FastAPI, PostgreSQL, Redis, Kafka, Docker, Kubernetes, AWS
+EDUCATION
+B.Tech Computer Science
+"""
+SAMPLE_ANSWER = (
+    "I would start from the request path, measure where time goes, and fix the "
+    "largest contributor first, keeping the change behind a flag."
+)
+
+
+def _configure_in_process(data_dir: str) -> None:
+    """Offline defaults for an in-process run (set before the app is imported)."""
+    defaults = {
+        "LLM_MODEL": "fake/gemini-2.5-flash",
+        "LLM_MODEL_SMALL": "fake/gemini-2.5-flash-lite",
+        "LLM_CACHE": "0",
+        "QUESTION_BANK": "0",
+        "LLM_RPM_LIMIT": "0",
+        "LLM_TPM_LIMIT": "0",
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "JOBS_DB_PATH": os.path.join(data_dir, "jobs.db"),
+        "DECISIONS_DB_PATH": os.path.join(data_dir, "decisions.db"),
+        "RATE_LIMIT_DB_PATH": os.path.join(data_dir, "ratelimit.db"),
+        "QUESTION_BANK_DB_PATH": os.path.join(data_dir, "question_bank.db"),
+        "PRESCREEN_INDEX_PATH": os.path.join(data_dir, "prescreen_index.npz"),
+        "LLM_CACHE_DIR": os.path.join(data_dir, "llm_cache"),
+        "RESUME_DB_PATH": os.path.join(data_dir, "resumes.db"),
+    }
+    for name, value in defaults.items():
+        os.environ.setdefault(name, value)
+
+
+@asynccontextmanager
+async def _client(url: str):
+    import httpx
+
+    timeout = httpx.Timeout(600.0)
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=timeout) as client:
+            yield client
+        return
+
+    from main import app
+
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=timeout
+        ) as client:
+            yield client
+    finally:
+        await app.router.shutdown()
+
+
+class Recorder:
+    """Latency samples and error counts per endpoint."""
+
+    def __init__(self):
+        self.requests = {endpoint: 0 for endpoint in ENDPOINTS}
+        self.samples = {endpoint: [] for endpoint in ENDPOINTS}
+        self.errors = {endpoint: {} for endpoint in ENDPOINTS}
+
+    async def call(self, client, method: str, endpoint: str, **kwargs):
+        """One request; returns the JSON body, or None if it failed."""
+        self.requests[endpoint] += 1
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, endpoint, **kwargs)
+        except Exception as e:
+            self._error(endpoint, type(e).__name__)
+            return None
+        self.samples[endpoint].append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            self._error(endpoint, str(response.status_code))
+            return None
+        return response.json()
+
+    def _error(self, endpoint: str, kind: str) -> None:
+        self.errors[endpoint][kind] = self.errors[endpoint].get(kind, 0) + 1
+
+
+async def _interview(client, recorder: Recorder, n: int, role: str) -> str:
+    """Run one candidate as far as they get; returns how the interview ended."""
+    started = await recorder.call(
+        client, "POST", "/start", json={"resume": SAMPLE_RESUME.format(n=n), "role": role}
+    )
+    if started is None:
+        return "error"
+    if started.get("status") != "ONGOING":
+        return "rejected"
+    interview_id = started["interview_id"]
+
+    for round_number in (2, 3):
+        endpoint = f"/round/{round_number}/answer"
+        result = await recorder.call(
+            client, "POST", endpoint,
+            json={"interview_id": interview_id, "answer": SAMPLE_ANSWER},
+        )
+        if result is None:
+            return "error"
+        if result.get("status") == "REJECTED":
+            return "rejected"
+
+    final = await recorder.call(
+        client, "GET", "/final-decision", params={"interview_id": interview_id}
+    )
+    return "error" if final is None else "completed"
+
+
+def _percentile(ordered: list, q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def _endpoint_report(requests: int, samples: list, errors: dict, duration: float) -> dict:
+    failed = sum(errors.values())
+    report = {
+        "requests": requests,
+        "errors": failed,
+        "error_rate": round(failed / requests, 4) if requests else 0.0,
+        "errors_by_kind": errors,
+        "throughput_rps": round(requests / duration, 3) if duration else 0.0,
+    }
+    if samples:
+        ordered = sorted(samples)
+        report.update(
+            mean_ms=round(statistics.mean(ordered), 1),
+            p50_ms=round(_percentile(ordered, 50), 1),
+            p95_ms=round(_percentile(ordered, 95), 1),
+            p99_ms=round(_percentile(ordered, 99), 1),
+            max_ms=round(ordered[-1], 1),
+        )
+    return report
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+async def run(interviews: int, concurrency: int, role: str, url: str) -> dict:
+    recorder = Recorder()
+    semaphore = asyncio.Semaphore(concurrency)
+    async with _client(url) as client:
+
+        async def one(n: int) -> str:
+            async with semaphore:
+                return await _interview(client, recorder, n, role)
+
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(*(one(n) for n in range(interviews)))
+        duration = time.perf_counter() - start
+        models = await client.get("/models/stats")
+
+    ended = {kind: outcomes.count(kind) for kind in ("completed", "rejected", "error")}
+    total_requests = sum(recorder.requests.values())
+    return {
+        "config": {
+            "interviews": interviews,
+            "concurrency": concurrency,
+            "role": role,
+            "target": url or "in-process",
+            "llm_model": os.getenv("LLM_MODEL", ""),
+            "llm_model_small": os.getenv("LLM_MODEL_SMALL", ""),
+            "model_routing": os.getenv("MODEL_ROUTING", "single"),
+            "prompt_cache": os.getenv("PROMPT_CACHE", "implicit"),
+            "technical_evaluation": os.getenv("TECHNICAL_EVALUATION", "single"),
+            "committee_samples": os.getenv("COMMITTEE_SAMPLES", "1"),
+            "fake_llm": {k: v for k, v in os.environ.items() if k.startswith("FAKE_LLM_")},
+            "crew_max_concurrency": os.getenv("CREW_MAX_CONCURRENCY", "8"),
+        },
+        "environment": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "duration_seconds": round(duration, 3),
+        "interviews": ended,
+        "interviews_per_second": round(ended["completed"] / duration, 3),
+        "requests_per_second": round(total_requests / duration, 3),
+        "endpoints": {
+            endpoint: _endpoint_report(
+                recorder.requests[endpoint], recorder.samples[endpoint],
+                recorder.errors[endpoint], duration,
+            )
+            for endpoint in ENDPOINTS
+        },
+        # Latency / cost per model tier and cascade escalations (model_router.py)
+        "models": models.json() if models.status_code == 200 else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--interviews", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--role", default="Backend Developer")
+    parser.add_argument("--url", default="", help="benchmark a running server instead")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="interview-bench-") as data_dir:
+        if not args.url:
+            _configure_in_process(data_dir)
+        report = asyncio.run(run(args.interviews, args.concurrency, args.role, args.url))
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Scale-out Check — several API workers on one shared backend, under concurrent load.
+
+Starts --workers independent uvicorn processes on the fake LLM provider,
+all sharing one temporary data directory: sqlite session backend,
+decision memory, job queue, rate limiter, LLM cache and question bank.
+Every request goes to a randomly chosen worker (no sticky sessions).
+Then it checks that:
+  - every interview ends (completed / rejected) without a 5xx, and every
+    worker served part of the traffic
+  - a round answer or final-decision request sent to several workers at
+    once runs exactly once: one 200, the duplicates 409
+  - decision memory holds exactly one verdict per step the session says
+    was reached
+Prints a JSON report and exits non-zero if any check fails.
+
+Usage (from backend/):
+    python -m benchmarks.scale_out_check --workers 3 --interviews 30 --races 10
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.load_bench import SAMPLE_ANSWER, SAMPLE_RESUME, _configure_in_process
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_TIMEOUT_SECONDS = 120
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_workers(count: int, show_logs: bool = False) -> list:
+    """Launch count uvicorn processes; returns [(process, base URL)]."""
+    workers = []
+    for _ in range(count):
+        port = _free_port()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+            cwd=BACKEND_DIR,
+            env=os.environ.copy(),
+            stdout=None if show_logs else subprocess.DEVNULL,
+            stderr=None if show_logs else subprocess.DEVNULL,
+        )
+        workers.append((process, f"http://127.0.0.1:{port}"))
+    return workers
+
+
+async def _wait_ready(client, urls: list) -> None:
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    pending = set(urls)
+    while pending:
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Workers did not start: {sorted(pending)}")
+        for url in list(pending):
+            try:
+                if (await client.get(f"{url}/")).status_code == 200:
+                    pending.discard(url)
+            except Exception:
+                pass
+        await asyncio.sleep(0.5)
+
+
+class Cluster:
+    """Sends each request to a random worker and tallies the outcomes."""
+
+    def __init__(self, client, urls: list):
+        self.client = client
+        self.urls = urls
+        self.statuses = Counter()
+        self.served_by = Counter()
+
+    async def call(self, method: str, path: str, url: str = "", **kwargs):
+        url = url or random.choice(self.urls)
+        try:
+            response = await self.client.request(method, f"{url}{path}", **kwargs)
+        except Exception as e:
+            self.statuses[type(e).__name__] += 1
+            return None, None
+        self.statuses[str(response.status_code)] += 1
+        self.served_by[url] += 1
+        is_json = response.headers.get("content-type", "").startswith("application/json")
+        return response.status_code, response.json() if is_json else None
+
+
+async def _interview(cluster: Cluster, n: int, role: str) -> tuple:
+    """One interview, each step on a random worker; returns (interview_id, outcome)."""
+    status, started = await cluster.call(
+        "POST", "/start", json={"resume": SAMPLE_RESUME.format(n=n), "role": role}
+    )
+    if status != 200:
+        return None, "error"
+    interview_id = started["interview_id"]
+    if started["status"] != "ONGOING":
+        return interview_id, "rejected"
+    for round_number in (2, 3):
+        status, result = await cluster.call(
+            "POST", f"/round/{round_number}/answer",
+            json={"interview_id": interview_id, "answer": SAMPLE_ANSWER},
+        )
+        if status != 200:
+            return interview_id, "error"
+        if result["status"] == "REJECTED":
+            return interview_id, "rejected"
+    status, _ = await cluster.call("GET", "/final-decision", params={"interview_id": interview_id})
+    return interview_id, "completed" if status == 200 else "error"
+
+
+async def _race(cluster: Cluster, n: int, role: str, duplicates: int) -> tuple:
+    """
+    Send every step after /start to several workers at once.
+    Returns (interview_id, [(step, sorted statuses)]).
+    """
+    status, started = await cluster.call(
+        "POST", "/start", json={"resume": SAMPLE_RESUME.format(n=n), "role": role}
+    )
+    if status != 200 or started["status"] != "ONGOING":
+        return (started or {}).get("interview_id"), []
+    interview_id = started["interview_id"]
+    targets = random.sample(cluster.urls, min(duplicates, len(cluster.urls)))
+    answer = {"json": {"interview_id": interview_id, "answer": SAMPLE_ANSWER}}
+    outcomes = []
+    for step, method, path, kwargs in (
+        ("round2", "POST", "/round/2/answer", answer),
+        ("round3", "POST", "/round/3/answer", answer),
+        ("final", "GET", "/final-decision", {"params": {"interview_id": interview_id}}),
+    ):
+        results = await asyncio.gather(
+            *(cluster.call(method, path, url=url, **kwargs) for url in targets)
+        )
+        outcomes.append((step, sorted(status for status, _ in results)))
+        winners = [body for status, body in results if status == 200]
+        if not winners or winners[0].get("status") == "REJECTED":
+            break
+    return interview_id, outcomes
+
+
+def _expected_verdicts(state: dict) -> list:
+    """Verdict names decision memory should hold for a session in this state."""
+    reached = state["round"] if state["status"] == "REJECTED" else state["round"] - 1
+    return [f"round{r}" for r in range(1, min(reached, 3) + 1)]
+
+
+async def _check_consistency(cluster: Cluster, interview_ids: list) -> list:
+    """Problems found comparing each session with its decision memory."""
+    problems = []
+    for interview_id in interview_ids:
+        _, state = await cluster.call("GET", "/status", params={"interview_id": interview_id})
+        _, history = await cluster.call("GET", f"/verdicts/{interview_id}")
+        if state is None or history is None:
+            problems.append(f"{interview_id}: status or verdicts unavailable")
+            continue
+        counts = Counter(verdict["name"] for verdict in history["verdicts"])
+        expected = _expected_verdicts(state)
+        duplicated = sorted(name for name, count in counts.items() if count > 1)
+        if duplicated:
+            problems.append(f"{interview_id}: duplicate verdicts {duplicated}")
+        rounds = sorted(name for name in counts if name != "final")
+        if rounds != expected:
+            problems.append(
+                f"{interview_id}: session at round {state['round']} ({state['status']}) "
+                f"but decision memory has {rounds}"
+            )
+    return problems
+
+
+async def run(
+    workers: list, interviews: int, races: int, duplicates: int, concurrency: int, role: str
+) -> dict:
+    import httpx
+
+    urls = [url for _, url in workers]
+    async with httpx.AsyncClient(timeout=httpx.Timeout(600.0)) as client:
+        await _wait_ready(client, urls)
+        cluster = Cluster(client, urls)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(coro):
+            async with semaphore:
+                return await coro
+
+        start = time.perf_counter()
+        finished = await asyncio.gather(
+            *(bounded(_interview(cluster, n, role)) for n in range(interviews))
+        )
+        raced = await asyncio.gather(
+            *(bounded(_race(cluster, interviews + n, role, duplicates)) for n in range(races))
+        )
+        duration = time.perf_counter() - start
+
+        interview_ids = [i for i, _ in finished if i] + [i for i, _ in raced if i]
+        problems = await _check_consistency(cluster, interview_ids)
+
+    outcomes = Counter(outcome for _, outcome in finished)
+    race_failures = [
+        f"{interview_id} {step}: {statuses}"
+        for interview_id, steps in raced
+        for step, statuses in steps
+        if statuses.count(200) != 1 or any(status not in (200, 409) for status in statuses)
+    ]
+    server_errors = sum(
+        count for status, count in cluster.statuses.items() if not status.startswith(("2", "4"))
+    )
+    checks = {
+        "no_server_errors": server_errors == 0,
+        "interviews_finished": outcomes["error"] == 0,
+        "all_workers_served": len(cluster.served_by) == len(urls),
+        "duplicates_rejected": not race_failures,
+        "decision_memory_consistent": not problems,
+    }
+    return {
+        "config": {
+            "workers": len(urls),
+            "interviews": interviews,
+            "races": races,
+            "duplicates_per_step": duplicates,
+            "concurrency": concurrency,
+            "session_backend": os.getenv("SESSION_BACKEND"),
+        },
+        "duration_seconds": round(duration, 3),
+        "interviews": dict(outcomes),
+        "responses_by_status": dict(cluster.statuses),
+        "responses_by_worker": dict(cluster.served_by),
+        "race_steps": sum(len(steps) for _, steps in raced),
+        "race_failures": race_failures,
+        "consistency_problems": problems,
+        "checks": checks,
+        "passed": all(checks.values()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--interviews", type=int, default=30)
+    parser.add_argument(
+        "--races", type=int, default=10, help="interviews whose steps are sent to several workers"
+    )
+    parser.add_argument("--duplicates", type=int, default=3, help="workers each raced step is sent to")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--role", default="Backend Developer")
+    parser.add_argument("--worker-logs", action="store_true", help="show the workers' own output")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="interview-scale-") as data_dir:
+        _configure_in_process(data_dir)
+        os.environ.setdefault("SESSION_BACKEND", "sqlite")
+        os.environ.setdefault("SESSION_DB_PATH", os.path.join(data_dir, "sessions.db"))
+        workers = _start_workers(args.workers, args.worker_logs)
+        try:
+            report = asyncio.run(
+                run(workers, args.interviews, args.races, args.duplicates, args.concurrency, args.role)
+            )
+        finally:
+            for process, _ in workers:
+                process.terminate()
+            for process, _ in workers:
+                process.wait(timeout=30)
+
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Startup Benchmark — import time breakdown and time to warm.
+
+Each run starts a fresh interpreter with -X importtime and times three
+phases of a cold start:
+  - import main            — what a worker pays before it can serve
+  - warmup.load()          — importing CrewAI / LiteLLM (deferred, warmup.py)
+  - agent_pool.warm()      — building one agent of every kind
+and breaks the import of main down by top-level package. Reports the
+median over --runs as JSON; exits non-zero if importing main takes longer
+than --max-import-seconds or loads any --forbid package, so a heavy
+import creeping back onto the startup path fails CI.
+
+Usage (from backend/):
+    python -m benchmarks.startup_bench --runs 3
+    python -m benchmarks.startup_bench --max-import-seconds 2 --output startup.json
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.load_bench import _configure_in_process, _git_commit
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_MODULES = sorted(
+    name[:-3] for name in os.listdir(BACKEND_DIR) if name.endswith(".py")
+)
+
+# Runs in the child interpreter; prints one JSON line with its phase timings
+CHILD = """
+import sys, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+heavy = sorted(name for name in ("crewai", "litellm", "openai") if name in sys.modules)
+import warmup
+warmup.load()
+loaded = time.perf_counter()
+main.agent_pool.warm()
+warm = time.perf_counter()
+print(json.dumps({
+    "import_main_seconds": imported - started,
+    "crewai_import_seconds": loaded - imported,
+    "agent_build_seconds": warm - loaded,
+    "loaded_at_import": heavy,
+}))
+"""
+
+
+def _parse_importtime(stderr: str) -> dict:
+    """Seconds per top-level package, from -X importtime output."""
+    packages: dict = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split(":", 1)[1].split("|")
+        name = name.strip()
+        if "." not in name:
+            packages[name] += int(cumulative) / 1e6
+    return packages
+
+
+def _run_once(env: dict) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-W", "ignore", "-X", "importtime", "-c", CHILD],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Startup run failed:\n{completed.stderr[-2000:]}")
+    phases = json.loads(completed.stdout.strip().splitlines()[-1])
+    # Only what main pulled in — the child's own imports after it are the later phases
+    stderr = completed.stderr.split("| main\n", 1)[0] + "| main\n"
+    phases["packages"] = _parse_importtime(stderr)
+    return phases
+
+
+def _median(runs: list, key: str) -> float:
+    return round(statistics.median(run[key] for run in runs), 3)
+
+
+def run(runs: int, top: int) -> dict:
+    env = os.environ.copy()
+    samples = [_run_once(env) for _ in range(runs)]
+
+    packages = defaultdict(list)
+    for sample in samples:
+        for name, seconds in sample["packages"].items():
+            packages[name].append(seconds)
+    breakdown = sorted(
+        ((name, round(statistics.median(times), 3)) for name, times in packages.items()),
+        key=lambda item: item[1], reverse=True,
+    )
+    return {
+        "config": {
+            "runs": runs,
+            "llm_model": os.getenv("LLM_MODEL", ""),
+            "startup_warmup": os.getenv("STARTUP_WARMUP", "blocking"),
+        },
+        "environment": {"commit": _git_commit(), "python": sys.version.split()[0]},
+        "import_main_seconds": _median(samples, "import_main_seconds"),
+        "crewai_import_seconds": _median(samples, "crewai_import_seconds"),
+        "agent_build_seconds": _median(samples, "agent_build_seconds"),
+        "loaded_at_import": samples[-1]["loaded_at_import"],
+        "top_packages": dict(breakdown[:top]),
+        "project_modules": {
+            name: seconds for name, seconds in breakdown if name in PROJECT_MODULES
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="packages listed in the breakdown")
+    parser.add_argument(
+        "--max-import-seconds", type=float, default=0.0,
+        help="fail if importing main takes longer (0: no limit)",
+    )
+    parser.add_argument(
+        "--forbid", default="crewai,litellm",
+        help="comma-separated packages main must not import ('' to allow all)",
+    )
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="interview-startup-") as data_dir:
+        # The real model names: the fake provider would import LiteLLM up front
+        os.environ.setdefault("LLM_MODEL", "gemini/gemini-2.5-flash")
+        os.environ.setdefault("LLM_MODEL_SMALL", "gemini/gemini-2.5-flash-lite")
+        _configure_in_process(data_dir)
+        report = run(args.runs, args.top)
+
+    forbidden = sorted(set(filter(None, args.forbid.split(","))) & set(report["loaded_at_import"]))
+    checks = {"no_forbidden_imports": not forbidden}
+    if args.max_import_seconds:
+        checks["import_within_limit"] = report["import_main_seconds"] <= args.max_import_seconds
+    report["checks"] = checks
+    report["passed"] = all(checks.values())
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    sys.exit(0 if report["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Committee Ensemble — the final decision as a vote over parallel samples.
+
+One committee call is one sample of what the model thinks; for the
+decision that matters most, COMMITTEE_SAMPLES > 1 asks for several and
+takes the majority (self-consistency):
+  - all samples are requested at once, so the vote costs about one
+    call's latency, not K
+  - each sample is drawn at COMMITTEE_TEMPERATURE with its own seed, so
+    the samples are independent draws rather than K copies of one greedy
+    answer
+  - each sample is told it is committee member i of K — their prompts
+    share the cacheable prefix (prompts.py) but differ in the request,
+    so the LLM response cache never hands one sample's answer to another
+  - the vote closes as soon as the outcome can no longer change; samples
+    not yet sent are dropped, and those already with the provider finish
+    in the background so their tokens are settled and their answers
+    cached (crew_runner.py), but they no longer count
+  - after COMMITTEE_TIMEOUT_SECONDS the vote closes with the samples in
+    hand, and fails if there are none
+A failed sample abstains. Ties go to HOLD — a split committee is not a
+hire or a reject. The agreement ratio (winning votes / votes cast) is
+reported with the decision. COMMITTEE_SAMPLES=1 (default) is a single
+call, as before.
+"""
+
+import os
+from collections import Counter
+from typing import Optional
+
+COMMITTEE_SAMPLES = int(os.getenv("COMMITTEE_SAMPLES", "1"))
+if COMMITTEE_SAMPLES < 1:
+    raise ValueError(f"COMMITTEE_SAMPLES must be at least 1, not {COMMITTEE_SAMPLES}")
+COMMITTEE_TIMEOUT_SECONDS = float(os.getenv("COMMITTEE_TIMEOUT_SECONDS", "120"))
+COMMITTEE_TEMPERATURE = float(os.getenv("COMMITTEE_TEMPERATURE", "0.7"))
+
+DECISIONS = ("HIRE", "HOLD", "REJECT")
+TIE_DECISION = "HOLD"
+
+
+def sampling(member: int) -> dict:
+    """LLM sampling settings for committee sample number member (1-based)."""
+    return {"temperature": COMMITTEE_TEMPERATURE, "seed": member}
+
+
+class Ballot:
+    """Votes from up to `samples` committee samples, with early stopping."""
+
+    def __init__(self, samples: int):
+        self.samples = samples
+        self.votes = Counter()
+        self.failed = 0
+
+    def add(self, decision: str) -> None:
+        self.votes[decision] += 1
+
+    def abstain(self) -> None:
+        self.failed += 1
+
+    @property
+    def cast(self) -> int:
+        return sum(self.votes.values())
+
+    @property
+    def outstanding(self) -> int:
+        return self.samples - self.cast - self.failed
+
+    def settled(self) -> bool:
+        """
+        True once no outstanding votes can change the winner: the leader
+        is ahead of the runner-up by more than the votes still to come.
+        """
+        if self.outstanding == 0:
+            return True
+        ranked = self.votes.most_common(2) + [(None, 0), (None, 0)]
+        return ranked[0][1] > ranked[1][1] + self.outstanding
+
+    def winner(self) -> Optional[str]:
+        """The majority decision, TIE_DECISION on a tie, None with no votes."""
+        if not self.votes:
+            return None
+        top = max(self.votes.values())
+        leaders = [decision for decision in DECISIONS if self.votes[decision] == top]
+        return leaders[0] if len(leaders) == 1 else TIE_DECISION
+
+    def agreement(self) -> float:
+        """Share of the votes cast that went to the winner."""
+        if not self.cast:
+            return 0.0
+        return round(self.votes[self.winner()] / self.cast, 3)
+
+    def summary(self, cancelled: int) -> dict:
+        return {
+            "samples": self.samples,
+            "votes": {decision: self.votes[decision] for decision in DECISIONS},
+            "votes_cast": self.cast,
+            "failed": self.failed,
+            "cancelled": cancelled,
+            "agreement": self.agreement(),
+        }
+
+    def render(self) -> str:
+        """One line for the stored rationale, e.g. "HIRE 3, HOLD 1 of 5 samples"."""
+        counts = ", ".join(
+            f"{decision} {self.votes[decision]}" for decision in DECISIONS if self.votes[decision]
+        )
+        return (
+            f"Committee Vote: {counts} of {self.samples} samples "
+            f"(agreement {self.agreement():.0%})"
+        )
@@ -0,0 +1,198 @@
+"""
+Context Compaction — smaller prompts for every round after screening.
+
+Screening reads the full resume once. Everything later reads compacted
+context instead:
+  - resume  → a structured profile (built once at /start, kept in SESSION
+              CONTEXT): contact details and boilerplate dropped, lines
+              de-duplicated, each section capped.
+  - verdict → a summary built from its typed record: decision, score,
+              the top strengths / weaknesses and the opening of the
+              reasoning.
+No LLM calls are involved, so compaction costs nothing and is
+deterministic. Set CONTEXT_COMPACTION=0 to send full texts again (see
+benchmarks/context_compaction_bench.py to compare the two).
+"""
+
+import os
+import re
+from typing import Optional
+
+from pydantic import ValidationError
+
+from schemas import RoundVerdict, ScreeningVerdict, TechnicalVerdict, ScenarioVerdict
+
+CONTEXT_COMPACTION = os.getenv("CONTEXT_COMPACTION", "1") == "1"
+
+RESUME_PROFILE_MAX_CHARS = 3000
+RESUME_SECTION_MAX_LINES = 10
+RESUME_LINE_MAX_CHARS = 220
+VERDICT_SUMMARY_ITEMS = 3
+VERDICT_SUMMARY_ITEM_CHARS = 140
+VERDICT_SUMMARY_REASONING_CHARS = 400
+
+# Verdict name in DECISION MEMORY → its schema and label
+VERDICT_MODELS = {
+    "round1": (ScreeningVerdict, "Round 1 — Screening"),
+    "round2": (TechnicalVerdict, "Round 2 — Technical"),
+    "round3": (ScenarioVerdict, "Round 3 — Scenario"),
+}
+
+# ── Resume profile ──────────────────────────────────────────────────
+
+# Heading (lower-case) → canonical section name
+SECTION_ALIASES = {
+    "summary": "Summary",
+    "professional summary": "Summary",
+    "objective": "Summary",
+    "career objective": "Summary",
+    "profile": "Summary",
+    "about": "Summary",
+    "about me": "Summary",
+    "experience": "Experience",
+    "work experience": "Experience",
+    "professional experience": "Experience",
+    "employment": "Experience",
+    "employment history": "Experience",
+    "internships": "Experience",
+    "internship": "Experience",
+    "projects": "Projects",
+    "personal projects": "Projects",
+    "academic projects": "Projects",
+    "skills": "Skills",
+    "technical skills": "Skills",
+    "core competencies": "Skills",
+    "technologies": "Skills",
+    "education": "Education",
+    "certifications": "Certifications",
+    "certificates": "Certifications",
+    "achievements": "Achievements",
+    "awards": "Achievements",
+    "honors": "Achievements",
+    "publications": "Publications",
+    "leadership": "Leadership",
+    "positions of responsibility": "Leadership",
+    "extracurricular activities": "Leadership",
+    "activities": "Leadership",
+    "interests": "Interests",
+    "hobbies": "Interests",
+    "references": "References",
+    "declaration": "Declaration",
+    "personal details": "Personal Details",
+    "contact": "Contact",
+}
+# Sections that never help an interviewer judge the candidate
+_PROFILE_DROPPED_SECTIONS = {"Interests", "References", "Declaration", "Personal Details", "Contact"}
+
+_CONTACT = re.compile(
+    r"[\w.+-]+@[\w-]+\.[\w.]+"  # email
+    r"|(?:\+?\d[\d\s().-]{8,}\d)"  # phone
+    r"|https?://\S+|www\.\S+|linkedin\.com/\S*|github\.com/\S*",
+    re.IGNORECASE,
+)
+_BULLET = re.compile(r"^\s*(?:[-*•●▪◦·–]|\d+[.)])\s*")
+
+
+def _clip(text: str, limit: int) -> str:
+    """Cut at a word boundary and mark the cut."""
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0].rstrip(",;:") + "…"
+
+
+def section_heading(line: str) -> Optional[str]:
+    """Canonical section name if this line is a known resume heading, else None."""
+    key = re.sub(r"[#*_:|]", "", line).strip().lower()
+    return SECTION_ALIASES.get(key)
+
+
+def compact_resume(resume: str) -> str:
+    """Condense a resume into a sectioned profile for later-round prompts."""
+    header, sections = [], {}
+    current, skipping = None, False
+    seen = set()
+    for raw_line in resume.splitlines():
+        line = _BULLET.sub("", raw_line).replace("**", "").strip()
+        if not line:
+            continue
+        name = section_heading(line)
+        if name is not None:
+            skipping = name in _PROFILE_DROPPED_SECTIONS
+            current = name
+            if not skipping:
+                sections.setdefault(current, [])
+            continue
+        if skipping:
+            continue
+        line = re.sub(r"\s+", " ", _CONTACT.sub("", line)).strip(" |,;")
+        if len(line) < 3 or line.lower() in seen:
+            continue
+        seen.add(line.lower())
+        line = _clip(line, RESUME_LINE_MAX_CHARS)
+        if current is None:
+            header.append(line)
+        elif len(sections[current]) < RESUME_SECTION_MAX_LINES:
+            sections[current].append(line)
+
+    parts = ["CANDIDATE PROFILE (condensed from resume)"]
+    if header:
+        parts.append("\n".join(header[:3]))
+    for name, lines in sections.items():
+        if lines:
+            parts.append(f"{name}:\n" + "\n".join(f"- {line}" for line in lines))
+    profile = "\n\n".join(parts)
+    # Unstructured resumes (no recognised headings) fall back to a clipped copy
+    if not sections:
+        profile = parts[0] + "\n\n" + "\n".join(header)
+    return _clip(profile, RESUME_PROFILE_MAX_CHARS)
+
+
+# ── Verdict summaries ───────────────────────────────────────────────
+
+
+def _first_sentences(text: str, limit: int) -> str:
+    text = re.sub(r"\s+", " ", text).strip()
+    sentences = re.split(r"(?<=[.!?])\s+", text)
+    summary = ""
+    for sentence in sentences:
+        if summary and len(summary) + len(sentence) + 1 > limit:
+            break
+        summary = f"{summary} {sentence}".strip()
+    return _clip(summary, limit)
+
+
+def _short_items(items: list) -> str:
+    picked = [_clip(item, VERDICT_SUMMARY_ITEM_CHARS) for item in items[:VERDICT_SUMMARY_ITEMS]]
+    return "; ".join(picked) if picked else "none noted"
+
+
+def summarize_verdict(verdict: RoundVerdict, label: str) -> str:
+    """Decision, score, key points — everything a later round needs from a verdict."""
+    score = f"{verdict.score:g} / 10" if verdict.score is not None else "N/A"
+    lines = [
+        f"{label} (summary)",
+        f"Decision: {verdict.decision}",
+        f"Score: {score}",
+        f"Strengths: {_short_items(verdict.strengths)}",
+        f"Weaknesses: {_short_items(verdict.weaknesses)}",
+        f"Key reasoning: {_first_sentences(verdict.reasoning, VERDICT_SUMMARY_REASONING_CHARS)}",
+    ]
+    questions = getattr(verdict, "recommended_questions", None)
+    if questions:
+        lines.append(
+            "Recommended questions: "
+            + " ".join(f"({i}) {_clip(q, 200)}" for i, q in enumerate(questions, 1))
+        )
+    return "\n".join(lines)
+
+
+def verdict_context(name: str, content: str, record: Optional[dict]) -> str:
+    """Prompt text for a stored verdict: its summary, or the full text if unknown."""
+    if name not in VERDICT_MODELS:
+        return content
+    model, label = VERDICT_MODELS[name]
+    try:
+        verdict = model.model_validate(record) if record else model.from_text(content)
+    except ValidationError:
+        verdict = model.from_text(content)
+    return summarize_verdict(verdict, label)
@@ -6,242 +6,902 @@ only the context it is explicitly given. No hidden state, no shared memory.
 """
 
 import os
-import re
 import time
+import asyncio
 import logging
-from crewai import Crew
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Optional
+
+import instrumentation
+import model_router
+import warmup
+from llm_cache import LLM_CACHE_ENABLED, cache_key, is_bypassed, response_cache
+from rate_limiter import (
+    backoff_delay,
+    crew_model,
+    estimate_tokens,
+    is_rate_limit_error,
+    limiter_for,
+    retry_after_seconds,
+    tag_limited_model,
+)
+
+if TYPE_CHECKING:  # CrewAI itself is imported on first use (warmup.py)
+    from crewai import Crew
 
 logger = logging.getLogger(__name__)
 
-MAX_RETRIES = 3
-RETRY_DELAY = 60  # seconds to wait on rate-limit
+MAX_RETRIES = 5  # jittered exponential backoff between attempts (rate_limiter.py)
 
+# Crew.kickoff() is blocking — run it on a bounded thread pool so one slow
+# LLM call never stalls the event loop for other candidates.
+CREW_MAX_CONCURRENCY = int(os.getenv("CREW_MAX_CONCURRENCY", "8"))
+_crew_executor = ThreadPoolExecutor(
+    max_workers=CREW_MAX_CONCURRENCY, thread_name_prefix="crew"
+)
 
-def _run_crew_with_retry(crew: Crew) -> str:
-    """Run a CrewAI Crew with retry logic for rate-limit errors."""
-    for attempt in range(1, MAX_RETRIES + 1):
+# Token streaming — chunk callbacks keyed by task ID and by worker thread,
+# so concurrent crews only ever see their own tokens.
+TokenCallback = Callable[[str], None]
+_stream_subscribers: dict = {}
+_stream_listener_lock = threading.Lock()
+_stream_listener_registered = False
+# Provider time per worker thread, from CrewAI's LLM call events (instrumentation)
+_llm_started: dict = {}
+_llm_seconds: dict = {}
+
+
+def _crewai_events():
+    """CrewAI's event bus and LLM event types, or None on a build without them."""
+    try:
+        from crewai.events import (
+            crewai_event_bus,
+            LLMCallCompletedEvent,
+            LLMCallFailedEvent,
+            LLMCallStartedEvent,
+            LLMStreamChunkEvent,
+        )
+    except ImportError:  # older CrewAI releases kept the event bus under utilities
         try:
-            result = crew.kickoff()
-            return str(result)
-        except Exception as e:
-            err = str(e)
-            if "429" in err or "quota" in err.lower() or "rate" in err.lower():
-                if attempt < MAX_RETRIES:
-                    wait = RETRY_DELAY * attempt
-                    logger.warning(
-                        f"Rate limited (attempt {attempt}/{MAX_RETRIES}). "
-                        f"Retrying in {wait}s..."
-                    )
-                    time.sleep(wait)
-                    continue
-            raise
+            from crewai.utilities.events import (
+                crewai_event_bus,
+                LLMCallCompletedEvent,
+                LLMCallFailedEvent,
+                LLMCallStartedEvent,
+                LLMStreamChunkEvent,
+            )
+        except ImportError:
+            return None
+    return (
+        crewai_event_bus,
+        LLMCallCompletedEvent,
+        LLMCallFailedEvent,
+        LLMCallStartedEvent,
+        LLMStreamChunkEvent,
+    )
 
-from agents import (
-    create_screening_agent,
-    create_technical_agent,
-    create_scenario_agent,
-    create_hiring_committee_agent,
-)
+
+def _ensure_event_listeners() -> bool:
+    """Register the global LLM chunk and call-timing listeners on the CrewAI event bus."""
+    global _stream_listener_registered
+    if _stream_listener_registered:
+        return True
+    events = _crewai_events()
+    if events is None:
+        return False
+    (
+        crewai_event_bus,
+        LLMCallCompletedEvent,
+        LLMCallFailedEvent,
+        LLMCallStartedEvent,
+        LLMStreamChunkEvent,
+    ) = events
+    with _stream_listener_lock:
+        if not _stream_listener_registered:
+
+            @crewai_event_bus.on(LLMStreamChunkEvent)
+            def _on_chunk(source, event):
+                task_id = getattr(event, "task_id", None)
+                callback = _stream_subscribers.get(str(task_id)) if task_id else None
+                if callback is None:
+                    callback = _stream_subscribers.get(threading.get_ident())
+                if callback is not None and event.chunk:
+                    callback(event.chunk)
+
+            @crewai_event_bus.on(LLMCallStartedEvent)
+            def _on_llm_start(source, event):
+                _llm_started[threading.get_ident()] = time.perf_counter()
+
+            @crewai_event_bus.on(LLMCallCompletedEvent)
+            @crewai_event_bus.on(LLMCallFailedEvent)
+            def _on_llm_end(source, event):
+                thread = threading.get_ident()
+                started = _llm_started.pop(thread, None)
+                if started is not None and thread in _llm_seconds:
+                    _llm_seconds[thread] += time.perf_counter() - started
+
+            _stream_listener_registered = True
+    return True
+
+
+def _token_usage(usage) -> tuple:
+    """
+    (prompt, completion, cached prompt, total) tokens in a CrewAI
+    UsageMetrics; zeros if unknown. Cached prompt tokens are the part of
+    the prompt the provider served from its prefix / context cache.
+    """
+    return (
+        getattr(usage, "prompt_tokens", 0) or 0,
+        getattr(usage, "completion_tokens", 0) or 0,
+        getattr(usage, "cached_prompt_tokens", 0) or 0,
+        getattr(usage, "total_tokens", 0) or 0,
+    )
+
+
+def _output_text(output) -> str:
+    """The task's JSON when CrewAI parsed it into its output model, else the raw text."""
+    parsed = getattr(output, "pydantic", None)
+    if parsed is not None:
+        return parsed.model_dump_json()
+    return output.raw
+
+
+def _kickoff(crew: "Crew", on_token: Optional[TokenCallback], submitted: float) -> tuple:
+    """
+    Blocking kickoff, forwarding streamed tokens to on_token if given.
+    Returns (text, (prompt, completion, cached, total) tokens, timing) — timing has
+    the thread-pool wait, the attempt's wall time and its LLM call time.
+    """
+    started = time.perf_counter()
+    thread = threading.get_ident()
+    timed = _ensure_event_listeners()
+    if timed:
+        _llm_seconds[thread] = 0.0
+    streamed = False
+
+    def forward(chunk: str) -> None:
+        nonlocal streamed
+        streamed = True
+        on_token(chunk)
+
+    # CrewAI's token counts run on across a pooled agent's crews (and across
+    # retries of this one): this kickoff's usage is the growth from here
+    before = _token_usage(crew.calculate_usage_metrics())
+    keys = [thread] + [str(task.id) for task in crew.tasks]
+    if on_token is not None and timed:
+        for key in keys:
+            _stream_subscribers[key] = forward
+    try:
+        output = crew.kickoff()
+    finally:
+        for key in keys:
+            _stream_subscribers.pop(key, None)
+        llm_seconds = _llm_seconds.pop(thread, 0.0)
+        _llm_started.pop(thread, None)
+
+    result = _output_text(output)
+    # No streaming support in this CrewAI build — deliver the text in one go
+    if on_token is not None and not streamed:
+        on_token(result)
+    timing = {
+        "queued": started - submitted,
+        "attempt": time.perf_counter() - started,
+        "llm": llm_seconds,
+    }
+    after = _token_usage(getattr(output, "token_usage", None))
+    tokens = tuple(max(0, end - start) for start, end in zip(before, after))
+    return result, tokens, timing
+
+
+# Runs whose caller was cancelled while the provider call was in flight
+# (_abandon): kept referenced until they finish
+_abandoned_runs: set = set()
+
+
+def _abandon(call, kind: str, limiter, estimated: int, key: Optional[str]) -> None:
+    """
+    The caller of a crew run was cancelled (a discarded speculative question,
+    a committee sample the vote no longer needs). A thread cannot be stopped:
+    a call still queued for the executor is dropped unsent, and one already
+    with the provider is left to finish in the background — its tokens are
+    still settled with the rate limiter and its answer cached, like any run.
+    """
+    if call.cancel():
+        return
+
+    async def finish() -> None:
+        try:
+            result, (_, _, _, used_tokens), _ = await asyncio.wrap_future(call)
+        except Exception as e:
+            logger.info(f"Abandoned {kind} run failed: {e}")
+            return
+        await asyncio.to_thread(limiter.settle, estimated, used_tokens or None)
+        if key is not None:
+            await response_cache.aset(key, result)
+
+    task = asyncio.get_running_loop().create_task(finish())
+    _abandoned_runs.add(task)
+    task.add_done_callback(_abandoned_runs.discard)
+
+
+async def _run_crew_with_retry(
+    crew: "Crew",
+    on_token: Optional[TokenCallback] = None,
+    kind: str = "crew",
+    usage: Optional[dict] = None,
+) -> str:
+    """
+    Run a CrewAI Crew off the event loop with retry logic for rate-limit errors.
+    Identical (agent, task, model, temperature) runs are served from the LLM cache.
+    Every provider call first takes its share of the shared RPM/TPM quota, and
+    waits for it rather than failing. Timings, tokens and retries are recorded
+    per kind (instrumentation.py); if given, usage is filled with the run's
+    prompt / completion / cached prompt tokens and whether it was a cache hit.
+    """
+    key = cache_key(crew) if LLM_CACHE_ENABLED else None
+    if key is not None:
+        cached = await response_cache.aget(key)
+        instrumentation.record_cache_lookup(kind, cached is not None)
+        if cached is not None:
+            if usage is not None:
+                usage["cached"] = True
+            if on_token is not None:
+                on_token(cached)
+            return cached
+
+    limiter = limiter_for(crew_model(crew))
+    estimated = estimate_tokens(crew)
+    run_started = time.perf_counter()
+
+    loop = asyncio.get_running_loop()
+    with instrumentation.span("crew.run", kind=kind) as current_span:
+        for attempt in range(1, MAX_RETRIES + 1):
+            waited = await limiter.acquire(estimated)
+            instrumentation.record_queue_wait(kind, "rate_limiter", waited)
+            call = _crew_executor.submit(_kickoff, crew, on_token, time.perf_counter())
+            try:
+                result, (prompt_tokens, completion_tokens, cached_tokens, used_tokens), timing = (
+                    await asyncio.wrap_future(call, loop=loop)
+                )
+            except asyncio.CancelledError:
+                _abandon(call, kind, limiter, estimated, key)
+                raise
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    retry_after = retry_after_seconds(e)
+                    if retry_after:
+                        await asyncio.to_thread(limiter.block_for, retry_after)
+                    if attempt < MAX_RETRIES:
+                        wait = backoff_delay(attempt, retry_after)
+                        instrumentation.record_retry(kind, wait)
+                        logger.warning(
+                            f"Rate limited (attempt {attempt}/{MAX_RETRIES}). "
+                            f"Retrying in {wait:.1f}s..."
+                        )
+                        await asyncio.sleep(wait)
+                        continue
+                    tag_limited_model(e, crew_model(crew))
+                raise
+
+            instrumentation.record_queue_wait(kind, "crew_executor", timing["queued"])
+            instrumentation.record_attempt(kind, timing["attempt"], timing["llm"])
+            instrumentation.record_crew_run(
+                kind, time.perf_counter() - run_started, prompt_tokens, completion_tokens,
+                cached_tokens, current_span,
+            )
+            await asyncio.to_thread(limiter.settle, estimated, used_tokens or None)
+            if usage is not None:
+                usage.update(
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens,
+                    cached_prompt_tokens=cached_tokens,
+                )
+            if key is not None:
+                await response_cache.aset(key, result)
+            return result
+
+from agents import CREW_VERBOSE
+from agent_pool import AgentPool
 from tasks import (
     create_screening_task,
     create_technical_question_task,
     create_technical_evaluation_task,
+    create_question_grade_task,
     create_scenario_question_task,
     create_scenario_evaluation_task,
     create_hiring_decision_task,
 )
-from state import VERDICTS_DIR
-
-# ── Helpers ──────────────────────────────────────────────────────────
+import decision_store
+from context_compaction import CONTEXT_COMPACTION, verdict_context
+import per_question
+import committee
+from prescreen import PRESCREEN_MODE, prescreener
+from question_bank import QUESTION_BANK_ENABLED, question_bank
+from schemas import (
+    ScreeningVerdict,
+    TechnicalQuestions,
+    TechnicalVerdict,
+    ScenarioQuestion,
+    ScenarioVerdict,
+    FusedTechnicalVerdict,
+    QuestionGrade,
+    HiringDecision,
+)
 
+# Agents are built once per process and leased per crew run
+agent_pool = AgentPool(max_idle_per_kind=CREW_MAX_CONCURRENCY)
 
-def _read_verdict(filename: str) -> str:
-    """Read a verdict file from DECISION MEMORY."""
-    path = os.path.join(VERDICTS_DIR, filename)
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Verdict file not found: {path}")
-    with open(path, "r") as f:
-        return f.read()
 
+async def _run_task(
+    kind: str,
+    build_task,
+    on_token: Optional[TokenCallback] = None,
+    model: Optional[str] = None,
+    usage: Optional[dict] = None,
+    sampling: Optional[dict] = None,
+) -> str:
+    """
+    Lease a pooled agent (on model, default LLM_MODEL, with the given LLM
+    sampling settings), build its task and run a one-task crew.
+    """
+    await warmup.ensure_loaded()
+    from crewai import Crew
+
+    with agent_pool.lease(
+        kind, stream=on_token is not None, model=model, sampling=sampling
+    ) as agent:
+        task = build_task(agent)
+        crew = Crew(agents=[agent], tasks=[task], verbose=CREW_VERBOSE)
+        return await _run_crew_with_retry(crew, on_token, kind, usage)
+
+
+async def _run_routed(
+    task: str,
+    kind: str,
+    build_task,
+    output_model,
+    on_token: Optional[TokenCallback] = None,
+    sampling: Optional[dict] = None,
+):
+    """
+    Run a task on the model tier(s) model_router assigns it and parse the
+    result into output_model. sampling holds LLM settings for every tier,
+    as in _run_task. In a cascade the small tier runs unstreamed: its
+    output goes to on_token only if it is kept, else the large tier
+    re-runs the task and streams as usual.
+    """
+    tiers = model_router.plan(task)
+    for tier in tiers:
+        model = model_router.model_for(tier)
+        final = tier == tiers[-1]
+        usage: dict = {}
+        started = time.perf_counter()
+        output = await _run_task(
+            kind, build_task, on_token if final else None, model=model, usage=usage,
+            sampling=sampling,
+        )
+        seconds = time.perf_counter() - started
+        cost = model_router.run_cost(
+            model, usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0),
+            usage.get("cached_prompt_tokens", 0),
+        )
+        model_router.router_stats.record_run(tier, seconds, usage, cost)
+        instrumentation.record_tier_run(task, tier, seconds, cost)
+        if final:
+            break
+
+        reason = model_router.escalation_reason(output, output_model)
+        model_router.router_stats.record_cascade(task, reason)
+        if not reason:
+            if on_token is not None:
+                on_token(output)
+            break
+        instrumentation.record_escalation(task, reason)
+        logger.info(f"{task}: escalating from the {tier} tier ({reason} output)")
+    return output_model.from_output(output)
+
+
+# Extra attempts for one question's grading call after a non-rate-limit
+# failure (rate limits are already retried inside _run_crew_with_retry)
+QUESTION_GRADE_ATTEMPTS = 2
+
+# Stand-in for a verdict that is still being written when a question is
+# generated speculatively (see pipeline.py, SPECULATIVE_PREGEN).
+PENDING_VERDICT = (
+    "[Verdict pending — this round is still being evaluated. "
+    "Assume the candidate passed it.]"
+)
 
-def _write_verdict(filename: str, content: str) -> str:
-    """Write a verdict file to DECISION MEMORY and return the path."""
-    path = os.path.join(VERDICTS_DIR, filename)
-    os.makedirs(VERDICTS_DIR, exist_ok=True)
-    with open(path, "w") as f:
-        f.write(content)
-    return path
+# ── Helpers ──────────────────────────────────────────────────────────
 
 
-def _parse_decision(verdict_text: str) -> str:
+async def _read_verdicts(interview_id: str, *names: str) -> list:
     """
-    Extract the decision (PASS/FAIL/BORDERLINE/HIRE/HOLD/REJECT)
-    from a verdict string.
+    Read the latest verdicts from this interview's DECISION MEMORY, in order,
+    as prompt context — compact summaries when CONTEXT_COMPACTION is on.
+    SQLite runs in a worker thread, as do all DECISION MEMORY calls here.
     """
-    match = re.search(
-        r"Decision:\s*(PASS|FAIL|BORDERLINE|HIRE|HOLD|REJECT)",
-        verdict_text,
-        re.IGNORECASE,
-    )
-    if match:
-        return match.group(1).upper()
-    # Fallback — look for keywords anywhere
-    upper = verdict_text.upper()
-    for keyword in ["FAIL", "REJECT", "BORDERLINE", "HOLD", "PASS", "HIRE"]:
-        if keyword in upper:
-            return keyword
-    return "BORDERLINE"
-
+    with instrumentation.io_timer("decision_read"):
+        found = await asyncio.to_thread(decision_store.read_verdicts, interview_id, list(names))
+    missing = [name for name in names if name not in found]
+    if missing:
+        raise FileNotFoundError(
+            f"Verdict not found: {interview_id}/{', '.join(missing)}"
+        )
+    if not CONTEXT_COMPACTION:
+        return [found[name]["content"] for name in names]
+    return [
+        verdict_context(name, found[name]["content"], found[name]["record"])
+        for name in names
+    ]
+
+
+async def _read_verdict(interview_id: str, name: str) -> str:
+    """Read one verdict from this interview's DECISION MEMORY."""
+    return (await _read_verdicts(interview_id, name))[0]
+
+
+async def _write_verdict(
+    interview_id: str, name: str, content: str, record=None, role: Optional[str] = None
+) -> int:
+    """Append a verdict (and its typed record) to DECISION MEMORY; returns its row ID."""
+    with instrumentation.io_timer("decision_write"):
+        return await asyncio.to_thread(
+            decision_store.write_verdict,
+            interview_id,
+            name,
+            content,
+            record=record.model_dump() if record is not None else None,
+            role=role,
+        )
+
+
+async def _banked(
+    kind: str,
+    role: str,
+    resume: str,
+    generate,
+    speculative: bool = False,
+) -> tuple:
+    """
+    Serve a question from the QUESTION BANK when a similar candidate for the
+    same role already got one, else generate() it and bank the result.
+    A speculative question (written against PENDING_VERDICT) is not banked
+    yet: it may still be discarded. Returns (text, from_bank, confirm) —
+    confirm is None, or for a speculative question a coroutine function
+    that banks it once the pipeline actually uses it.
+    """
+    use_bank = QUESTION_BANK_ENABLED and bool(role) and not is_bypassed()
+    if use_bank:
+        hit = await asyncio.to_thread(question_bank.lookup, kind, role, resume)
+        if hit is not None:
+            return hit["content"], True, None
 
-# ── Round 1: Screening ──────────────────────────────────────────────
+    started = time.monotonic()
+    text = await generate()
+    seconds = time.monotonic() - started
+    if not use_bank:
+        return text, False, None
 
+    async def store() -> None:
+        await asyncio.to_thread(question_bank.store, kind, role, resume, text, seconds)
 
-def run_screening(resume: str, role: str) -> dict:
-    """
-    Run the Screening Agent.
-    AGENT CONTEXT: Resume + target role.
-    Writes: verdicts/round1.txt
-    """
-    agent = create_screening_agent()
-    task = create_screening_task(agent, resume, role)
+    if speculative:
+        return text, False, store
+    await store()
+    return text, False, None
 
-    crew = Crew(agents=[agent], tasks=[task], verbose=True)
-    verdict_text = _run_crew_with_retry(crew)
 
-    # Write to DECISION MEMORY
-    _write_verdict("round1.txt", verdict_text)
+def _with_confirm(result: dict, confirm) -> dict:
+    """Attach a speculative question's confirm (see _banked) to its result."""
+    if confirm is not None:
+        result["confirm"] = confirm
+    return result
 
-    decision = _parse_decision(verdict_text)
 
+def _round_result(round_number: int, verdict, verdict_text: str) -> dict:
     return {
-        "round": 1,
-        "decision": decision,
+        "round": round_number,
+        "decision": verdict.decision,
+        "score": verdict.score,
         "verdict": verdict_text,
+        "record": verdict.model_dump(),
     }
 
 
-# ── Round 2: Technical (Question Generation) ────────────────────────
-
-
-def run_technical_questions(resume: str) -> dict:
-    """
-    Generate technical questions.
-    AGENT CONTEXT: Resume + round1.txt verdict.
-    """
-    round1_verdict = _read_verdict("round1.txt")
-    agent = create_technical_agent()
-    task = create_technical_question_task(agent, resume, round1_verdict)
+# ── Round 1: Screening ──────────────────────────────────────────────
 
-    crew = Crew(agents=[agent], tasks=[task], verbose=True)
-    questions = _run_crew_with_retry(crew)
 
-    return {
-        "round": 2,
-        "questions": questions,
-    }
+def _prescreen_verdict(assessment: dict) -> ScreeningVerdict:
+    """Round 1 verdict for a resume the local pre-screen routed on its own."""
+    match = assessment["match_score"]
+    evidence = f"role similarity {assessment['role_similarity']}"
+    if assessment["neighbour_pass_rate"] is not None:
+        evidence += (
+            f"; {assessment['neighbours']} similar past candidates, "
+            f"{assessment['neighbour_pass_rate']:.0%} passed"
+        )
+    fast_track = assessment["route"] == "fast_track"
+    score = assessment["neighbour_score"] if fast_track else None
+    return ScreeningVerdict(
+        decision="PASS" if fast_track else "FAIL",
+        score=score if score is not None else round(10 * match, 1),
+        reasoning=(
+            f"Decided by the local pre-screen without an LLM review: "
+            f"match score {match} ({evidence})."
+        ),
+    )
 
 
-def run_technical_evaluation(resume: str, questions: str, answer: str) -> dict:
+async def run_screening(
+    interview_id: str,
+    resume: str,
+    role: str,
+    on_token: Optional[TokenCallback] = None,
+) -> dict:
     """
-    Evaluate technical answers.
-    AGENT CONTEXT: Resume + round1.txt + candidate answers.
-    Writes: verdicts/round2.txt
+    Run the Screening Agent (clear matches / misses may be routed by the
+    local pre-screen instead — see prescreen.py).
+    AGENT CONTEXT: Resume + target role.
+    Writes: verdicts/<interview_id>/round1
     """
-    round1_verdict = _read_verdict("round1.txt")
-    agent = create_technical_agent()
-    task = create_technical_evaluation_task(
-        agent, resume, round1_verdict, questions, answer
-    )
+    with instrumentation.stage("screening", interview_id):
+        assessment = None
+        if PRESCREEN_MODE != "off":
+            assessment = await asyncio.to_thread(prescreener.assess, resume, role)
+
+        if assessment is not None and assessment["route"] != "llm":
+            verdict = _prescreen_verdict(assessment)
+            verdict_text = verdict.render(role)
+        else:
+            verdict = await _run_routed(
+                "screening",
+                "screening",
+                lambda agent: create_screening_task(agent, resume, role),
+                ScreeningVerdict,
+                on_token,
+            )
+            verdict_text = verdict.render(role)
+            if PRESCREEN_MODE != "off":
+                await asyncio.to_thread(
+                    prescreener.add, resume, role, verdict.decision, verdict.score
+                )
+
+        # Write to DECISION MEMORY
+        await _write_verdict(interview_id, "round1", verdict_text, verdict, role=role)
+
+        # The screening call already recommends Round 2 questions (FUSED_TRANSITIONS)
+        recommended = [q.strip() for q in verdict.recommended_questions if q.strip()]
+        return {
+            **_round_result(1, verdict, verdict_text),
+            "prescreen": assessment,
+            "next_questions": (
+                TechnicalQuestions(questions=recommended).render() if recommended else None
+            ),
+        }
 
-    crew = Crew(agents=[agent], tasks=[task], verbose=True)
-    verdict_text = _run_crew_with_retry(crew)
 
-    _write_verdict("round2.txt", verdict_text)
-
-    decision = _parse_decision(verdict_text)
-
-    return {
-        "round": 2,
-        "decision": decision,
-        "verdict": verdict_text,
-    }
+# ── Round 2: Technical (Question Generation) ────────────────────────
 
 
-# ── Round 3: Scenario (Question Generation) ─────────────────────────
+async def run_technical_questions(
+    interview_id: str,
+    resume: str,
+    on_token: Optional[TokenCallback] = None,
+    speculative: bool = False,
+    role: str = "",
+) -> dict:
+    """
+    Generate technical questions (or reuse a banked set — see question_bank.py).
+    AGENT CONTEXT: Resume + round1 verdict
+    (PENDING_VERDICT when speculative — screening is still running).
+    """
+    with instrumentation.stage("technical_questions", interview_id):
+        async def generate() -> str:
+            if speculative:
+                round1_verdict = PENDING_VERDICT
+            else:
+                round1_verdict = await _read_verdict(interview_id, "round1")
+            questions = await _run_routed(
+                "technical_questions",
+                "technical",
+                lambda agent: create_technical_question_task(
+                    agent, resume, round1_verdict
+                ),
+                TechnicalQuestions,
+                on_token,
+            )
+            return questions.render()
+
+        questions, from_bank, confirm = await _banked(
+            "technical", role, resume, generate, speculative
+        )
+        return _with_confirm(
+            {"round": 2, "questions": questions, "from_bank": from_bank}, confirm
+        )
+
+
+async def _grade_question(
+    resume: str, round1_verdict: str, question: str, answer: str, number: int, total: int
+) -> QuestionGrade:
+    """Grade one (question, answer) pair; a failure retries this question only."""
+    for attempt in range(1, QUESTION_GRADE_ATTEMPTS + 1):
+        try:
+            return await _run_routed(
+                "technical_evaluation",
+                "technical",
+                lambda agent: create_question_grade_task(
+                    agent, resume, round1_verdict, question, answer, number, total
+                ),
+                QuestionGrade,
+            )
+        except Exception as e:
+            if attempt == QUESTION_GRADE_ATTEMPTS or is_rate_limit_error(e):
+                raise
+            logger.warning(f"Grading question {number}/{total} failed ({e}); retrying it")
 
 
-def run_scenario_question(resume: str) -> dict:
+async def _grade_per_question(
+    resume: str, round1_verdict: str, questions: str, answer: str
+) -> TechnicalVerdict:
     """
-    Generate scenario question.
-    AGENT CONTEXT: Resume + round1.txt + round2.txt.
+    Split the round into (question, answer) pairs, grade them all at once
+    and merge the grades into the Round 2 verdict (per_question.py).
     """
-    round1_verdict = _read_verdict("round1.txt")
-    round2_verdict = _read_verdict("round2.txt")
-    agent = create_scenario_agent()
-    task = create_scenario_question_task(
-        agent, resume, round1_verdict, round2_verdict
+    pairs, method = per_question.pair(questions, answer)
+    instrumentation.record_answer_split(method)
+    outcomes = await asyncio.gather(
+        *(
+            _grade_question(resume, round1_verdict, question, part, number, len(pairs))
+            for number, (question, part) in enumerate(pairs, 1)
+        ),
+        return_exceptions=True,
     )
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            raise outcome
+    return per_question.aggregate(outcomes)
+
+
+async def run_technical_evaluation(
+    interview_id: str,
+    resume: str,
+    questions: str,
+    answer: str,
+    on_token: Optional[TokenCallback] = None,
+    with_scenario_question: bool = False,
+) -> dict:
+    """
+    Evaluate technical answers — and, with_scenario_question, write the
+    Round 3 scenario in the same call ("next_question"; None when the
+    verdict is not PASS or the output had no usable scenario).
+    With TECHNICAL_EVALUATION=per_question the answers are graded one
+    question at a time, concurrently, and never come with a scenario.
+    AGENT CONTEXT: Resume + round1 + candidate answers.
+    Writes: verdicts/<interview_id>/round2
+    """
+    with instrumentation.stage("technical_evaluation", interview_id):
+        round1_verdict = await _read_verdict(interview_id, "round1")
+        if per_question.PER_QUESTION:
+            verdict = await _grade_per_question(resume, round1_verdict, questions, answer)
+            verdict_text = verdict.render()
+            await _write_verdict(interview_id, "round2", verdict_text, verdict)
+            return {**_round_result(2, verdict, verdict_text), "next_question": None}
+
+        output = await _run_routed(
+            "technical_evaluation",
+            "technical",
+            lambda agent: create_technical_evaluation_task(
+                agent, resume, round1_verdict, questions, answer, with_scenario_question
+            ),
+            FusedTechnicalVerdict if with_scenario_question else TechnicalVerdict,
+            on_token,
+        )
+        next_question = None
+        if with_scenario_question:
+            verdict = output.verdict()
+            scenario = (output.scenario_question or "").strip()
+            if verdict.decision == "PASS" and scenario:
+                next_question = ScenarioQuestion(question=scenario).render()
+        else:
+            verdict = output
+        verdict_text = verdict.render()
+
+        await _write_verdict(interview_id, "round2", verdict_text, verdict)
+
+        return {**_round_result(2, verdict, verdict_text), "next_question": next_question}
 
-    crew = Crew(agents=[agent], tasks=[task], verbose=True)
-    question = _run_crew_with_retry(crew)
 
-    return {
-        "round": 3,
-        "question": question,
-    }
+# ── Round 3: Scenario (Question Generation) ─────────────────────────
 
 
-def run_scenario_evaluation(resume: str, question: str, answer: str) -> dict:
+async def run_scenario_question(
+    interview_id: str,
+    resume: str,
+    on_token: Optional[TokenCallback] = None,
+    speculative: bool = False,
+    role: str = "",
+) -> dict:
+    """
+    Generate scenario question (or reuse a banked one — see question_bank.py).
+    AGENT CONTEXT: Resume + round1 + round2
+    (PENDING_VERDICT for round2 when speculative — evaluation is still running).
+    """
+    with instrumentation.stage("scenario_question", interview_id):
+        async def generate() -> str:
+            if speculative:
+                round1_verdict = await _read_verdict(interview_id, "round1")
+                round2_verdict = PENDING_VERDICT
+            else:
+                round1_verdict, round2_verdict = await _read_verdicts(
+                    interview_id, "round1", "round2"
+                )
+            scenario = await _run_routed(
+                "scenario_question",
+                "scenario",
+                lambda agent: create_scenario_question_task(
+                    agent, resume, round1_verdict, round2_verdict
+                ),
+                ScenarioQuestion,
+                on_token,
+            )
+            return scenario.render()
+
+        question, from_bank, confirm = await _banked(
+            "scenario", role, resume, generate, speculative
+        )
+        return _with_confirm(
+            {"round": 3, "question": question, "from_bank": from_bank}, confirm
+        )
+
+
+async def run_scenario_evaluation(
+    interview_id: str,
+    resume: str,
+    question: str,
+    answer: str,
+    on_token: Optional[TokenCallback] = None,
+) -> dict:
     """
     Evaluate scenario answer.
-    AGENT CONTEXT: Resume + round1.txt + round2.txt + candidate answer.
-    Writes: verdicts/round3.txt
-    """
-    round1_verdict = _read_verdict("round1.txt")
-    round2_verdict = _read_verdict("round2.txt")
-    agent = create_scenario_agent()
-    task = create_scenario_evaluation_task(
-        agent, resume, round1_verdict, round2_verdict, question, answer
-    )
-
-    crew = Crew(agents=[agent], tasks=[task], verbose=True)
-    verdict_text = _run_crew_with_retry(crew)
-
-    _write_verdict("round3.txt", verdict_text)
+    AGENT CONTEXT: Resume + round1 + round2 + candidate answer.
+    Writes: verdicts/<interview_id>/round3
+    """
+    with instrumentation.stage("scenario_evaluation", interview_id):
+        round1_verdict, round2_verdict = await _read_verdicts(interview_id, "round1", "round2")
+        verdict = await _run_routed(
+            "scenario_evaluation",
+            "scenario",
+            lambda agent: create_scenario_evaluation_task(
+                agent, resume, round1_verdict, round2_verdict, question, answer
+            ),
+            ScenarioVerdict,
+            on_token,
+        )
+        verdict_text = verdict.render()
 
-    decision = _parse_decision(verdict_text)
+        await _write_verdict(interview_id, "round3", verdict_text, verdict)
 
-    return {
-        "round": 3,
-        "decision": decision,
-        "verdict": verdict_text,
-    }
+        return _round_result(3, verdict, verdict_text)
 
 
 # ── Final: Hiring Committee ─────────────────────────────────────────
 
 
-def run_hiring_committee() -> dict:
-    """
-    Run the Hiring Committee Agent.
-    AGENT CONTEXT: ONLY verdict files (no resume, no raw answers).
-    This is a critical design choice — the committee judges on peer verdicts.
-    """
-    round1_verdict = _read_verdict("round1.txt")
-    round2_verdict = _read_verdict("round2.txt")
-    round3_verdict = _read_verdict("round3.txt")
-
-    agent = create_hiring_committee_agent()
-    task = create_hiring_decision_task(
-        agent, round1_verdict, round2_verdict, round3_verdict
+def _split_decision(ballot: committee.Ballot, sample: HiringDecision) -> HiringDecision:
+    """The tie decision, for a committee whose samples split without a majority."""
+    return HiringDecision(
+        decision=committee.TIE_DECISION,
+        round_summaries=sample.round_summaries,
+        overall_assessment=(
+            f"The committee samples were split with no majority ({ballot.render()})."
+        ),
+        recommendation="Hold for a human review of the round verdicts.",
     )
 
-    crew = Crew(agents=[agent], tasks=[task], verbose=True)
-    decision_text = _run_crew_with_retry(crew)
-
-    decision = _parse_decision(decision_text)
 
-    return {
-        "decision": decision,
-        "rationale": decision_text,
+async def _committee_vote(verdicts: list) -> tuple:
+    """
+    Request COMMITTEE_SAMPLES committee decisions at once and vote on
+    them (committee.py). Returns (decision, ballot, samples cancelled);
+    the decision is the first sample, by member number, that voted for
+    the winner.
+    """
+    members = committee.COMMITTEE_SAMPLES
+    ballot = committee.Ballot(members)
+    pending = {
+        asyncio.create_task(
+            _run_routed(
+                "hiring_committee",
+                "hiring_committee",
+                lambda agent, member=member: create_hiring_decision_task(
+                    agent, *verdicts, member, members
+                ),
+                HiringDecision,
+                sampling=committee.sampling(member),
+            )
+        ): member
+        for member in range(1, members + 1)
     }
+    decisions: dict = {}
+    error: Optional[BaseException] = None
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + committee.COMMITTEE_TIMEOUT_SECONDS
+    try:
+        while pending and not ballot.settled():
+            done, _ = await asyncio.wait(
+                pending,
+                timeout=max(0.0, deadline - loop.time()),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                logger.warning(
+                    f"Committee vote closed after {committee.COMMITTEE_TIMEOUT_SECONDS}s "
+                    f"with {ballot.cast} of {members} samples"
+                )
+                break
+            for task in done:
+                member = pending.pop(task)
+                if task.exception() is not None:
+                    error = error or task.exception()
+                    ballot.abstain()
+                    logger.warning(f"Committee sample {member} failed: {task.exception()}")
+                    continue
+                decisions[member] = task.result()
+                ballot.add(task.result().decision)
+    finally:
+        for task in pending:
+            task.cancel()
+            # Retrieve the outcome so a cancelled sample is never logged as unhandled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    instrumentation.record_committee_vote(
+        ballot.agreement(), ballot.cast, ballot.failed, len(pending)
+    )
+    if not ballot.cast:
+        raise error or TimeoutError(
+            f"No committee sample finished within {committee.COMMITTEE_TIMEOUT_SECONDS}s"
+        )
+    winner = ballot.winner()
+    for member in sorted(decisions):
+        if decisions[member].decision == winner:
+            return decisions[member], ballot, len(pending)
+    return _split_decision(ballot, decisions[min(decisions)]), ballot, len(pending)
+
+
+async def run_hiring_committee(
+    interview_id: str, on_token: Optional[TokenCallback] = None
+) -> dict:
+    """
+    Run the Hiring Committee Agent — or, with COMMITTEE_SAMPLES > 1, an
+    ensemble of it, voting (see committee.py; "committee" in the result).
+    AGENT CONTEXT: ONLY verdicts (no resume, no raw answers).
+    This is a critical design choice — the committee judges on peer verdicts.
+    Writes: verdicts/<interview_id>/final
+    """
+    with instrumentation.stage("hiring_committee", interview_id):
+        verdicts = await _read_verdicts(interview_id, "round1", "round2", "round3")
+
+        if committee.COMMITTEE_SAMPLES > 1:
+            decision, ballot, cancelled = await _committee_vote(verdicts)
+            rationale = f"{decision.render()}\n\n{ballot.render()}"
+        else:
+            decision = await _run_routed(
+                "hiring_committee",
+                "hiring_committee",
+                lambda agent: create_hiring_decision_task(agent, *verdicts),
+                HiringDecision,
+                on_token,
+            )
+            rationale = decision.render()
+        await _write_verdict(interview_id, "final", rationale, decision)
+
+        result = {
+            "decision": decision.decision,
+            "rationale": rationale,
+            "record": decision.model_dump(),
+        }
+        if committee.COMMITTEE_SAMPLES > 1:
+            result["committee"] = ballot.summary(cancelled)
+        return result
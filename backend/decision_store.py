@@ -0,0 +1,186 @@
+"""
+DECISION MEMORY — append-only verdict log in SQLite (WAL mode).
+
+Every verdict an agent writes becomes one row: interview, round name,
+role, decision, score, the rendered text later agents read, and the
+typed record (schemas.py). Rows are never updated or deleted — triggers
+reject both — so re-running a round appends a new row and reads return
+the latest one. The full history stays queryable by role, decision,
+score and time without scanning directories, and WAL lets every worker
+write concurrently while readers keep going.
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+DECISIONS_DB_PATH = os.getenv(
+    "DECISIONS_DB_PATH", os.path.join(os.path.dirname(__file__), "data", "decisions.db")
+)
+
+_initialised = False
+
+
+def check_interview_id(interview_id: str) -> None:
+    """Raise ValueError unless this looks like an ID from create_state()."""
+    if not re.fullmatch(r"[0-9a-f]{32}", interview_id):
+        raise ValueError(f"Invalid interview ID: {interview_id!r}")
+
+
+# ── Storage ─────────────────────────────────────────────────────────
+
+
+@contextmanager
+def _connect():
+    """Open an autocommit connection to the decision database."""
+    global _initialised
+    os.makedirs(os.path.dirname(DECISIONS_DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(DECISIONS_DB_PATH, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    try:
+        if not _initialised:
+            _init_schema(conn)
+            _initialised = True
+        yield conn
+    finally:
+        conn.close()
+
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS verdicts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            interview_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            role TEXT,
+            decision TEXT,
+            score REAL,
+            content TEXT NOT NULL,
+            record TEXT,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_verdicts_interview ON verdicts (interview_id, name, id);
+        CREATE INDEX IF NOT EXISTS idx_verdicts_role ON verdicts (role, created_at);
+        CREATE INDEX IF NOT EXISTS idx_verdicts_decision ON verdicts (decision, created_at);
+        CREATE INDEX IF NOT EXISTS idx_verdicts_score ON verdicts (score);
+        CREATE INDEX IF NOT EXISTS idx_verdicts_created ON verdicts (created_at);
+
+        CREATE TRIGGER IF NOT EXISTS verdicts_no_update BEFORE UPDATE ON verdicts
+        BEGIN SELECT RAISE(ABORT, 'decision memory is append-only'); END;
+        CREATE TRIGGER IF NOT EXISTS verdicts_no_delete BEFORE DELETE ON verdicts
+        BEGIN SELECT RAISE(ABORT, 'decision memory is append-only'); END;
+        """
+    )
+
+
+def _row_to_verdict(row: sqlite3.Row) -> dict:
+    return {
+        "id": row["id"],
+        "interview_id": row["interview_id"],
+        "name": row["name"],
+        "role": row["role"],
+        "decision": row["decision"],
+        "score": row["score"],
+        "content": row["content"],
+        "record": json.loads(row["record"]) if row["record"] else None,
+        "created_at": row["created_at"],
+    }
+
+
+# ── Public API ──────────────────────────────────────────────────────
+
+
+def write_verdict(
+    interview_id: str,
+    name: str,
+    content: str,
+    record: Optional[dict] = None,
+    role: Optional[str] = None,
+) -> int:
+    """
+    Append one verdict and return its row ID.
+    decision / score are taken from the typed record; the role defaults to
+    the one recorded by this interview's earlier rounds.
+    """
+    check_interview_id(interview_id)
+    record = record or {}
+    with _connect() as conn:
+        cursor = conn.execute(
+            "INSERT INTO verdicts "
+            "(interview_id, name, role, decision, score, content, record, created_at) "
+            "VALUES (?, ?, COALESCE(?, (SELECT role FROM verdicts "
+            "WHERE interview_id = ? AND role IS NOT NULL ORDER BY id LIMIT 1)), "
+            "?, ?, ?, ?, ?)",
+            (
+                interview_id,
+                name,
+                role,
+                interview_id,
+                record.get("decision"),
+                record.get("score"),
+                content,
+                json.dumps(record) if record else None,
+                time.time(),
+            ),
+        )
+        return cursor.lastrowid
+
+
+def read_verdicts(interview_id: str, names: List[str]) -> Dict[str, dict]:
+    """Latest row of each named verdict, in one query (missing names are absent)."""
+    check_interview_id(interview_id)
+    placeholders = ", ".join("?" for _ in names)
+    with _connect() as conn:
+        rows = conn.execute(
+            f"SELECT * FROM verdicts WHERE id IN ("
+            f"SELECT MAX(id) FROM verdicts WHERE interview_id = ? "
+            f"AND name IN ({placeholders}) GROUP BY name)",
+            (interview_id, *names),
+        ).fetchall()
+    return {row["name"]: _row_to_verdict(row) for row in rows}
+
+
+def interview_history(interview_id: str) -> List[dict]:
+    """Every verdict ever written for one interview, oldest first."""
+    check_interview_id(interview_id)
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT * FROM verdicts WHERE interview_id = ? ORDER BY id",
+            (interview_id,),
+        ).fetchall()
+    return [_row_to_verdict(row) for row in rows]
+
+
+def search_verdicts(
+    role: Optional[str] = None,
+    name: Optional[str] = None,
+    decision: Optional[str] = None,
+    min_score: Optional[float] = None,
+    since: Optional[float] = None,
+    limit: int = 50,
+) -> List[dict]:
+    """History query across interviews, newest first."""
+    clauses, params = [], []
+    for column, value in (("role", role), ("name", name), ("decision", decision)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if min_score is not None:
+        clauses.append("score >= ?")
+        params.append(min_score)
+    if since is not None:
+        clauses.append("created_at >= ?")
+        params.append(since)
+    where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+    with _connect() as conn:
+        rows = conn.execute(
+            f"SELECT * FROM verdicts {where}ORDER BY created_at DESC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+    return [_row_to_verdict(row) for row in rows]
@@ -0,0 +1,236 @@
+"""
+Fake LLM — a deterministic stand-in for Gemini, for load tests and benchmarks.
+
+Registered as the LiteLLM custom provider "fake", so LLM_MODEL=fake/<name>
+runs the whole pipeline (CrewAI, the rate limiter, retries, streaming)
+without network calls or quota. Each reply is a valid JSON answer for the
+task in the prompt, wrapped in CrewAI's "Final Answer:" format.
+
+Timing is drawn per call, seeded by the prompt and how often it has been
+seen, so a run with the same inputs and FAKE_LLM_SEED is reproducible:
+  - time to first token: lognormal around FAKE_LLM_LATENCY_MS
+  - generation: completion tokens / a rate around FAKE_LLM_TOKENS_PER_SECOND
+  - FAKE_LLM_429_RATE of calls fail with a rate-limit error instead
+
+Prefix caching is simulated like Gemini's implicit cache: the longest
+prompt prefix (cut at a markdown heading) this model has already seen,
+if at least FAKE_LLM_CACHE_MIN_TOKENS long, is reported as cached
+(usage.prompt_tokens_details.cached_tokens). FAKE_LLM_CACHE_MIN_TOKENS=0
+turns the simulation off.
+"""
+
+import os
+import re
+import json
+import math
+import time
+import random
+import hashlib
+import threading
+from typing import Iterator
+from collections import OrderedDict
+
+import litellm
+from litellm import CustomLLM
+from litellm.types.utils import ModelResponse
+
+FAKE_PROVIDER = "fake"
+FAKE_LLM_SEED = os.getenv("FAKE_LLM_SEED", "0")
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "800"))
+FAKE_LLM_LATENCY_SIGMA = float(os.getenv("FAKE_LLM_LATENCY_SIGMA", "0.35"))
+FAKE_LLM_TOKENS_PER_SECOND = float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "150"))
+FAKE_LLM_TOKEN_RATE_JITTER = float(os.getenv("FAKE_LLM_TOKEN_RATE_JITTER", "0.2"))
+FAKE_LLM_429_RATE = float(os.getenv("FAKE_LLM_429_RATE", "0"))
+FAKE_LLM_PASS_RATE = float(os.getenv("FAKE_LLM_PASS_RATE", "0.8"))
+FAKE_LLM_CACHE_MIN_TOKENS = int(os.getenv("FAKE_LLM_CACHE_MIN_TOKENS", "1024"))
+FAKE_LLM_CACHE_ENTRIES = int(os.getenv("FAKE_LLM_CACHE_ENTRIES", "10000"))
+
+STREAM_CHUNK_CHARS = 16
+
+
+def _prompt_text(messages: list) -> str:
+    parts = []
+    for message in messages:
+        content = message.get("content") or ""
+        if isinstance(content, list):
+            content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+        parts.append(content)
+    return "\n".join(parts)
+
+
+def _verdict(rng: random.Random, decisions: tuple, label: str) -> dict:
+    passed = rng.random() < FAKE_LLM_PASS_RATE
+    decision = decisions[0] if passed else rng.choice(decisions[1:])
+    return {
+        "decision": decision,
+        "score": round(rng.uniform(6.5, 9.5) if passed else rng.uniform(2.0, 6.0), 1),
+        "strengths": ["Clear structure", "Relevant hands-on experience"],
+        "weaknesses": ["Limited depth on trade-offs"],
+        "reasoning": f"Synthetic {label} from the fake LLM provider.",
+    }
+
+
+SCENARIO_TEXT = "A deploy doubled p99 latency on the checkout service. Walk us through your response."
+
+# The format a request asks for: "Reply in the <FORMAT> format." (prompts.py)
+REQUESTED_FORMAT = re.compile(r"Reply in the ([A-Z ]+) format\.")
+
+
+def fake_answer(prompt: str, rng: random.Random) -> dict:
+    """A schema-valid answer for whichever task the prompt is for."""
+    requested = REQUESTED_FORMAT.findall(prompt)
+    output_format = requested[-1] if requested else ""
+    if output_format == "SCREENING VERDICT":
+        return {
+            **_verdict(rng, ("PASS", "BORDERLINE", "FAIL"), "screening verdict"),
+            "recommended_questions": [
+                "Walk through a system you designed end to end.",
+                "How would you debug a latency regression in production?",
+            ],
+        }
+    if output_format == "HIRING DECISION":
+        decision = "HIRE" if rng.random() < FAKE_LLM_PASS_RATE else rng.choice(("HOLD", "REJECT"))
+        return {
+            "decision": decision,
+            "round_summaries": [
+                "Round 1 (Screening): PASS — synthetic",
+                "Round 2 (Technical): PASS — synthetic",
+                "Round 3 (Scenario): PASS — synthetic",
+            ],
+            "overall_assessment": "Synthetic hiring decision from the fake LLM provider.",
+            "recommendation": "None — benchmark run.",
+        }
+    if output_format == "TECHNICAL QUESTIONS":
+        return {
+            "questions": [
+                "Explain how you would design a rate limiter shared by many workers.",
+                "What are the trade-offs between optimistic and pessimistic locking?",
+            ]
+        }
+    if output_format == "SCENARIO QUESTION":
+        return {"question": SCENARIO_TEXT}
+    if output_format == "QUESTION GRADE":
+        grade = _verdict(rng, ("PASS", "FAIL"), "question grade")
+        del grade["decision"]
+        return grade
+    if output_format.startswith("TECHNICAL VERDICT"):
+        verdict = _verdict(rng, ("PASS", "FAIL"), "technical verdict")
+        if output_format.endswith("WITH SCENARIO"):  # fused evaluation + next question
+            verdict["scenario_question"] = SCENARIO_TEXT if verdict["decision"] == "PASS" else None
+        return verdict
+    return _verdict(rng, ("PASS", "BORDERLINE", "FAIL"), "scenario verdict")
+
+
+class FakeLLM(CustomLLM):
+    """LiteLLM custom provider with synthetic latency, token rate and 429s."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+        self._seen: dict = {}
+        self._prefixes: OrderedDict = OrderedDict()
+
+    def _cached_tokens(self, model: str, prompt: str) -> int:
+        """Tokens of the longest already-seen prefix; remembers this prompt's prefixes."""
+        if FAKE_LLM_CACHE_MIN_TOKENS <= 0:
+            return 0
+        cuts = [match.start() for match in re.finditer(r"\n#", prompt)] + [len(prompt)]
+        digest = hashlib.sha256(model.encode())
+        start, cached = 0, 0
+        with self._lock:
+            for cut in cuts:
+                digest.update(prompt[start:cut].encode())
+                start = cut
+                if cut // 4 < FAKE_LLM_CACHE_MIN_TOKENS:
+                    continue
+                key = digest.hexdigest()
+                if key in self._prefixes:
+                    cached = cut // 4
+                    self._prefixes.move_to_end(key)
+                else:
+                    self._prefixes[key] = True
+            while len(self._prefixes) > FAKE_LLM_CACHE_ENTRIES:
+                self._prefixes.popitem(last=False)
+        return cached
+
+    def _plan(self, model: str, messages: list) -> dict:
+        prompt = _prompt_text(messages)
+        digest = hashlib.sha256(prompt.encode()).hexdigest()
+        with self._lock:
+            attempt = self._seen.get(digest, 0)
+            self._seen[digest] = attempt + 1
+        rng = random.Random(f"{FAKE_LLM_SEED}:{digest}:{attempt}")
+
+        if rng.random() < FAKE_LLM_429_RATE:
+            time.sleep(rng.uniform(0.01, 0.05))
+            raise litellm.RateLimitError(
+                message="Fake provider rate limit (429): retry in 1s",
+                llm_provider=FAKE_PROVIDER,
+                model=model,
+            )
+
+        text = (
+            "Thought: I now can give a great answer\n"
+            f"Final Answer: {json.dumps(fake_answer(prompt, rng))}"
+        )
+        prompt_tokens = max(1, len(prompt) // 4)
+        cached_tokens = self._cached_tokens(model, prompt)
+        completion_tokens = max(1, len(text) // 4)
+        first_token = FAKE_LLM_LATENCY_MS / 1000 * math.exp(
+            rng.gauss(0, FAKE_LLM_LATENCY_SIGMA) - FAKE_LLM_LATENCY_SIGMA ** 2 / 2
+        )
+        rate = max(1.0, rng.gauss(FAKE_LLM_TOKENS_PER_SECOND,
+                                  FAKE_LLM_TOKENS_PER_SECOND * FAKE_LLM_TOKEN_RATE_JITTER))
+        return {
+            "text": text,
+            "first_token": first_token,
+            "generation": completion_tokens / rate,
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens},
+            },
+        }
+
+    def completion(self, model: str, messages: list, *args, **kwargs) -> ModelResponse:
+        plan = self._plan(model, messages)
+        time.sleep(plan["first_token"] + plan["generation"])
+        response = kwargs.get("model_response") or ModelResponse()
+        response.model = model
+        response.choices[0].message.content = plan["text"]
+        response.choices[0].finish_reason = "stop"
+        response.usage = litellm.Usage(**plan["usage"])
+        return response
+
+    def streaming(self, model: str, messages: list, *args, **kwargs) -> Iterator[dict]:
+        plan = self._plan(model, messages)
+        text = plan["text"]
+        time.sleep(plan["first_token"])
+        chunks = [text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)]
+        pause = plan["generation"] / len(chunks)
+        for index, chunk in enumerate(chunks):
+            time.sleep(pause)
+            last = index == len(chunks) - 1
+            yield {
+                "text": chunk,
+                "tool_use": None,
+                "is_finished": last,
+                "finish_reason": "stop" if last else "",
+                "usage": plan["usage"] if last else None,
+                "index": 0,
+            }
+
+
+_registered = False
+
+
+def register() -> None:
+    """Make "fake/<anything>" model names resolve to FakeLLM (idempotent)."""
+    global _registered
+    if _registered:
+        return
+    litellm.custom_provider_map = [
+        entry for entry in litellm.custom_provider_map if entry["provider"] != FAKE_PROVIDER
+    ] + [{"provider": FAKE_PROVIDER, "custom_handler": FakeLLM()}]
+    _registered = True
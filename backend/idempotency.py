@@ -0,0 +1,165 @@
+"""
+Idempotency — idempotency keys and single-flight coalescing for step endpoints.
+
+The frontend retries and double-submits slow requests. Each duplicate
+/round/N/answer used to append the answer again and start another full
+evaluation (or, since sessions are claimed, fail with a 409). Now
+/start and /round/{2,3}/answer (blocking or streamed) run at most once
+per request identity:
+  - concurrent identical requests share one in-flight execution and all
+    get its response (coalescing)
+  - a request that repeats a finished one gets the stored response back
+    (replay), from a bounded in-process cache
+    (IDEMPOTENCY_MAX_ENTRIES, IDEMPOTENCY_TTL_SECONDS)
+
+The identity is the Idempotency-Key header when the client sends one,
+otherwise a hash of the endpoint and request body. Without a key, a
+repeated /start is a new interview once the first has finished (only
+in-flight duplicates coalesce), while a repeated round answer replays.
+Keys are scoped to the endpoint; reusing a key on the same endpoint for
+a different request raises IdempotencyConflict.
+
+Only successful responses are stored; a failed execution is shared with
+the requests coalesced onto it, and the next retry runs afresh. Work
+shared by several requests is shielded from any one of them
+disconnecting. Coalescing is per worker — across workers a duplicate is
+still turned away by the session claim (pipeline.py).
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 60 * 60)))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "1000"))
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+class IdempotencyConflict(Exception):
+    """An idempotency key was reused for a different request."""
+
+
+def fingerprint(endpoint: str, body: dict) -> str:
+    """Hash of what makes two requests the same request."""
+    blob = json.dumps({"endpoint": endpoint, "body": body}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """In-flight executions and a bounded TTL cache of their results, by key."""
+
+    def __init__(
+        self,
+        ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS,
+        max_entries: int = IDEMPOTENCY_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._in_flight: dict = {}  # key -> (fingerprint, task)
+        self._done: OrderedDict = OrderedDict()  # key -> (expires_at, fingerprint, result)
+        self.counters = {"executed": 0, "coalesced": 0, "replayed": 0, "conflicts": 0}
+
+    def _check(self, expected: str, seen: str) -> None:
+        if seen != expected:
+            self.counters["conflicts"] += 1
+            raise IdempotencyConflict(
+                "This Idempotency-Key was already used for a different request."
+            )
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        while self._done:
+            expires_at = next(iter(self._done.values()))[0]
+            if expires_at > now:
+                break
+            self._done.popitem(last=False)
+
+    def _finished(self, key: str, request_fingerprint: str, replay: bool, task) -> None:
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None or not replay:
+            return
+        self._done[key] = (
+            time.monotonic() + self.ttl_seconds, request_fingerprint, task.result()
+        )
+        while len(self._done) > self.max_entries:
+            self._done.popitem(last=False)
+
+    async def run(
+        self,
+        key: str,
+        request_fingerprint: str,
+        call: Callable[[], Awaitable],
+        replay: bool = True,
+    ) -> tuple:
+        """
+        Run call() at most once per key. Returns (result, outcome) where
+        outcome is "executed", "coalesced" (joined a run in flight) or
+        "replayed" (a finished run's result). replay=False coalesces only
+        and forgets the result once the run ends.
+        """
+        self._expire()
+        done = self._done.get(key)
+        if done is not None:
+            self._check(done[1], request_fingerprint)
+            self.counters["replayed"] += 1
+            return done[2], "replayed"
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self._check(in_flight[0], request_fingerprint)
+            self.counters["coalesced"] += 1
+            return await asyncio.shield(in_flight[1]), "coalesced"
+
+        task = asyncio.ensure_future(call())
+        self._in_flight[key] = (request_fingerprint, task)
+        task.add_done_callback(
+            lambda finished: self._finished(key, request_fingerprint, replay, finished)
+        )
+        self.counters["executed"] += 1
+        return await asyncio.shield(task), "executed"
+
+    def active(self, key: str) -> bool:
+        """Whether key has a run in flight or a stored result to replay."""
+        self._expire()
+        return key in self._in_flight or key in self._done
+
+    def stats(self) -> dict:
+        self._expire()
+        return {
+            "in_flight": len(self._in_flight),
+            "stored": len(self._done),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            **self.counters,
+        }
+
+
+def request_key(
+    endpoint: str, body: dict, idempotency_key: Optional[str]
+) -> tuple:
+    """
+    (key, fingerprint, replay) for a request: the client's Idempotency-Key
+    scoped to the endpoint (always replayable), else the request
+    fingerprint itself, replayable unless this is a /start. Raises
+    ValueError for an over-long key.
+    """
+    request_fingerprint = fingerprint(endpoint, body)
+    if idempotency_key:
+        if len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise ValueError(
+                f"Idempotency-Key must be at most {IDEMPOTENCY_KEY_MAX_LENGTH} characters."
+            )
+        # The same key on another endpoint is another request, not a conflict
+        return f"key:{endpoint}:{idempotency_key}", request_fingerprint, True
+    return f"request:{request_fingerprint}", request_fingerprint, endpoint != "/start"
+
+
+# Process-wide coalescing / replay state used by routes.py
+step_flights = SingleFlight()
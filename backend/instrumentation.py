@@ -0,0 +1,448 @@
+"""
+Instrumentation — where an interview's time goes.
+
+Hot-path timings are recorded three ways:
+  - Prometheus histograms / counters, served as text by GET /metrics:
+    stage wall time (every crew_runner run_*), crew run time split into
+    LLM time and queue wait, retries, prompt / completion tokens, LLM cache
+    hits, per-tier latency / cost and cascade escalations (model_router.py)
+    and decision-memory / session I/O.
+  - Per-round totals of the same numbers, kept in SESSION CONTEXT under
+    "timings" and reported by GET /status.
+  - Optional OpenTelemetry spans (TRACING=1), one per stage and crew run,
+    tagged with the interview ID. They are exported over OTLP/HTTP when
+    OTEL_EXPORTER_OTLP_ENDPOINT is set, else printed to the console. The
+    tracer has its own provider, so spans never mix with CrewAI's telemetry.
+
+Metrics are per process: scrape every worker.
+"""
+
+import os
+import time
+import math
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+TRACING = os.getenv("TRACING", "0") == "1"
+SERVICE_NAME = "interview-agent"
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+
+# ── Prometheus metrics ──────────────────────────────────────────────
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> list:
+        with self._lock:
+            return [
+                f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self._values.items())
+            ]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = SECONDS_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets) + (math.inf,)
+        self._series: dict = {}  # labels → [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            series = self._series.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self) -> list:
+        lines = []
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {count}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(series[-2])}")
+                lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+STAGE_SECONDS = Histogram(
+    "interview_stage_seconds", "Wall time of one crew_runner stage.", ("stage", "outcome")
+)
+CREW_RUN_SECONDS = Histogram(
+    "llm_crew_run_seconds", "Wall time of one crew run, retries and waits included.", ("kind",)
+)
+LLM_CALL_SECONDS = Histogram(
+    "llm_call_seconds", "Time inside LLM provider calls during one crew attempt.", ("kind",)
+)
+CREW_OVERHEAD_SECONDS = Histogram(
+    "llm_crew_overhead_seconds", "Crew attempt time not spent in LLM calls (CrewAI overhead).", ("kind",)
+)
+QUEUE_WAIT_SECONDS = Histogram(
+    "llm_queue_wait_seconds", "Time a crew run waited for the rate limiter or a worker thread.", ("kind", "queue")
+)
+LLM_TOKENS = Histogram(
+    "llm_tokens", "Tokens used by one crew run.", ("kind", "direction"), buckets=TOKEN_BUCKETS
+)
+LLM_RETRIES = Counter("llm_retries", "Crew attempts retried after a rate-limit error.", ("kind",))
+RETRY_WAIT_SECONDS = Counter(
+    "llm_retry_wait_seconds", "Backoff slept between rate-limited attempts.", ("kind",)
+)
+LLM_CACHE_LOOKUPS = Counter("llm_cache_lookups", "LLM response cache lookups by result.", ("kind", "result"))
+IO_SECONDS = Histogram(
+    "interview_io_seconds", "Decision memory and session store operations.", ("operation",)
+)
+TIER_RUN_SECONDS = Histogram(
+    "llm_tier_run_seconds", "Wall time of one routed task run, by model tier.", ("task", "tier")
+)
+TIER_COST_USD = Counter("llm_tier_cost_usd", "Estimated provider cost by model tier.", ("tier",))
+ESCALATIONS = Counter(
+    "llm_cascade_escalations", "Small-tier outputs re-run on the large tier, by reason.", ("task", "reason")
+)
+FUSED_TRANSITIONS = Counter(
+    "interview_fused_transitions",
+    "Round transitions whose next question came with the verdict, or fell back to a second call.",
+    ("transition", "result"),
+)
+ANSWER_SPLITS = Counter(
+    "interview_answer_splits",
+    "Technical answers split per question for grading, by how they were split.",
+    ("method",),
+)
+COMMITTEE_AGREEMENT = Histogram(
+    "interview_committee_agreement",
+    "Share of committee ensemble votes that went to the final decision.",
+    buckets=(0.2, 0.4, 0.5, 0.6, 0.67, 0.75, 0.8, 0.9, 1.0),
+)
+COMMITTEE_SAMPLE_OUTCOMES = Counter(
+    "interview_committee_samples",
+    "Committee ensemble samples that voted, failed, or were cancelled once the vote was settled.",
+    ("outcome",),
+)
+IDEMPOTENT_REQUESTS = Counter(
+    "interview_idempotent_requests",
+    "Step requests executed, coalesced onto one in flight, or replayed.",
+    ("endpoint", "outcome"),
+)
+
+METRICS = [
+    STAGE_SECONDS,
+    CREW_RUN_SECONDS,
+    LLM_CALL_SECONDS,
+    CREW_OVERHEAD_SECONDS,
+    QUEUE_WAIT_SECONDS,
+    LLM_TOKENS,
+    LLM_RETRIES,
+    RETRY_WAIT_SECONDS,
+    LLM_CACHE_LOOKUPS,
+    IO_SECONDS,
+    TIER_RUN_SECONDS,
+    TIER_COST_USD,
+    ESCALATIONS,
+    FUSED_TRANSITIONS,
+    ANSWER_SPLITS,
+    COMMITTEE_AGREEMENT,
+    COMMITTEE_SAMPLE_OUTCOMES,
+    IDEMPOTENT_REQUESTS,
+]
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+# ── Per-round timing ────────────────────────────────────────────────
+
+
+class RoundTiming:
+    """Totals for everything one pipeline step runs (speculative work included)."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self.totals = {
+            "crew_runs": 0,
+            "crew_seconds": 0.0,
+            "llm_seconds": 0.0,
+            "queue_wait_seconds": 0.0,
+            "retries": 0,
+            "retry_wait_seconds": 0.0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cached_prompt_tokens": 0,
+            "cache_hits": 0,
+            "cost_usd": 0.0,
+            "escalations": 0,
+            "io_seconds": 0.0,
+        }
+
+    def add(self, **amounts) -> None:
+        with self._lock:
+            for name, amount in amounts.items():
+                self.totals[name] += amount
+
+    def summary(self) -> dict:
+        with self._lock:
+            totals = dict(self.totals)
+        wall = time.monotonic() - self.started
+        return {
+            "wall_seconds": round(wall, 3),
+            **{
+                k: round(v, 6 if k == "cost_usd" else 3) if isinstance(v, float) else v
+                for k, v in totals.items()
+            },
+            "crewai_overhead_seconds": round(
+                max(0.0, totals["crew_seconds"] - totals["llm_seconds"]), 3
+            ),
+        }
+
+
+_round_timing: contextvars.ContextVar = contextvars.ContextVar("round_timing", default=None)
+_interview_id: contextvars.ContextVar = contextvars.ContextVar("interview_id", default=None)
+
+
+@contextmanager
+def round_timing():
+    """Collect the costs of one pipeline step; yields its RoundTiming."""
+    timing = RoundTiming()
+    token = _round_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _round_timing.reset(token)
+
+
+def _add_to_round(**amounts) -> None:
+    timing = _round_timing.get()
+    if timing is not None:
+        timing.add(**amounts)
+
+
+# ── Recording ───────────────────────────────────────────────────────
+
+
+def record_cache_lookup(kind: str, hit: bool) -> None:
+    LLM_CACHE_LOOKUPS.inc(kind=kind, result="hit" if hit else "miss")
+    if hit:
+        _add_to_round(cache_hits=1)
+
+
+def record_queue_wait(kind: str, queue: str, seconds: float) -> None:
+    QUEUE_WAIT_SECONDS.observe(seconds, kind=kind, queue=queue)
+    _add_to_round(queue_wait_seconds=seconds)
+
+
+def record_attempt(kind: str, attempt_seconds: float, llm_seconds: float) -> None:
+    """One kickoff: how much of it was the provider, how much CrewAI."""
+    LLM_CALL_SECONDS.observe(llm_seconds, kind=kind)
+    CREW_OVERHEAD_SECONDS.observe(max(0.0, attempt_seconds - llm_seconds), kind=kind)
+    _add_to_round(crew_seconds=attempt_seconds, llm_seconds=llm_seconds)
+
+
+def record_retry(kind: str, wait_seconds: float) -> None:
+    LLM_RETRIES.inc(kind=kind)
+    RETRY_WAIT_SECONDS.inc(wait_seconds, kind=kind)
+    _add_to_round(retries=1, retry_wait_seconds=wait_seconds)
+
+
+def record_crew_run(
+    kind: str,
+    seconds: float,
+    prompt_tokens: int,
+    completion_tokens: int,
+    cached_prompt_tokens: int = 0,
+    current_span=None,
+) -> None:
+    """
+    One finished crew run. Prompt tokens are split into the part the
+    provider served from its prefix cache and the rest, per call on the
+    crew.run span and as llm_tokens{direction="prompt_cached"|"prompt_uncached"}.
+    """
+    CREW_RUN_SECONDS.observe(seconds, kind=kind)
+    uncached = max(0, prompt_tokens - cached_prompt_tokens)
+    if prompt_tokens or completion_tokens:
+        LLM_TOKENS.observe(prompt_tokens, kind=kind, direction="prompt")
+        LLM_TOKENS.observe(completion_tokens, kind=kind, direction="completion")
+        LLM_TOKENS.observe(cached_prompt_tokens, kind=kind, direction="prompt_cached")
+        LLM_TOKENS.observe(uncached, kind=kind, direction="prompt_uncached")
+    if current_span is not None:
+        current_span.set_attribute("llm.prompt_tokens", prompt_tokens)
+        current_span.set_attribute("llm.cached_prompt_tokens", cached_prompt_tokens)
+        current_span.set_attribute("llm.completion_tokens", completion_tokens)
+    _add_to_round(
+        crew_runs=1,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        cached_prompt_tokens=cached_prompt_tokens,
+    )
+
+
+def record_tier_run(task: str, tier: str, seconds: float, cost_usd: float) -> None:
+    TIER_RUN_SECONDS.observe(seconds, task=task, tier=tier)
+    TIER_COST_USD.inc(cost_usd, tier=tier)
+    _add_to_round(cost_usd=cost_usd)
+
+
+def record_escalation(task: str, reason: str) -> None:
+    ESCALATIONS.inc(task=task, reason=reason)
+    _add_to_round(escalations=1)
+
+
+def record_fused_transition(transition: str, fused: bool) -> None:
+    FUSED_TRANSITIONS.inc(transition=transition, result="fused" if fused else "fallback")
+
+
+def record_answer_split(method: str) -> None:
+    ANSWER_SPLITS.inc(method=method)
+
+
+def record_committee_vote(agreement: float, voted: int, failed: int, cancelled: int) -> None:
+    COMMITTEE_AGREEMENT.observe(agreement)
+    for outcome, count in (("voted", voted), ("failed", failed), ("cancelled", cancelled)):
+        if count:
+            COMMITTEE_SAMPLE_OUTCOMES.inc(count, outcome=outcome)
+
+
+def record_idempotent_request(endpoint: str, outcome: str) -> None:
+    IDEMPOTENT_REQUESTS.inc(endpoint=endpoint, outcome=outcome)
+
+
+@contextmanager
+def io_timer(operation: str):
+    """Time one decision-memory / session-store operation."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        IO_SECONDS.observe(elapsed, operation=operation)
+        _add_to_round(io_seconds=elapsed)
+
+
+# ── Spans ───────────────────────────────────────────────────────────
+
+_tracer = None
+_provider = None
+_tracer_lock = threading.Lock()
+
+
+def _get_tracer():
+    """Build this service's tracer on first use (None when tracing is off or unavailable)."""
+    global _tracer, _provider, TRACING
+    if not TRACING or _tracer is not None:
+        return _tracer
+    with _tracer_lock:
+        if _tracer is not None:
+            return _tracer
+        try:
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+            if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+                from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+                exporter = OTLPSpanExporter()
+            else:
+                exporter = ConsoleSpanExporter()
+        except ImportError as e:
+            logger.warning(f"TRACING=1 but OpenTelemetry is not installed ({e}); spans disabled")
+            TRACING = False
+            return None
+        _provider = TracerProvider(resource=Resource.create({"service.name": SERVICE_NAME}))
+        _provider.add_span_processor(BatchSpanProcessor(exporter))
+        _tracer = _provider.get_tracer(__name__)
+    return _tracer
+
+
+def shutdown_tracing() -> None:
+    """Flush and stop the span exporter (app shutdown)."""
+    if _provider is not None:
+        _provider.shutdown()
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """An OpenTelemetry span tagged with the current interview ID (no-op unless TRACING=1)."""
+    tracer = _get_tracer()
+    if tracer is None:
+        yield None
+        return
+    interview_id = _interview_id.get()
+    if interview_id:
+        attributes.setdefault("interview.id", interview_id)
+    with tracer.start_as_current_span(
+        name, attributes={k: v for k, v in attributes.items() if v is not None}
+    ) as current:
+        yield current
+
+
+@contextmanager
+def stage(name: str, interview_id: Optional[str] = None):
+    """Time one crew_runner stage, as a histogram sample and a span."""
+    token = _interview_id.set(interview_id) if interview_id else None
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with span(f"stage.{name}", stage=name):
+            yield
+        outcome = "ok"
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=name, outcome=outcome)
+        if token is not None:
+            _interview_id.reset(token)
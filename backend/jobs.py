@@ -0,0 +1,297 @@
+"""
+Background Jobs — persistent SQLite queue + async worker pool.
+
+Long LLM rounds are enqueued here and processed by a pool of worker
+tasks, so HTTP requests return a job ID immediately and clients poll
+GET /jobs/{id}. The queue lives in SQLite and survives restarts: a job
+whose worker died is reclaimed once its lease expires, until it has
+been tried JOB_MAX_ATTEMPTS times; then it is failed.
+
+Job lifecycle: queued → running → done | failed
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+import sqlite3
+import contextvars
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Optional
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+JOBS_DB_PATH = os.getenv(
+    "JOBS_DB_PATH", os.path.join(os.path.dirname(__file__), "data", "jobs.db")
+)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_LEASE_SECONDS = 120  # a running job is reclaimed if its lease lapses
+JOB_MAX_ATTEMPTS = 3
+JOB_POLL_INTERVAL = 1.0  # seconds between queue scans when idle
+
+# kind → async handler(payload) -> result dict
+_handlers: dict = {}
+_workers: list = []
+_running: set = set()  # job IDs claimed by this process
+_wakeup: Optional[asyncio.Event] = None
+
+# ID of the job being processed, inside a worker's handler (else None);
+# steps claimed by a job record it, so the job can re-enter its own claim
+# when it is reclaimed after a crash (pipeline.py)
+current_job: contextvars.ContextVar = contextvars.ContextVar("current_job", default=None)
+
+
+def register_handler(kind: str, handler: Callable[[dict], Awaitable[dict]]) -> None:
+    """Register the coroutine that processes jobs of this kind."""
+    _handlers[kind] = handler
+
+
+# ── Storage ─────────────────────────────────────────────────────────
+
+
+@contextmanager
+def _connect():
+    """Open an autocommit connection to the queue database."""
+    os.makedirs(os.path.dirname(JOBS_DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(JOBS_DB_PATH, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def init_db() -> None:
+    """Create the jobs table if it does not exist."""
+    with _connect() as conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                interview_id TEXT,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_expires_at REAL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)"
+        )
+
+
+def _row_to_job(row: sqlite3.Row) -> dict:
+    return {
+        "job_id": row["id"],
+        "kind": row["kind"],
+        "interview_id": row["interview_id"],
+        "status": row["status"],
+        "attempts": row["attempts"],
+        "result": json.loads(row["result"]) if row["result"] else None,
+        "error": json.loads(row["error"]) if row["error"] else None,
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+    }
+
+
+def _insert(kind: str, payload: dict) -> str:
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    with _connect() as conn:
+        conn.execute(
+            "INSERT INTO jobs (id, kind, interview_id, payload, status, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+            (job_id, kind, payload.get("interview_id"), json.dumps(payload), now, now),
+        )
+    return job_id
+
+
+async def enqueue(kind: str, payload: dict) -> str:
+    """Persist a new job (off the event loop) and wake a worker. Returns the job ID."""
+    if kind not in _handlers:
+        raise ValueError(f"No handler registered for job kind: {kind}")
+    job_id = await asyncio.to_thread(_insert, kind, payload)
+    if _wakeup is not None:
+        _wakeup.set()
+    return job_id
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    """Return a job's status record, or None if unknown. Blocking (SQLite)."""
+    with _connect() as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return _row_to_job(row) if row else None
+
+
+def _claim_next() -> Optional[sqlite3.Row]:
+    """
+    Atomically claim the oldest queued job (or one with a lapsed lease).
+    A lapsed job already tried JOB_MAX_ATTEMPTS times keeps crashing its
+    worker: it is failed instead of being reclaimed again.
+    """
+    now = time.time()
+    with _connect() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, lease_expires_at = NULL, "
+                "updated_at = ? WHERE status = 'running' AND lease_expires_at < ? "
+                "AND attempts >= ?",
+                (
+                    json.dumps({
+                        "status_code": 500,
+                        "detail": f"Worker lost the job {JOB_MAX_ATTEMPTS} times; giving up.",
+                    }),
+                    now,
+                    now,
+                    JOB_MAX_ATTEMPTS,
+                ),
+            )
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' "
+                "OR (status = 'running' AND lease_expires_at < ? AND attempts < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (now, JOB_MAX_ATTEMPTS),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                    "lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                    (now + JOB_LEASE_SECONDS, now, row["id"]),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return row
+
+
+def _extend_lease(job_id: str) -> None:
+    now = time.time()
+    with _connect() as conn:
+        conn.execute(
+            "UPDATE jobs SET lease_expires_at = ?, updated_at = ? "
+            "WHERE id = ? AND status = 'running'",
+            (now + JOB_LEASE_SECONDS, now, job_id),
+        )
+
+
+def _finish(job_id: str, status: str, result=None, error=None) -> None:
+    with _connect() as conn:
+        conn.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, "
+            "lease_expires_at = NULL, updated_at = ? WHERE id = ?",
+            (
+                status,
+                json.dumps(result) if result is not None else None,
+                json.dumps(error) if error is not None else None,
+                time.time(),
+                job_id,
+            ),
+        )
+
+
+def _requeue(job_id: str, error: dict) -> None:
+    with _connect() as conn:
+        conn.execute(
+            "UPDATE jobs SET status = 'queued', error = ?, "
+            "lease_expires_at = NULL, updated_at = ? WHERE id = ?",
+            (json.dumps(error), time.time(), job_id),
+        )
+
+
+# ── Worker pool ─────────────────────────────────────────────────────
+
+
+async def _heartbeat(job_id: str) -> None:
+    """Keep a running job's lease alive while its handler works."""
+    while True:
+        await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+        await asyncio.to_thread(_extend_lease, job_id)
+
+
+async def _process(row: sqlite3.Row) -> None:
+    job_id = row["id"]
+    handler = _handlers.get(row["kind"])
+    if handler is None:
+        await asyncio.to_thread(
+            _finish, job_id, "failed", None, {"detail": f"Unknown job kind: {row['kind']}"}
+        )
+        return
+
+    _running.add(job_id)
+    heartbeat = asyncio.create_task(_heartbeat(job_id))
+    token = current_job.set(job_id)
+    try:
+        result = await handler(json.loads(row["payload"]))
+        await asyncio.to_thread(_finish, job_id, "done", result)
+    except HTTPException as e:
+        # Validation errors are permanent — never retried
+        await asyncio.to_thread(
+            _finish, job_id, "failed", None,
+            {"status_code": e.status_code, "detail": e.detail},
+        )
+    except Exception as e:
+        logger.error(f"Job {job_id} ({row['kind']}) failed: {e}")
+        error = {"status_code": 500, "detail": str(e)}
+        if row["attempts"] + 1 < JOB_MAX_ATTEMPTS:
+            await asyncio.to_thread(_requeue, job_id, error)
+        else:
+            await asyncio.to_thread(_finish, job_id, "failed", None, error)
+    finally:
+        current_job.reset(token)
+        heartbeat.cancel()
+        _running.discard(job_id)
+
+
+async def _worker_loop(worker_no: int) -> None:
+    while True:
+        try:
+            row = await asyncio.to_thread(_claim_next)
+        except Exception as e:
+            logger.error(f"Job worker {worker_no} could not claim a job: {e}")
+            row = None
+
+        if row is None:
+            _wakeup.clear()
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=JOB_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        await _process(row)
+
+
+async def start_workers(count: int = JOB_WORKERS) -> None:
+    """Start the background worker pool (called on app startup)."""
+    global _wakeup
+    init_db()
+    _wakeup = asyncio.Event()
+    for n in range(count):
+        _workers.append(asyncio.create_task(_worker_loop(n)))
+    logger.info(f"Started {count} job workers (queue: {JOBS_DB_PATH})")
+
+
+async def stop_workers() -> None:
+    """Cancel the worker pool and hand in-flight jobs back to the queue."""
+    interrupted = list(_running)
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    for job_id in interrupted:
+        await asyncio.to_thread(
+            _requeue, job_id, {"status_code": 503, "detail": "Worker shut down; job requeued."}
+        )
@@ -0,0 +1,301 @@
+"""
+LLM Response Cache — content-addressed, two-tier cache for crew outputs.
+
+A crew's output is keyed by a SHA-256 of what actually determines it:
+agent role, task description, expected output, model and temperature.
+Re-running the same resume against the same role (retries, demos,
+role comparisons) is then served without calling the provider.
+
+Tiers:
+  - memory — LRU, bounded by entry count
+  - disk   — one JSON file per key, bounded by total bytes (oldest evicted)
+Both tiers honour a TTL. A request can bypass the cache entirely via
+bypassing(True); bypassed calls neither read nor write the cache.
+Disk reads, writes and eviction scans run off the event loop (aget / aset).
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+import contextvars
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "1") == "1"
+LLM_CACHE_DIR = os.getenv(
+    "LLM_CACHE_DIR", os.path.join(os.path.dirname(__file__), "data", "llm_cache")
+)
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60)))
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256"))
+LLM_CACHE_DISK_MAX_BYTES = int(os.getenv("LLM_CACHE_DISK_MAX_BYTES", str(50 * 1024 * 1024)))
+
+_bypass: contextvars.ContextVar = contextvars.ContextVar("llm_cache_bypass", default=False)
+
+
+@contextmanager
+def bypassing(enabled: bool = True):
+    """Skip the cache for every crew run inside this block (and tasks it spawns)."""
+    token = _bypass.set(enabled)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def is_bypassed() -> bool:
+    """True inside a bypassing(True) block."""
+    return _bypass.get()
+
+
+def cache_key(crew) -> str:
+    """Content hash of (agent role, task description, model, temperature) per task."""
+    parts = []
+    for task in crew.tasks:
+        agent = task.agent
+        llm = getattr(agent, "llm", None)
+        parts.append(
+            {
+                "role": getattr(agent, "role", None),
+                "description": task.description,
+                "expected_output": task.expected_output,
+                "model": str(getattr(llm, "model", llm)),
+                "temperature": getattr(llm, "temperature", None),
+            }
+        )
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Memory LRU in front of a size-bounded disk tier.
+
+    get / set block on disk I/O; the event loop uses aget / aset, which
+    answer memory hits inline and run the disk read or write (and any
+    eviction scan) in a worker thread. Disk work is never done under the
+    memory tier's lock, so a hit is never held up by another call's I/O.
+    """
+
+    def __init__(
+        self,
+        directory: str = LLM_CACHE_DIR,
+        ttl_seconds: int = LLM_CACHE_TTL_SECONDS,
+        memory_entries: int = LLM_CACHE_MEMORY_ENTRIES,
+        disk_max_bytes: int = LLM_CACHE_DISK_MAX_BYTES,
+    ):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.memory_entries = memory_entries
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: OrderedDict = OrderedDict()  # key -> (created_at, value)
+        self._lock = threading.Lock()  # memory tier and counters
+        self._disk_lock = threading.Lock()  # disk byte count and eviction
+        self._disk_bytes: Optional[int] = None
+        self.counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+
+    # ── Disk tier ───────────────────────────────────────────────────
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _scan_disk_bytes(self) -> int:
+        if not os.path.isdir(self.directory):
+            return 0
+        return sum(
+            entry.stat().st_size
+            for entry in os.scandir(self.directory)
+            if entry.name.endswith(".json")
+        )
+
+    def _read_disk(self, key: str) -> Optional[tuple]:
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                record = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if time.time() - record["created_at"] > self.ttl_seconds:
+            with self._disk_lock:
+                self._remove_disk(path)
+            return None
+        return record["created_at"], record["value"]
+
+    def _remove_disk(self, path: str) -> None:
+        """Delete one file (caller holds _disk_lock)."""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        if self._disk_bytes is not None:
+            self._disk_bytes -= size
+
+    def _write_disk(self, key: str, created_at: float, value: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        # Unique per writer: two threads may store the same key at once
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"created_at": created_at, "value": value}, f)
+        size = os.path.getsize(tmp)
+        with self._disk_lock:
+            # An existing entry for key is replaced: count only the difference
+            try:
+                replaced = os.path.getsize(path)
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp, path)
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += size - replaced
+            if self._disk_bytes > self.disk_max_bytes:
+                self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """
+        Drop oldest files until the disk tier is back under 90% of its
+        budget (caller holds _disk_lock).
+        """
+        entries = sorted(
+            (e for e in os.scandir(self.directory) if e.name.endswith(".json")),
+            key=lambda e: e.stat().st_mtime,
+        )
+        self._disk_bytes = sum(e.stat().st_size for e in entries)
+        target = int(self.disk_max_bytes * 0.9)
+        evicted = 0
+        for entry in entries:
+            if self._disk_bytes <= target:
+                break
+            self._remove_disk(entry.path)
+            evicted += 1
+        with self._lock:
+            self.counters["evictions"] += evicted
+
+    def _store_disk(self, key: str, created_at: float, value: str) -> None:
+        try:
+            self._write_disk(key, created_at, value)
+        except OSError as e:
+            logger.warning(f"LLM cache disk write failed: {e}")
+
+    # ── Public API ──────────────────────────────────────────────────
+
+    def _bypassed(self) -> bool:
+        if not _bypass.get():
+            return False
+        with self._lock:
+            self.counters["bypassed"] += 1
+        return True
+
+    def _memory_lookup(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if now - entry[0] <= self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return entry[1]
+            del self._memory[key]
+            return None
+
+    def _disk_lookup(self, key: str) -> Optional[str]:
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            self._remember(key, entry)
+            self.counters["disk_hits"] += 1
+        return entry[1]
+
+    def _memory_store(self, key: str, value: str) -> float:
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, (created_at, value))
+            self.counters["stores"] += 1
+        return created_at
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached value, or None on miss / expiry / bypass."""
+        if self._bypassed():
+            return None
+        value = self._memory_lookup(key)
+        return value if value is not None else self._disk_lookup(key)
+
+    async def aget(self, key: str) -> Optional[str]:
+        """get() without blocking the event loop on the disk tier."""
+        if self._bypassed():
+            return None
+        value = self._memory_lookup(key)
+        if value is not None:
+            return value
+        return await asyncio.to_thread(self._disk_lookup, key)
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value in both tiers (no-op when bypassed)."""
+        if _bypass.get():
+            return
+        self._store_disk(key, self._memory_store(key, value), value)
+
+    async def aset(self, key: str, value: str) -> None:
+        """set() without blocking the event loop on the disk write / eviction."""
+        if _bypass.get():
+            return
+        await asyncio.to_thread(self._store_disk, key, self._memory_store(key, value), value)
+
+    def _remember(self, key: str, entry: tuple) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            disk_bytes = self._disk_bytes
+        with self._lock:
+            lookups = (
+                self.counters["memory_hits"]
+                + self.counters["disk_hits"]
+                + self.counters["misses"]
+            )
+            hits = self.counters["memory_hits"] + self.counters["disk_hits"]
+            return {
+                "enabled": LLM_CACHE_ENABLED,
+                **self.counters,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_bytes": disk_bytes,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        with self._disk_lock:
+            if os.path.isdir(self.directory):
+                for entry in os.scandir(self.directory):
+                    if entry.name.endswith(".json"):
+                        os.remove(entry.path)
+            self._disk_bytes = 0
+
+
+# Process-wide cache used by crew_runner
+response_cache = ResponseCache()
@@ -4,24 +4,33 @@ FastAPI Application Entry Point.
 Multi-Round AI Interview Agent System
 ─────────────────────────────────────
 4 specialized CrewAI agents conduct a multi-stage interview.
-Each round produces a verdict file. The final agent reads all
+Each round produces a verdict. The final agent reads all
 verdicts and makes a hiring decision.
 
 Memory Architecture:
-  1. SESSION CONTEXT  — in-memory (state.py)
-  2. DECISION MEMORY  — flat files (verdicts/*.txt)
+  1. SESSION CONTEXT  — per-interview session store (state.py)
+  2. DECISION MEMORY  — append-only SQLite log (decision_store.py)
   3. AGENT CONTEXT    — explicit passing (crew_runner.py)
 """
 
 import os
 from dotenv import load_dotenv
+
+# Load environment variables from .env file — before the app modules below,
+# which read their settings when imported
+load_dotenv()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from routes import router
-
-# Load environment variables from .env file
-load_dotenv()
+from crew_runner import agent_pool
+from rate_limiter import is_rate_limit_error
+from resume_ingest import shutdown_parser_pool
+from prescreen import prescreener
+from instrumentation import shutdown_tracing
+import jobs
+import warmup
 
 import logging
 logging.basicConfig(level=logging.INFO)
@@ -53,7 +62,7 @@ async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unhandled error: {error_msg}")
 
     # Detect rate-limit / quota errors from Gemini
-    if "429" in error_msg or "quota" in error_msg.lower() or "rate" in error_msg.lower():
+    if is_rate_limit_error(exc):
         return JSONResponse(
             status_code=429,
             content={
@@ -71,16 +80,37 @@ async def global_exception_handler(request: Request, exc: Exception):
 app.include_router(router)
 
 
+@app.on_event("startup")
+async def start_job_workers():
+    await jobs.start_workers()
+    # Import CrewAI and build each agent once, so the first interview doesn't
+    # pay for it — before serving, in the background or on first use
+    await warmup.start(agent_pool)
+
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    await jobs.stop_workers()
+    shutdown_parser_pool()
+    prescreener.save()
+    shutdown_tracing()
+
+
 @app.get("/")
 async def root():
     return {
         "service": "AI Interview Agent System",
         "status": "running",
         "endpoints": [
+            "POST /resumes",
             "POST /start",
             "POST /round/2/answer",
             "POST /round/3/answer",
             "GET  /final-decision",
             "GET  /status",
+            "GET  /jobs/{job_id}",
+            "GET  /verdicts",
+            "GET  /metrics",
+            "GET  /ready",
         ],
     }
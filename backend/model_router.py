@@ -0,0 +1,200 @@
+"""
+Model Router — which model runs each task, with cascade escalation.
+
+Two tiers:
+  - large: LLM_MODEL (default gemini/gemini-2.5-flash)
+  - small: LLM_MODEL_SMALL (default gemini/gemini-2.5-flash-lite)
+
+MODEL_ROUTING picks how tasks map onto them:
+  - single  (default) — every task runs on LLM_MODEL, as before
+  - tiered  — question generation runs on the small tier, verdicts on
+              the large one
+  - cascade — as tiered, but the verdict tasks (screening and both answer
+              evaluations) run on the small tier first, and are re-run on
+              the large tier when the small model is unsure (BORDERLINE /
+              HOLD) or its output fails strict schema validation
+MODEL_TIER_<TASK>=small|large|cascade overrides one task in tiered and
+cascade modes, e.g. MODEL_TIER_HIRING_COMMITTEE=cascade.
+
+Latency, tokens (cached prompt tokens included) and cost are tracked per tier (GET /models/stats, and the
+llm_tier_* series on /metrics). Cost comes from LiteLLM's price table;
+fake/<name> models are priced as the Gemini model they stand in for.
+"""
+
+import os
+import logging
+import threading
+from collections import deque
+
+from agents import LLM_MODEL
+
+logger = logging.getLogger(__name__)
+
+LLM_MODEL_SMALL = os.getenv("LLM_MODEL_SMALL", "gemini/gemini-2.5-flash-lite")
+if LLM_MODEL_SMALL.startswith("fake/"):
+    import fake_llm
+
+    fake_llm.register()
+
+MODEL_ROUTING = os.getenv("MODEL_ROUTING", "single")
+if MODEL_ROUTING not in ("single", "tiered", "cascade"):
+    raise ValueError(f"MODEL_ROUTING must be single, tiered or cascade, not {MODEL_ROUTING!r}")
+
+TIER_MODELS = {"small": LLM_MODEL_SMALL, "large": LLM_MODEL}
+
+# Tier per task in tiered mode; cascade mode cascades the verdict tasks
+TIERED_TASKS = {
+    "screening": "large",
+    "technical_questions": "small",
+    "technical_evaluation": "large",
+    "scenario_question": "small",
+    "scenario_evaluation": "large",
+    "hiring_committee": "large",
+}
+CASCADE_TASKS = ("screening", "technical_evaluation", "scenario_evaluation")
+
+# Decisions that send a small-tier verdict up to the large tier
+UNSURE_DECISIONS = {"BORDERLINE", "HOLD"}
+
+LATENCY_WINDOW = 1000  # recent runs per tier kept for percentiles
+
+
+def _task_tiers() -> dict:
+    if MODEL_ROUTING == "single":
+        return {task: "large" for task in TIERED_TASKS}
+    tiers = dict(TIERED_TASKS)
+    if MODEL_ROUTING == "cascade":
+        tiers.update({task: "cascade" for task in CASCADE_TASKS})
+    for task in tiers:
+        override = os.getenv(f"MODEL_TIER_{task.upper()}")
+        if override:
+            if override not in ("small", "large", "cascade"):
+                raise ValueError(
+                    f"MODEL_TIER_{task.upper()} must be small, large or cascade, not {override!r}"
+                )
+            tiers[task] = override
+    return tiers
+
+
+TASK_TIERS = _task_tiers()
+
+
+def plan(task: str) -> list:
+    """The tiers to try for a task, in order: one, or small then large for a cascade."""
+    tier = TASK_TIERS[task]
+    return ["small", "large"] if tier == "cascade" else [tier]
+
+
+def model_for(tier: str) -> str:
+    return TIER_MODELS[tier]
+
+
+def escalation_reason(output: str, model_cls) -> str:
+    """
+    Why a small-tier output should be re-run on the large tier — "format"
+    if it holds no valid JSON for model_cls (it would need the free-text
+    fallback), "unsure" for a BORDERLINE / HOLD decision — or "" to accept it.
+    """
+    parsed = model_cls.from_json(output)
+    if parsed is None:
+        return "format"
+    if getattr(parsed, "decision", None) in UNSURE_DECISIONS:
+        return "unsure"
+    return ""
+
+
+def run_cost(
+    model: str, prompt_tokens: int, completion_tokens: int, cached_prompt_tokens: int = 0
+) -> float:
+    """
+    USD cost of one run from LiteLLM's price table, cached prompt tokens at
+    the provider's cache-read rate; 0.0 for unpriced models.
+    """
+    if not (prompt_tokens or completion_tokens):
+        return 0.0
+    import litellm
+
+    names = [model]
+    if model.startswith("fake/"):
+        names.append(model.split("/", 1)[1])
+    for name in names:
+        try:
+            prompt_cost, completion_cost = litellm.cost_per_token(
+                model=name,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                cache_read_input_tokens=cached_prompt_tokens,
+            )
+        except Exception:
+            continue
+        return prompt_cost + completion_cost
+    return 0.0
+
+
+class RouterStats:
+    """Per-tier latency / tokens / cost and per-task escalation counts."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.tiers = {
+            tier: {"runs": 0, "cache_hits": 0, "seconds": 0.0, "prompt_tokens": 0,
+                   "cached_prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+            for tier in TIER_MODELS
+        }
+        self._latencies = {tier: deque(maxlen=LATENCY_WINDOW) for tier in TIER_MODELS}
+        self.cascades: dict = {}
+
+    def record_run(self, tier: str, seconds: float, usage: dict, cost: float) -> None:
+        with self._lock:
+            totals = self.tiers[tier]
+            totals["runs"] += 1
+            totals["cache_hits"] += int(usage.get("cached", False))
+            totals["seconds"] += seconds
+            totals["prompt_tokens"] += usage.get("prompt_tokens", 0)
+            totals["cached_prompt_tokens"] += usage.get("cached_prompt_tokens", 0)
+            totals["completion_tokens"] += usage.get("completion_tokens", 0)
+            totals["cost_usd"] += cost
+            self._latencies[tier].append(seconds)
+
+    def record_cascade(self, task: str, reason: str) -> None:
+        with self._lock:
+            counts = self.cascades.setdefault(task, {"runs": 0, "escalated": 0, "format": 0, "unsure": 0})
+            counts["runs"] += 1
+            if reason:
+                counts["escalated"] += 1
+                counts[reason] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            tiers = {tier: dict(totals) for tier, totals in self.tiers.items()}
+            latencies = {tier: sorted(samples) for tier, samples in self._latencies.items()}
+            cascades = {task: dict(counts) for task, counts in self.cascades.items()}
+
+        for tier, totals in tiers.items():
+            ordered = latencies[tier]
+            runs = totals["runs"]
+            totals.update(
+                model=TIER_MODELS[tier],
+                seconds=round(totals["seconds"], 3),
+                cost_usd=round(totals["cost_usd"], 6),
+                mean_seconds=round(totals["seconds"] / runs, 3) if runs else 0.0,
+                p50_seconds=round(ordered[len(ordered) // 2], 3) if ordered else 0.0,
+                p95_seconds=round(ordered[int(len(ordered) * 0.95)], 3) if ordered else 0.0,
+                cost_per_run_usd=round(totals["cost_usd"] / runs, 6) if runs else 0.0,
+                prompt_cache_hit_ratio=(
+                    round(totals["cached_prompt_tokens"] / totals["prompt_tokens"], 4)
+                    if totals["prompt_tokens"] else 0.0
+                ),
+            )
+        for counts in cascades.values():
+            counts["escalation_rate"] = round(counts["escalated"] / counts["runs"], 4)
+        return {
+            "routing": MODEL_ROUTING,
+            "task_tiers": TASK_TIERS,
+            "tiers": tiers,
+            "cascades": cascades,
+        }
+
+
+# Process-wide stats used by crew_runner
+router_stats = RouterStats()
@@ -0,0 +1,120 @@
+"""
+Per-question Evaluation — the technical round graded one answer at a time.
+
+By default one call grades every Round 2 question and the whole answer
+together: a long generation, and one failure loses the whole round.
+TECHNICAL_EVALUATION picks how the round is graded:
+  - single       (default) — one call for all questions, as before
+  - per_question — the questions and the candidate's answer are split into
+                   (question, answer) pairs, each pair is graded by its own
+                   short call, all at once, and the grades are merged here
+                   into the Round 2 verdict
+Wall time is then that of the slowest grading call, and a failed call is
+retried for its own question only (crew_runner.py).
+
+The answer is split on numbered markers ("1.", "Q2:", "Answer 3)") when
+there is exactly one per question, else on blank-line paragraphs when
+there are as many as questions; otherwise every question is graded
+against the whole answer. Merging is deterministic: the round score is
+the mean per-question score (an ungradable answer counts as 0), and the
+round is a PASS when that mean reaches TECHNICAL_PASS_SCORE.
+"""
+
+import os
+import re
+from typing import List, Optional
+
+from schemas import QuestionGrade, TechnicalVerdict
+
+TECHNICAL_EVALUATION = os.getenv("TECHNICAL_EVALUATION", "single")
+if TECHNICAL_EVALUATION not in ("single", "per_question"):
+    raise ValueError(
+        f"TECHNICAL_EVALUATION must be single or per_question, not {TECHNICAL_EVALUATION!r}"
+    )
+TECHNICAL_PASS_SCORE = float(os.getenv("TECHNICAL_PASS_SCORE", "6"))
+PER_QUESTION = TECHNICAL_EVALUATION == "per_question"
+
+QUESTIONS_HEADER = "TECHNICAL INTERVIEW QUESTIONS"
+_QUESTION_ITEM = re.compile(r"^\s*(\d+)[.)]\s+", re.MULTILINE)
+_ANSWER_MARKER = re.compile(
+    r"^\s*\**\s*(?:(?:Q|A|Question|Answer)\s*)?(\d+)\s*\**\s*[.):\-](?!\d)\**\s*",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def split_questions(questions: str) -> List[str]:
+    """The questions of a rendered TechnicalQuestions text, in order."""
+    body = questions.strip()
+    if body.startswith(QUESTIONS_HEADER):
+        body = body[len(QUESTIONS_HEADER):].strip()
+    items = _numbered_blocks(body, _QUESTION_ITEM)
+    if items is None:
+        return [body] if body else []
+    return items
+
+
+def _numbered_blocks(text: str, marker: re.Pattern) -> Optional[List[str]]:
+    """
+    Text split at markers numbered 1, 2, 3... in order, or None if the
+    markers are missing or out of sequence.
+    """
+    matches = list(marker.finditer(text))
+    if not matches or [int(m.group(1)) for m in matches] != list(range(1, len(matches) + 1)):
+        return None
+    ends = [m.start() for m in matches[1:]] + [len(text)]
+    return [text[m.end():end].strip() for m, end in zip(matches, ends)]
+
+
+def split_answer(answer: str, count: int) -> tuple:
+    """
+    The candidate's answer cut into count parts, one per question.
+    Returns (parts, method) — method is "numbered", "paragraphs" or
+    "whole" (each question gets the full answer).
+    """
+    answer = answer.strip()
+    if count > 1:
+        numbered = _numbered_blocks(answer, _ANSWER_MARKER)
+        if numbered is not None and len(numbered) == count and all(numbered):
+            return numbered, "numbered"
+        paragraphs = [p.strip() for p in re.split(r"\n\s*\n", answer) if p.strip()]
+        if len(paragraphs) == count:
+            return paragraphs, "paragraphs"
+    return [answer] * count, "whole"
+
+
+def pair(questions: str, answer: str) -> tuple:
+    """([(question, answer part)], split method) for the technical round."""
+    items = split_questions(questions) or [questions.strip()]
+    parts, method = split_answer(answer, len(items))
+    return list(zip(items, parts)), method
+
+
+def _tagged(number: int, items: List[str]) -> List[str]:
+    return [f"Q{number}: {item}" for item in items]
+
+
+def aggregate(grades: List[QuestionGrade]) -> TechnicalVerdict:
+    """
+    The Round 2 verdict for a list of per-question grades, in question
+    order: the mean score decides PASS / FAIL against TECHNICAL_PASS_SCORE.
+    """
+    scores = [grade.score if grade.score is not None else 0.0 for grade in grades]
+    score = round(sum(scores) / len(scores), 1) if scores else 0.0
+    strengths, weaknesses, notes = [], [], []
+    for number, grade in enumerate(grades, 1):
+        strengths.extend(_tagged(number, grade.strengths))
+        weaknesses.extend(_tagged(number, grade.weaknesses))
+        if grade.score is None:
+            weaknesses.append(f"Q{number}: the answer could not be graded")
+        shown = f"{grade.score:g} / 10" if grade.score is not None else "ungraded"
+        notes.append(f"Q{number} ({shown}): {grade.reasoning.strip()}")
+    return TechnicalVerdict(
+        decision="PASS" if score >= TECHNICAL_PASS_SCORE else "FAIL",
+        score=score,
+        strengths=strengths,
+        weaknesses=weaknesses,
+        reasoning=(
+            f"Graded per question; mean score {score:g} / 10 "
+            f"against a pass mark of {TECHNICAL_PASS_SCORE:g}.\n" + "\n".join(notes)
+        ),
+    )
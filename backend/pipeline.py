@@ -0,0 +1,651 @@
+"""
+Interview Pipeline — round transitions shared by HTTP endpoints and jobs.
+
+Each function advances one interview by one step: it reads SESSION
+CONTEXT, runs the relevant crews via crew_runner.py, updates SESSION
+CONTEXT and returns the response payload. routes.py calls these inline
+(or as an SSE stream); jobs.py calls them from background workers.
+
+Streaming: pass on_token(stage, chunk) to receive LLM tokens as they are
+produced, tagged "verdict" or "question". Chunks are raw model output
+(the task's JSON, see schemas.py), never rendered text; the rendered
+verdict and question are in the returned payload. Steps served without
+an LLM call (pre-screen, question bank, fused or speculative questions)
+stream nothing. The final text is still written to DECISION MEMORY and
+SESSION CONTEXT exactly as in the blocking path.
+
+Speculative pre-generation (opt-in, SPECULATIVE_PREGEN=1): the next
+round's question is generated in parallel with the current evaluation,
+assuming PASS. On FAIL the speculative result is cancelled/discarded.
+The speculative question is generated without the pending verdict, so
+it goes into the question bank only once it is actually used.
+
+Concurrency: SESSION CONTEXT saves are versioned (state.py), and a round
+being evaluated is claimed in SESSION CONTEXT first, so with several API
+workers on a shared session backend a duplicate or concurrent submission
+for the same round gets 409 instead of advancing the interview twice.
+The claim expires after STEP_CLAIM_SECONDS in case its worker died.
+Session loads and saves run in a worker thread: a shared backend may
+block (SQLite waits on its write lock, Redis retries a WATCH), and that
+must not stall the event loop serving every other interview.
+
+Fused transitions (opt-in, FUSED_TRANSITIONS=1): the verdict call also
+writes the next round's question — screening already recommends Round 2
+questions, and the technical evaluation is asked for the Round 3 scenario
+— so a PASS costs one LLM round-trip instead of two. If that output has no
+usable question (or the pre-screen decided Round 1), the question is
+generated separately as usual. Fused mode replaces speculation, except
+for the Round 2 → 3 transition under TECHNICAL_EVALUATION=per_question,
+whose grading calls write no scenario.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Optional
+
+from fastapi import HTTPException
+
+import instrumentation
+from jobs import current_job
+from state import create_state, get_state, save_state
+from session_store import VersionConflict
+from crew_runner import (
+    run_screening,
+    run_technical_questions,
+    run_technical_evaluation,
+    run_scenario_question,
+    run_scenario_evaluation,
+    run_hiring_committee,
+)
+from context_compaction import CONTEXT_COMPACTION, compact_resume
+from per_question import PER_QUESTION
+from rate_limiter import RETRY_MAX_DELAY, is_rate_limit_error, limited_model, limiter_for
+from agents import LLM_MODEL
+
+logger = logging.getLogger(__name__)
+
+SPECULATIVE_PREGEN = os.getenv("SPECULATIVE_PREGEN", "0") == "1"
+FUSED_TRANSITIONS = os.getenv("FUSED_TRANSITIONS", "0") == "1"
+STEP_CLAIM_SECONDS = int(os.getenv("STEP_CLAIM_SECONDS", "600"))
+BATCH_SCREEN_CONCURRENCY = int(os.getenv("BATCH_SCREEN_CONCURRENCY", "4"))
+BATCH_RATE_LIMIT_REQUEUES = 3  # extra attempts per resume after a batch-wide pause
+
+
+# (stage, chunk) — stage is "verdict" or "question"
+StageTokenCallback = Callable[[str, str], None]
+
+
+def _stage(on_token: Optional[StageTokenCallback], stage: str):
+    """Bind a stage name onto a token callback for crew_runner."""
+    if on_token is None:
+        return None
+    return lambda chunk: on_token(stage, chunk)
+
+
+def _speculate(coro) -> Optional[asyncio.Task]:
+    """Start next-question generation early when speculative mode is on."""
+    if not SPECULATIVE_PREGEN:
+        coro.close()
+        return None
+    return asyncio.create_task(coro)
+
+
+def _discard(task: Optional[asyncio.Task]) -> None:
+    """Cancel a speculative generation whose round was failed."""
+    if task is None:
+        return
+    task.cancel()
+    # Retrieve the outcome so a failed speculation is never logged as unhandled
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+async def _fused_or(
+    transition: str, question: Optional[str], key: str, fallback,
+    fused: bool = FUSED_TRANSITIONS,
+) -> dict:
+    """
+    Use the question the verdict call already wrote (fused mode), else
+    fall back to generating it with its own call.
+    """
+    if not fused:
+        return await fallback()
+    instrumentation.record_fused_transition(transition, question is not None)
+    if question is None:
+        logger.info(f"{transition}: no usable fused question; generating it separately")
+        return await fallback()
+    return {key: question, "from_bank": False, "fused": True}
+
+
+async def _take(task: Optional[asyncio.Task], fallback) -> dict:
+    """
+    Use the speculative result if it succeeded, else generate serially.
+    A speculative question is only banked (question_bank.py) once taken here.
+    """
+    if task is not None:
+        try:
+            result = await task
+        except Exception as e:
+            logger.warning(f"Speculative question generation failed: {e}")
+        else:
+            confirm = result.pop("confirm", None)
+            if confirm is not None:
+                await confirm()
+            return result
+    return await fallback()
+
+
+async def load_state(interview_id: str) -> dict:
+    """Fetch an interview's SESSION CONTEXT or raise 404."""
+    state = await asyncio.to_thread(get_state, interview_id)
+    if state is None:
+        raise HTTPException(
+            status_code=404, detail="Interview not found or expired."
+        )
+    return state
+
+
+def agent_resume(state: dict) -> str:
+    """Resume context for rounds after screening (the compacted profile if enabled)."""
+    if CONTEXT_COMPACTION and state.get("resume_profile"):
+        return state["resume_profile"]
+    return state["resume"]
+
+
+async def commit_state(interview_id: str, state: dict) -> None:
+    """Save SESSION CONTEXT, or raise 409 if another request saved it since it was loaded."""
+    try:
+        await asyncio.to_thread(save_state, interview_id, state)
+    except VersionConflict:
+        raise HTTPException(
+            status_code=409,
+            detail="Interview was updated by another request. Reload it and retry.",
+        )
+
+
+def _owns(claim: dict) -> bool:
+    """
+    Whether the current background job holds this claim — it was reclaimed
+    from a worker that died mid-step, and may re-run the step.
+    """
+    job_id = current_job.get()
+    return job_id is not None and claim.get("job_id") == job_id
+
+
+def check_unclaimed(state: dict) -> None:
+    """Raise 409 while another request is still running a step of this interview."""
+    claim = state.get("claim")
+    if claim and claim["expires_at"] > time.time() and not _owns(claim):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Step {claim['step']} of this interview is already in progress.",
+        )
+
+
+@asynccontextmanager
+async def _claim(interview_id: str, state: dict, step: str):
+    """
+    Claim a step in SESSION CONTEXT (saved together with any pending change,
+    e.g. the stored answer) for as long as it runs. The step's concluding
+    save (_finish) releases the claim; if the step fails it is released here.
+    A claim taken by a background job carries its job ID, so the same job
+    can take it over when the queue reclaims it after a crash, instead of
+    failing on its own claim until STEP_CLAIM_SECONDS runs out.
+    """
+    claim = state.get("claim")
+    if claim and claim["step"] == step and _owns(claim):
+        logger.info(f"Job {claim['job_id']} re-entering its {step} claim on {interview_id}")
+    state["claim"] = {
+        "step": step,
+        "expires_at": time.time() + STEP_CLAIM_SECONDS,
+        "job_id": current_job.get(),
+    }
+    await commit_state(interview_id, state)
+    try:
+        yield
+    except BaseException:
+        if state.get("claim"):
+            state["claim"] = None
+            try:
+                await commit_state(interview_id, state)
+            except Exception as e:
+                logger.warning(f"Could not release the {step} claim on {interview_id}: {e}")
+        raise
+
+
+def _record_timing(state: dict, step: str, timing) -> None:
+    """Keep a step's time / token breakdown in SESSION CONTEXT (reported by /status)."""
+    state.setdefault("timings", {})[step] = timing.summary()
+
+
+async def _finish(interview_id: str, state: dict, step: str, timing) -> None:
+    """Conclude a step: record its timing, release its claim and save SESSION CONTEXT."""
+    _record_timing(state, step, timing)
+    state["claim"] = None
+    await commit_state(interview_id, state)
+
+
+def _store_answer(state: dict, step: str, answer: str) -> None:
+    """
+    Record an answer in SESSION CONTEXT — once: a retried step (a reclaimed
+    job, a resubmission after a failure) does not append it again.
+    """
+    answers = state["answers"][step]
+    if not answers or answers[-1] != answer:
+        answers.append(answer)
+
+
+def check_can_answer(state: dict, answer: str, round_number: int) -> None:
+    """Guard shared by both round-answer steps."""
+    if state["status"] != "ONGOING":
+        raise HTTPException(status_code=400, detail=f"Interview is {state['status']}.")
+    check_unclaimed(state)
+    # A late duplicate (another worker already advanced the round) must not re-run it
+    if state["round"] != round_number:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Interview is at round {state['round']}, not round {round_number}.",
+        )
+    if not answer.strip():
+        raise HTTPException(status_code=400, detail="Answer cannot be empty.")
+
+
+# ── Round 1: Screening → Technical questions ────────────────────────
+
+
+async def run_round1(
+    interview_id: str, on_token: Optional[StageTokenCallback] = None
+) -> dict:
+    """
+    Screen the stored resume and, on PASS/BORDERLINE, generate Round 2 questions.
+    Writes verdicts/<interview_id>/round1
+    """
+    with instrumentation.round_timing() as timing:
+        state = await load_state(interview_id)
+
+        speculative = None if FUSED_TRANSITIONS else _speculate(
+            run_technical_questions(
+                interview_id, agent_resume(state), speculative=True, role=state["role"]
+            )
+        )
+
+        # Run Round 1 — Screening Agent (context: resume + role)
+        try:
+            result = await run_screening(
+                interview_id, state["resume"], state["role"], _stage(on_token, "verdict")
+            )
+        except BaseException:
+            _discard(speculative)
+            raise
+
+        # Update SESSION CONTEXT
+        state["verdicts"]["round1"] = f"verdicts/{interview_id}/round1"
+
+        decision = result["decision"]
+
+        if decision == "FAIL":
+            _discard(speculative)
+            state["status"] = "REJECTED"
+            await _finish(interview_id, state, "round1", timing)
+            return {
+                "interview_id": interview_id,
+                "round": 1,
+                "decision": "FAIL",
+                "score": result["score"],
+                "verdict": result["verdict"],
+                "prescreen": result["prescreen"],
+                "status": "REJECTED",
+                "message": "The candidate did not pass the screening round.",
+            }
+
+        # PASS or BORDERLINE — generate technical questions for Round 2
+        tech_result = await _fused_or(
+            "round1",
+            result["next_questions"],
+            "questions",
+            lambda: _take(
+                speculative,
+                lambda: run_technical_questions(
+                    interview_id, agent_resume(state), _stage(on_token, "question"),
+                    role=state["role"],
+                ),
+            ),
+        )
+        state["questions"]["round2"] = tech_result["questions"]
+        state["round"] = 2
+        await _finish(interview_id, state, "round1", timing)
+
+        return {
+            "interview_id": interview_id,
+            "round": 1,
+            "decision": decision,
+            "score": result["score"],
+            "verdict": result["verdict"],
+            "prescreen": result["prescreen"],
+            "status": "ONGOING",
+            "next_round": 2,
+            "question": tech_result["questions"],
+            "question_from_bank": tech_result["from_bank"],
+            "question_fused": tech_result.get("fused", False),
+        }
+
+
+# ── Round 2: Technical evaluation → Scenario question ───────────────
+
+
+async def run_round2(
+    interview_id: str, answer: str, on_token: Optional[StageTokenCallback] = None
+) -> dict:
+    """
+    Evaluate the technical answer and, on PASS, generate the Round 3 scenario.
+    Writes verdicts/<interview_id>/round2
+    """
+    with instrumentation.round_timing() as timing:
+        state = await load_state(interview_id)
+        check_can_answer(state, answer, 2)
+
+        # Store answer in SESSION CONTEXT and claim the round
+        _store_answer(state, "round2", answer.strip())
+        async with _claim(interview_id, state, "round2"):
+            # Run Technical evaluation (context: resume + round1 + answers)
+            questions = state["questions"]["round2"] or ""
+            # Per-question grading writes no scenario, so it is never fused
+            fused = FUSED_TRANSITIONS and not PER_QUESTION
+            speculative = None if fused else _speculate(
+                run_scenario_question(
+                    interview_id, agent_resume(state), speculative=True, role=state["role"]
+                )
+            )
+            try:
+                result = await run_technical_evaluation(
+                    interview_id,
+                    agent_resume(state),
+                    questions,
+                    answer.strip(),
+                    _stage(on_token, "verdict"),
+                    with_scenario_question=fused,
+                )
+            except BaseException:
+                _discard(speculative)
+                raise
+
+            # Update SESSION CONTEXT
+            state["verdicts"]["round2"] = f"verdicts/{interview_id}/round2"
+
+            decision = result["decision"]
+
+            if decision == "FAIL":
+                _discard(speculative)
+                state["status"] = "REJECTED"
+                await _finish(interview_id, state, "round2", timing)
+                return {
+                    "interview_id": interview_id,
+                    "round": 2,
+                    "decision": "FAIL",
+                    "score": result["score"],
+                    "verdict": result["verdict"],
+                    "status": "REJECTED",
+                    "message": "The candidate did not pass the technical round.",
+                }
+
+            # PASS — generate scenario question for Round 3
+            scenario_result = await _fused_or(
+                "round2",
+                result["next_question"],
+                "question",
+                lambda: _take(
+                    speculative,
+                    lambda: run_scenario_question(
+                        interview_id, agent_resume(state), _stage(on_token, "question"),
+                        role=state["role"],
+                    ),
+                ),
+                fused=fused,
+            )
+            state["questions"]["round3"] = scenario_result["question"]
+            state["round"] = 3
+            await _finish(interview_id, state, "round2", timing)
+
+            return {
+                "interview_id": interview_id,
+                "round": 2,
+                "decision": decision,
+                "score": result["score"],
+                "verdict": result["verdict"],
+                "status": "ONGOING",
+                "next_round": 3,
+                "question": scenario_result["question"],
+                "question_from_bank": scenario_result["from_bank"],
+                "question_fused": scenario_result.get("fused", False),
+            }
+
+
+# ── Round 3: Scenario evaluation ────────────────────────────────────
+
+
+async def run_round3(
+    interview_id: str, answer: str, on_token: Optional[StageTokenCallback] = None
+) -> dict:
+    """
+    Evaluate the scenario answer and mark the interview complete on PASS/BORDERLINE.
+    Writes verdicts/<interview_id>/round3
+    """
+    with instrumentation.round_timing() as timing:
+        state = await load_state(interview_id)
+        check_can_answer(state, answer, 3)
+
+        # Store answer in SESSION CONTEXT and claim the round
+        _store_answer(state, "round3", answer.strip())
+        async with _claim(interview_id, state, "round3"):
+            # Run Scenario evaluation
+            question = state["questions"]["round3"] or ""
+            result = await run_scenario_evaluation(
+                interview_id,
+                agent_resume(state),
+                question,
+                answer.strip(),
+                _stage(on_token, "verdict"),
+            )
+
+            # Update SESSION CONTEXT
+            state["verdicts"]["round3"] = f"verdicts/{interview_id}/round3"
+
+            decision = result["decision"]
+
+            if decision == "FAIL":
+                state["status"] = "REJECTED"
+                await _finish(interview_id, state, "round3", timing)
+                return {
+                    "interview_id": interview_id,
+                    "round": 3,
+                    "decision": "FAIL",
+                    "score": result["score"],
+                    "verdict": result["verdict"],
+                    "status": "REJECTED",
+                    "message": "The candidate did not pass the scenario round.",
+                }
+
+            # PASS or BORDERLINE — mark complete
+            state["status"] = "COMPLETE"
+            state["round"] = 4
+            await _finish(interview_id, state, "round3", timing)
+
+            return {
+                "interview_id": interview_id,
+                "round": 3,
+                "decision": decision,
+                "score": result["score"],
+                "verdict": result["verdict"],
+                "status": "COMPLETE",
+                "next": "/final-decision",
+            }
+
+
+# ── Final: Hiring Committee ─────────────────────────────────────────
+
+
+async def run_final(
+    interview_id: str, on_token: Optional[StageTokenCallback] = None
+) -> dict:
+    """
+    Run the Hiring Committee (context: ONLY verdicts — no resume)
+    and cache the decision in SESSION CONTEXT.
+    """
+    with instrumentation.round_timing() as timing:
+        state = await load_state(interview_id)
+
+        if state["status"] == "REJECTED":
+            return {
+                "decision": "REJECT",
+                "rationale": "Candidate was rejected in an earlier round.",
+                "status": "REJECTED",
+            }
+
+        if state["status"] != "COMPLETE":
+            raise HTTPException(
+                status_code=400,
+                detail="Interview is not complete. All rounds must be finished first.",
+            )
+
+        # Check for cached decision
+        if state["final_decision"]:
+            return state["final_decision"]
+
+        check_unclaimed(state)
+        async with _claim(interview_id, state, "final"):
+            result = await run_hiring_committee(interview_id, _stage(on_token, "verdict"))
+
+            # Cache the result
+            final = {
+                "decision": result["decision"],
+                "rationale": result["rationale"],
+                "record": result["record"],
+                "status": "COMPLETE",
+            }
+            if "committee" in result:
+                final["committee"] = result["committee"]
+            state["final_decision"] = final
+            await _finish(interview_id, state, "final", timing)
+
+            return final
+
+
+# ── Batch: bulk Round 1 screening ───────────────────────────────────
+
+
+async def run_screening_batch(
+    resumes: list, role: str, rejected: Optional[dict] = None
+) -> AsyncIterator[tuple]:
+    """
+    Screen many resumes for one role with bounded concurrency.
+    Each resume gets its own interview session, so its verdict is persisted
+    to verdicts/<interview_id>/round1 like any single screening.
+    rejected maps the index of each resume that cannot be screened (an
+    empty one, an upload that failed to parse) to why; those are not run.
+
+    Yields an ("error", payload) per rejected resume, then ("result" |
+    "error", payload) as each candidate finishes, then ("done", summary)
+    with every candidate ranked by parsed score.
+
+    Rate-limit aware: every call already queues on the shared RPM/TPM
+    limiter; when one still hits a 429 after its own retries, the limiter
+    is blocked for RETRY_MAX_DELAY (pausing the whole batch) and that
+    resume is requeued instead of failed.
+    """
+    started = time.monotonic()
+    semaphore = asyncio.Semaphore(BATCH_SCREEN_CONCURRENCY)
+    finished: list = []
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def screen(index: int, resume: str) -> None:
+        try:
+            await _screen(index, resume)
+        except Exception as e:
+            await events.put(("error", {"index": index, "detail": str(e)}))
+
+    async def _screen(index: int, resume: str) -> None:
+        interview_id = await asyncio.to_thread(
+            lambda: create_state(resume=resume, role=role, resume_profile=compact_resume(resume))
+        )
+        for attempt in range(BATCH_RATE_LIMIT_REQUEUES + 1):
+            async with semaphore:
+                try:
+                    result = await run_screening(interview_id, resume, role)
+                    break
+                except Exception as e:
+                    if is_rate_limit_error(e) and attempt < BATCH_RATE_LIMIT_REQUEUES:
+                        model = limited_model(e, LLM_MODEL)
+                        await asyncio.to_thread(limiter_for(model).block_for, RETRY_MAX_DELAY)
+                        logger.warning(
+                            f"Batch screening rate limited on {model}; "
+                            f"pausing its calls for {RETRY_MAX_DELAY}s"
+                        )
+                        continue
+                    await events.put(
+                        ("error", {"index": index, "interview_id": interview_id, "detail": str(e)})
+                    )
+                    return
+
+        state = await load_state(interview_id)
+        state["verdicts"]["round1"] = f"verdicts/{interview_id}/round1"
+        if result["decision"] == "FAIL":
+            state["status"] = "REJECTED"
+        await commit_state(interview_id, state)
+
+        entry = {
+            "index": index,
+            "interview_id": interview_id,
+            "decision": result["decision"],
+            "score": result["score"],
+            "verdict": result["verdict"],
+            "prescreen": result["prescreen"],
+        }
+        finished.append(entry)
+        await events.put(("result", entry))
+
+    rejected = rejected or {}
+    for index in sorted(rejected):
+        yield "error", {"index": index, "detail": rejected[index]}
+
+    tasks = [
+        asyncio.create_task(screen(i, resume))
+        for i, resume in enumerate(resumes)
+        if i not in rejected
+    ]
+    try:
+        for _ in tasks:
+            event, payload = await events.get()
+            if event == "result":
+                payload = {**payload, "rank": _rank_of(finished, payload)}
+            yield event, payload
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    ranking = sorted(finished, key=_score_sort_key)
+    elapsed = time.monotonic() - started
+    yield "done", {
+        "role": role,
+        "total": len(resumes),
+        "screened": len(finished),
+        "failed": len(resumes) - len(finished),
+        "elapsed_seconds": round(elapsed, 2),
+        "resumes_per_minute": round(len(finished) / elapsed * 60, 2) if elapsed else None,
+        "ranking": [
+            {k: e[k] for k in ("index", "interview_id", "decision", "score")}
+            for e in ranking
+        ],
+    }
+
+
+def _score_sort_key(entry: dict) -> tuple:
+    """Highest score first; unscored verdicts last."""
+    score = entry["score"]
+    return (score is None, -(score or 0.0))
+
+
+def _rank_of(finished: list, entry: dict) -> int:
+    """1-based rank of entry among the candidates screened so far."""
+    return sorted(finished, key=_score_sort_key).index(entry) + 1
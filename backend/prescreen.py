@@ -0,0 +1,313 @@
+"""
+Pre-screen — local, CPU-only resume/role matching before the LLM call.
+
+Resumes and role descriptions become hashed TF-IDF vectors in NumPy: word
+unigrams + bigrams, feature-hashed into a fixed number of dimensions, so
+there is no vocabulary to fit and the index can grow one resume at a time.
+Every resume the Screening Agent decides is added to a vector index with
+its decision and score.
+
+A new resume gets a match score in [0, 1] from two signals:
+  - similarity to the role description
+  - a similarity-weighted pass rate of its nearest past resumes for the role
+    (once there are enough neighbours to trust)
+
+PRESCREEN modes:
+  off     — no pre-screen
+  shadow  — score every resume and report it, but always call the LLM (default)
+  route   — below PRESCREEN_REJECT_BELOW the resume is failed without an
+            LLM call; above PRESCREEN_FAST_TRACK_ABOVE it is passed straight
+            to Round 2. Everything in between still goes to the LLM.
+Routed decisions are never added to the index, so it only learns from
+the Screening Agent.
+
+The index is a ring buffer of at most PRESCREEN_INDEX_MAX_ENTRIES rows
+(grown by doubling until then), so adding a resume writes one row instead
+of copying the matrix. Every SAVE_EVERY additions it is saved: under a
+file lock, the saved index is re-read and this process's new rows are
+appended to it, so API workers sharing the file add to it rather than
+overwrite each other's entries.
+"""
+
+import os
+import re
+import zlib
+import fcntl
+import logging
+import threading
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PRESCREEN_MODE = os.getenv("PRESCREEN", "shadow")  # off | shadow | route
+PRESCREEN_REJECT_BELOW = float(os.getenv("PRESCREEN_REJECT_BELOW", "0.15"))
+PRESCREEN_FAST_TRACK_ABOVE = float(os.getenv("PRESCREEN_FAST_TRACK_ABOVE", "0.9"))
+PRESCREEN_INDEX_PATH = os.getenv(
+    "PRESCREEN_INDEX_PATH", os.path.join(os.path.dirname(__file__), "data", "prescreen_index.npz")
+)
+PRESCREEN_INDEX_MAX_ENTRIES = int(os.getenv("PRESCREEN_INDEX_MAX_ENTRIES", "5000"))
+
+VECTOR_DIMS = 2048
+NEIGHBOURS = 7
+MIN_NEIGHBOURS = 3  # below this the role description alone decides
+MIN_NEIGHBOUR_SIMILARITY = 0.2
+ROLE_SIMILARITY_FULL = 0.3  # role similarity that counts as a perfect match
+SAVE_EVERY = 25  # index additions between saves to disk
+INITIAL_CAPACITY = 256  # index rows allocated up front (doubled as it fills)
+
+# Keyword-rich descriptions of AVAILABLE_ROLES (state.py)
+ROLE_DESCRIPTIONS = {
+    "SDE 1": (
+        "software development engineer entry level programming coding debugging "
+        "data structures algorithms object oriented design java python c++ javascript "
+        "typescript git unit testing rest apis sql databases web applications "
+        "computer science internships projects problem solving leetcode"
+    ),
+    "AI Engineer": (
+        "ai engineer machine learning deep learning neural networks llm large language "
+        "models nlp computer vision pytorch tensorflow scikit-learn hugging face "
+        "transformers prompt engineering fine-tuning rag embeddings vector databases "
+        "mlops model deployment inference python numpy pandas data science generative ai"
+    ),
+    "Backend Developer": (
+        "backend developer server side apis rest graphql microservices databases "
+        "postgresql mysql mongodb redis caching message queues kafka rabbitmq "
+        "node.js python django flask fastapi java spring go docker kubernetes aws "
+        "cloud system design scalability authentication distributed systems"
+    ),
+}
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+
+
+def _tokens(text: str) -> list:
+    words = _TOKEN.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def term_vector(text: str) -> np.ndarray:
+    """Sublinear term frequencies, feature-hashed (stable across processes)."""
+    indices = [zlib.crc32(token.encode()) % VECTOR_DIMS for token in _tokens(text)]
+    counts = np.bincount(np.asarray(indices, dtype=np.int64), minlength=VECTOR_DIMS)
+    return np.log1p(counts).astype(np.float32)
+
+
+class PreScreener:
+    """Role matcher + nearest-neighbour index of past screening decisions."""
+
+    def __init__(self, path: str = PRESCREEN_INDEX_PATH, max_entries: int = PRESCREEN_INDEX_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._set_index(*self._empty_columns())
+        self._pending: list = []  # rows added since the last save
+        self._role_vectors = {role: term_vector(text) for role, text in ROLE_DESCRIPTIONS.items()}
+        self.counters = {"assessed": 0, "fast_tracked": 0, "auto_rejected": 0, "indexed": 0}
+        self._load()
+
+    # ── Ring buffer ─────────────────────────────────────────────────
+
+    @staticmethod
+    def _empty_columns(rows: int = 0) -> tuple:
+        """(vectors, roles, passed, scores) arrays with room for rows entries."""
+        return (
+            np.zeros((rows, VECTOR_DIMS), dtype=np.float32),
+            np.zeros(rows, dtype="U64"),
+            np.zeros(rows, dtype=bool),
+            np.full(rows, np.nan, dtype=np.float32),
+        )
+
+    def _set_index(self, vectors, roles, passed, scores) -> None:
+        """Replace the index with these rows (oldest first; the newest max_entries kept)."""
+        count = min(len(vectors), self.max_entries)
+        capacity = min(self.max_entries, max(count, INITIAL_CAPACITY))
+        self._vectors, self._roles, self._passed, self._scores = self._empty_columns(capacity)
+        for column, values in zip(self._columns(), (vectors, roles, passed, scores)):
+            column[:count] = values[len(values) - count:]
+        self._count = count
+        self._next = count % self.max_entries  # ring position of the next row
+
+    def _columns(self) -> tuple:
+        return self._vectors, self._roles, self._passed, self._scores
+
+    def _ordered(self) -> tuple:
+        """Copies of the index columns, oldest row first."""
+        order = np.r_[self._next:self._count, 0:self._next]
+        return tuple(column[order] for column in self._columns())
+
+    def _append(self, vector, role: str, passed: bool, score: float) -> None:
+        """Write one row, overwriting the oldest once the index is full."""
+        if self._count < self.max_entries:
+            if self._count == len(self._vectors):
+                grown = self._empty_columns(min(self.max_entries, 2 * self._count))
+                for old, new in zip(self._columns(), grown):
+                    new[:self._count] = old[:self._count]
+                self._vectors, self._roles, self._passed, self._scores = grown
+            row = self._count
+            self._count += 1
+        else:
+            row = self._next
+        self._next = (row + 1) % self.max_entries
+        for column, value in zip(self._columns(), (vector, role, passed, score)):
+            column[row] = value
+
+    # ── Persistence ─────────────────────────────────────────────────
+
+    def _read_file(self) -> Optional[tuple]:
+        """The saved index columns, or None if missing or unusable."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with np.load(self.path) as data:
+                if data["vectors"].shape[1] != VECTOR_DIMS:
+                    return None
+                return data["vectors"], data["roles"], data["passed"], data["scores"]
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Pre-screen index not loaded ({e})")
+            return None
+
+    def _load(self) -> None:
+        saved = self._read_file()
+        if saved is not None:
+            self._set_index(*saved)
+
+    def save(self) -> None:
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self) -> None:
+        """
+        Merge this process's new rows into the saved index and write it back
+        atomically (unique temp file, then rename), holding a file lock so
+        workers sharing the file never drop each other's rows.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f"{self.path}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            saved = self._read_file()
+            if saved is None:
+                merged = self._ordered()
+            elif self._pending:
+                merged = tuple(
+                    np.concatenate([column, np.asarray(values, dtype=column.dtype)])
+                    for column, values in zip(saved, zip(*self._pending))
+                )
+            else:
+                merged = saved
+            self._set_index(*merged)
+            vectors, roles, passed, scores = self._ordered()
+            tmp = f"{self.path}.{os.getpid()}.tmp.npz"
+            np.savez(tmp, vectors=vectors, roles=roles, passed=passed, scores=scores)
+            os.replace(tmp, self.path)
+        self._pending = []
+
+    # ── Scoring ─────────────────────────────────────────────────────
+
+    def _idf(self) -> np.ndarray:
+        docs = self._count + len(self._role_vectors)
+        df = np.count_nonzero(self._vectors[:self._count], axis=0) + sum(
+            (v > 0).astype(np.int64) for v in self._role_vectors.values()
+        )
+        return (np.log((1 + docs) / (1 + df)) + 1).astype(np.float32)
+
+    @staticmethod
+    def _normalise(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-9)
+
+    def assess(self, resume: str, role: str) -> dict:
+        """Match score for one resume against one role, and the routing it implies."""
+        tf = term_vector(resume)
+        with self._lock:
+            idf = self._idf()
+            query = self._normalise(tf * idf)
+            role_vector = self._role_vectors.get(role)
+            role_similarity = (
+                float(query @ self._normalise(role_vector * idf)) if role_vector is not None else 0.0
+            )
+
+            neighbours = []
+            mask = self._roles[:self._count] == role
+            if mask.any():
+                rows = np.flatnonzero(mask)
+                similarities = self._normalise(self._vectors[rows] * idf) @ query
+                top = np.argsort(similarities)[::-1][:NEIGHBOURS]
+                top = top[similarities[top] >= MIN_NEIGHBOUR_SIMILARITY]
+                neighbours = [
+                    (float(similarities[i]), bool(self._passed[rows[i]]), float(self._scores[rows[i]]))
+                    for i in top
+                ]
+            self.counters["assessed"] += 1
+
+        role_match = min(1.0, role_similarity / ROLE_SIMILARITY_FULL)
+        result = {
+            "role_similarity": round(role_similarity, 4),
+            "neighbours": len(neighbours),
+            "neighbour_pass_rate": None,
+            "neighbour_score": None,
+        }
+        if len(neighbours) >= MIN_NEIGHBOURS:
+            weights = np.array([n[0] for n in neighbours])
+            pass_rate = float(np.average([n[1] for n in neighbours], weights=weights))
+            scores = [(n[0], n[2]) for n in neighbours if not np.isnan(n[2])]
+            if scores:
+                result["neighbour_score"] = round(
+                    float(np.average([s for _, s in scores], weights=[w for w, _ in scores])), 2
+                )
+            result["neighbour_pass_rate"] = round(pass_rate, 3)
+            match = 0.5 * role_match + 0.5 * pass_rate
+        else:
+            match = role_match
+        result["match_score"] = round(match, 3)
+        result["route"] = self._route(match)
+        return result
+
+    def _route(self, match: float) -> str:
+        """"fast_track", "reject" or "llm"."""
+        if PRESCREEN_MODE != "route":
+            return "llm"
+        if match >= PRESCREEN_FAST_TRACK_ABOVE:
+            self.counters["fast_tracked"] += 1
+            return "fast_track"
+        if match < PRESCREEN_REJECT_BELOW:
+            self.counters["auto_rejected"] += 1
+            return "reject"
+        return "llm"
+
+    # ── Index ───────────────────────────────────────────────────────
+
+    def add(self, resume: str, role: str, decision: str, score: Optional[float]) -> None:
+        """Remember a Screening Agent decision for future neighbour lookups."""
+        row = (
+            term_vector(resume),
+            role,
+            decision != "FAIL",
+            np.float32(score if score is not None else np.nan),
+        )
+        with self._lock:
+            self._append(*row)
+            self._pending = (self._pending + [row])[-self.max_entries:]
+            self.counters["indexed"] += 1
+            if len(self._pending) >= SAVE_EVERY:
+                try:
+                    self._save_locked()
+                except OSError as e:
+                    logger.warning(f"Pre-screen index save failed: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            roles, counts = np.unique(self._roles[:self._count], return_counts=True)
+            return {
+                "mode": PRESCREEN_MODE,
+                "reject_below": PRESCREEN_REJECT_BELOW,
+                "fast_track_above": PRESCREEN_FAST_TRACK_ABOVE,
+                "index_entries": self._count,
+                "index_by_role": {str(r): int(c) for r, c in zip(roles, counts)},
+                **self.counters,
+            }
+
+
+# Process-wide pre-screener used by crew_runner
+prescreener = PreScreener()
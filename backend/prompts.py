@@ -0,0 +1,218 @@
+"""
+Prompt Layout — cache-friendly task prompts and cached-context handles.
+
+Providers reuse the work done on a prompt prefix they have seen recently:
+Gemini 2.5 and OpenAI models do it implicitly, and Gemini / Anthropic can
+also hold an explicitly marked span as a cached context. Only a
+byte-identical leading span is ever reused, so every task prompt is laid
+out from most to least stable:
+
+  1. static — the agent's persona (CrewAI's system prompt, agents.py),
+              then one rubric covering every task that agent runs, with
+              all of their output formats. The same for every candidate.
+  2. stable — per-candidate context that does not change between the
+              agent's calls: target role, resume, earlier verdicts.
+  3. delta  — this call only: which task to do and its inputs (the
+              questions asked, the candidate's answer).
+
+The technical and scenario agents each make two calls per candidate
+(question, then evaluation); both share everything up to the delta, and
+every candidate shares the static part. CrewAI puts the agent's persona
+first, so prefixes are never shared across agents: Round 3 (scenario
+agent) pays for the resume again rather than reusing Round 2's
+(technical agent) cached copy. Putting the candidate context ahead of the
+persona would share it across rounds, but only by giving up the static
+prefix every candidate shares.
+
+PROMPT_CACHE picks how the layout is used:
+  - implicit (default) — layout only; the provider caches on its own
+  - explicit — static + stable are also marked with LiteLLM's
+               cache_control (a Gemini cachedContent / an Anthropic cache
+               breakpoint) when at least PROMPT_CACHE_MIN_TOKENS long
+  - off      — layout only, and never marked
+Cached vs uncached prompt tokens are reported per crew run (crew_runner.py,
+instrumentation.py) and per model tier (model_router.py).
+"""
+
+import os
+import logging
+import functools
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+PROMPT_CACHE = os.getenv("PROMPT_CACHE", "implicit")
+if PROMPT_CACHE not in ("implicit", "explicit", "off"):
+    raise ValueError(f"PROMPT_CACHE must be implicit, explicit or off, not {PROMPT_CACHE!r}")
+PROMPT_CACHE_MIN_TOKENS = int(os.getenv("PROMPT_CACHE_MIN_TOKENS", "1024"))
+
+STABLE_HEADER = "## CANDIDATE CONTEXT"
+DELTA_HEADER = "## THIS REQUEST"
+
+# Providers whose LiteLLM integration turns cache_control into a cached
+# context; the fake provider simulates one (fake_llm.py)
+EXPLICIT_CACHE_PROVIDERS = ("gemini/", "vertex_ai/", "anthropic/", "fake/")
+CACHE_CONTROL = {"type": "ephemeral"}
+CHARS_PER_TOKEN = 4  # rough estimate, enough to skip prefixes too short to cache
+
+
+# ── Static blocks: one rubric per agent ─────────────────────────────
+
+SCREENING_RUBRIC = """## HOW TO SCREEN
+1. Evaluate the resume specifically for the target role — assess role fit, relevant skills, and experience.
+2. Identify strengths and weaknesses relative to the role.
+3. Decide: PASS, BORDERLINE, or FAIL.
+4. Assign a score from 0 to 10.
+5. Generate 2-3 technical questions you would recommend for the next round, tailored to the role.
+
+## OUTPUT FORMATS
+- SCREENING VERDICT: a JSON object with: decision (PASS|BORDERLINE|FAIL), score (0-10), strengths and weaknesses for the role (lists of short strings), reasoning (detailed explanation of fit for the role), and recommended_questions (2-3 questions)."""
+
+TECHNICAL_RUBRIC = """## HOW TO RUN THE TECHNICAL ROUND
+You will be asked for one of these.
+
+Writing questions: based on the resume and the screening verdict, generate exactly 2-3 targeted technical questions. The questions should probe the candidate's claimed skills and address any weaknesses noted in the screening.
+
+Evaluating answers:
+1. Evaluate each answer for correctness, depth, and clarity.
+2. Identify strengths and weaknesses.
+3. Decide: PASS or FAIL.
+4. Assign a score from 0 to 10.
+5. Only when the request asks for the next round's scenario too: if the decision is PASS, also write ONE realistic production scenario or behavioral question for the next round that tests decision-making, trade-off analysis, and practical judgment, specific to the candidate's skill set, level and answers.
+
+Grading one answer: when the request gives a single question, grade only the candidate's answer to that question for correctness, depth, and clarity, with a score from 0 to 10. If the answer given also covers other questions, judge only the part that answers this one.
+
+## OUTPUT FORMATS
+- TECHNICAL QUESTIONS: a JSON object with: questions (a list of 2-3 questions).
+- TECHNICAL VERDICT: a JSON object with: decision (PASS|FAIL), score (0-10), strengths and weaknesses (lists of short strings), and reasoning (detailed evaluation of answers).
+- TECHNICAL VERDICT WITH SCENARIO: the TECHNICAL VERDICT fields plus scenario_question (the next-round scenario if PASS, else null).
+- QUESTION GRADE: a JSON object with: score (0-10), strengths and weaknesses of this answer (lists of short strings), and reasoning (evaluation of this answer)."""
+
+SCENARIO_RUBRIC = """## HOW TO RUN THE SCENARIO ROUND
+You will be asked for one of these.
+
+Writing the scenario: based on the candidate's background and previous round performance, create ONE realistic production scenario or behavioral question that tests decision-making, trade-off analysis, and practical judgment. The scenario should be specific to their skill set and level.
+
+Evaluating the response:
+1. Evaluate the response for decision-making quality, trade-off awareness, communication clarity, and practical judgment.
+2. Identify strengths and weaknesses.
+3. Decide: PASS, BORDERLINE, or FAIL.
+4. Assign a score from 0 to 10.
+
+## OUTPUT FORMATS
+- SCENARIO QUESTION: a JSON object with: question (your detailed scenario/question).
+- SCENARIO VERDICT: a JSON object with: decision (PASS|BORDERLINE|FAIL), score (0-10), strengths and weaknesses (lists of short strings), and reasoning (detailed evaluation)."""
+
+HIRING_RUBRIC = """## IMPORTANT
+You must base your decision ONLY on the interview verdicts below. You do NOT have access to the candidate's resume or raw answers.
+
+## HOW TO DECIDE
+1. Synthesize all three round verdicts.
+2. Identify patterns across feedback.
+3. Make a final decision: HIRE, HOLD, or REJECT.
+4. Provide detailed rationale.
+
+## OUTPUT FORMATS
+- HIRING DECISION: a JSON object with: decision (HIRE|HOLD|REJECT), round_summaries (one line per round, e.g. "Round 2 (Technical): PASS — brief note"), overall_assessment (detailed rationale for final decision), and recommendation (final recommendation with any conditions or notes)."""
+
+
+# ── Layout ──────────────────────────────────────────────────────────
+
+def _section(title: str, text: str) -> str:
+    return f"### {title}\n{text.strip()}"
+
+
+def build_prompt(
+    rubric: str,
+    stable: Iterable[tuple],
+    request: str,
+    output_format: str,
+    delta: Iterable[tuple] = (),
+) -> str:
+    """
+    A task description in cache order: rubric, then the (title, text)
+    stable sections, then the request, its output format and the (title,
+    text) delta sections. Nothing that varies per call may go before
+    DELTA_HEADER, or the shared prefix ends there.
+    """
+    parts = [rubric, STABLE_HEADER, *(_section(title, text) for title, text in stable)]
+    parts.append(f"{DELTA_HEADER}\n{request} Reply in the {output_format} format.")
+    parts.extend(_section(title, text) for title, text in delta)
+    return "\n\n".join(parts)
+
+
+# ── Explicit cached contexts ────────────────────────────────────────
+
+def _text(content) -> str:
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content or ""
+
+
+def _marked(text: str) -> list:
+    return [{"type": "text", "text": text, "cache_control": dict(CACHE_CONTROL)}]
+
+
+def mark_cached_context(messages: list) -> list:
+    """
+    Split the task message at DELTA_HEADER and mark everything before it
+    (system prompt + static + stable) with cache_control. Returns the
+    messages unchanged if there is no delta marker or the prefix is below
+    PROMPT_CACHE_MIN_TOKENS (providers reject shorter cached contexts).
+    """
+    for index, message in enumerate(messages):
+        content = message.get("content")
+        if message.get("role") != "user" or not isinstance(content, str) or DELTA_HEADER not in content:
+            continue
+        stable, delta = content.split(DELTA_HEADER, 1)
+        prefix_chars = sum(len(_text(m.get("content"))) for m in messages[:index]) + len(stable)
+        if prefix_chars / CHARS_PER_TOKEN < PROMPT_CACHE_MIN_TOKENS:
+            return messages
+        return [
+            *({**m, "content": _marked(_text(m.get("content")))} for m in messages[:index]),
+            {"role": "user", "content": _marked(stable)},
+            {"role": "user", "content": DELTA_HEADER + delta},
+            *messages[index + 1:],
+        ]
+    return messages
+
+
+def supports_explicit_cache(model: str) -> bool:
+    return model.startswith(EXPLICIT_CACHE_PROVIDERS)
+
+
+def uses_cached_context(model: str) -> bool:
+    """Whether agents on model send their stable prefix as a cached context."""
+    return PROMPT_CACHE == "explicit" and supports_explicit_cache(model)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_context_llm() -> type:
+    from crewai import LLM
+
+    class CachedContextLLM(LLM):
+        """
+        CrewAI LLM that sends the stable prompt prefix as a cached context:
+        the messages handed to the public LLM.call are marked before
+        CrewAI passes them on to LiteLLM.
+        """
+
+        def call(self, messages, *args, **kwargs):
+            if isinstance(messages, list):
+                messages = mark_cached_context(messages)
+            return super().call(messages, *args, **kwargs)
+
+    return CachedContextLLM
+
+
+def llm_class(model: str) -> type:
+    """
+    The CrewAI LLM class for agents on model: CachedContextLLM when
+    uses_cached_context(model), else LLM. CrewAI is imported here, on
+    first use, rather than with this module (warmup.py).
+    """
+    if uses_cached_context(model):
+        return _cached_context_llm()
+    from crewai import LLM
+
+    return LLM
@@ -0,0 +1,223 @@
+"""
+Question Bank — reuse generated questions across similar candidates.
+
+Every generated question set (Round 2 technical questions, Round 3
+scenario) is stored in SQLite with its role and a skill fingerprint of
+the resume it was written for: the known skills the resume mentions.
+When a later candidate for the same role has a close fingerprint
+(Jaccard similarity ≥ QUESTION_BANK_MIN_SIMILARITY), a stored set is
+served instantly instead of calling the LLM.
+
+Freshness / rotation, so questions don't leak:
+  - an entry is retired after QUESTION_BANK_MAX_SERVES serves or once it
+    is older than QUESTION_BANK_MAX_AGE_DAYS
+  - among the close matches, the least-served entry is picked first
+  - QUESTION_BANK_REFRESH_RATE of lookups generate fresh anyway, so the
+    bank keeps renewing itself
+Hit rate and the generation time saved are tracked (GET /question-bank/stats).
+"""
+
+import os
+import re
+import json
+import time
+import random
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+QUESTION_BANK_ENABLED = os.getenv("QUESTION_BANK", "1") == "1"
+QUESTION_BANK_DB_PATH = os.getenv(
+    "QUESTION_BANK_DB_PATH", os.path.join(os.path.dirname(__file__), "data", "question_bank.db")
+)
+QUESTION_BANK_MIN_SIMILARITY = float(os.getenv("QUESTION_BANK_MIN_SIMILARITY", "0.8"))
+QUESTION_BANK_MAX_SERVES = int(os.getenv("QUESTION_BANK_MAX_SERVES", "5"))
+QUESTION_BANK_MAX_AGE_DAYS = float(os.getenv("QUESTION_BANK_MAX_AGE_DAYS", "14"))
+QUESTION_BANK_REFRESH_RATE = float(os.getenv("QUESTION_BANK_REFRESH_RATE", "0.1"))
+
+MIN_FINGERPRINT_SKILLS = 3  # resumes naming fewer known skills are never matched
+CANDIDATES_PER_LOOKUP = 2000  # most recent live entries compared per lookup
+
+SKILL_TERMS = [
+    # languages
+    "python", "java", "javascript", "typescript", "c++", "c#", "go", "golang", "rust",
+    "kotlin", "swift", "scala", "ruby", "php", "sql", "bash",
+    # web / backend
+    "react", "next.js", "node.js", "express", "django", "flask", "fastapi", "spring",
+    "graphql", "rest", "grpc", "microservices", "websockets",
+    # data stores / messaging
+    "postgresql", "mysql", "mongodb", "redis", "elasticsearch", "kafka", "rabbitmq",
+    "dynamodb", "cassandra", "sqlite",
+    # infrastructure
+    "docker", "kubernetes", "aws", "gcp", "azure", "terraform", "ci/cd", "linux",
+    "nginx", "serverless",
+    # ML / AI
+    "machine learning", "deep learning", "pytorch", "tensorflow", "keras", "scikit-learn",
+    "hugging face", "transformers", "llm", "nlp", "computer vision", "rag",
+    "langchain", "prompt engineering", "fine-tuning", "embeddings", "vector database",
+    "mlops", "numpy", "pandas", "opencv", "reinforcement learning", "generative ai",
+    # fundamentals
+    "data structures", "algorithms", "system design", "distributed systems",
+    "operating systems", "networking", "multithreading", "unit testing",
+]
+_ALIASES = {"golang": "go", "postgres": "postgresql", "nextjs": "next.js", "nodejs": "node.js"}
+_SKILL_PATTERN = re.compile(
+    r"(?<![\w+#.])("
+    + "|".join(re.escape(term) for term in sorted(SKILL_TERMS + list(_ALIASES), key=len, reverse=True))
+    + r")(?![\w+#])",
+    re.IGNORECASE,
+)
+
+
+def skill_fingerprint(resume: str) -> list:
+    """Sorted known skills the resume mentions."""
+    found = {match.lower() for match in _SKILL_PATTERN.findall(resume)}
+    return sorted({_ALIASES.get(skill, skill) for skill in found})
+
+
+def _jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class QuestionBank:
+    """SQLite-backed bank of generated questions, matched by skill fingerprint."""
+
+    def __init__(self, path: str = QUESTION_BANK_DB_PATH):
+        self.path = path
+        self._initialised = False
+        self._lock = threading.Lock()
+        self.counters = {"lookups": 0, "hits": 0, "misses": 0, "refreshes": 0, "stored": 0}
+        self.latency_saved_seconds = 0.0
+
+    @contextmanager
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            if not self._initialised:
+                conn.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS questions (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        kind TEXT NOT NULL,
+                        role TEXT NOT NULL,
+                        fingerprint TEXT NOT NULL,
+                        content TEXT NOT NULL,
+                        generation_seconds REAL NOT NULL,
+                        served INTEGER NOT NULL DEFAULT 0,
+                        created_at REAL NOT NULL,
+                        last_served_at REAL
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_questions_lookup
+                        ON questions (kind, role, created_at);
+                    """
+                )
+                self._initialised = True
+            yield conn
+        finally:
+            conn.close()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def lookup(self, kind: str, role: str, resume: str) -> Optional[dict]:
+        """
+        A stored question set for a close-enough resume, marked as served —
+        or None (the caller generates, then store()s the result).
+        """
+        self._count("lookups")
+        fingerprint = set(skill_fingerprint(resume))
+        if len(fingerprint) < MIN_FINGERPRINT_SKILLS:
+            self._count("misses")
+            return None
+        if random.random() < QUESTION_BANK_REFRESH_RATE:
+            self._count("refreshes")
+            return None
+
+        oldest = time.time() - QUESTION_BANK_MAX_AGE_DAYS * 86400
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, fingerprint, served, generation_seconds FROM questions "
+                "WHERE kind = ? AND role = ? AND created_at >= ? AND served < ? "
+                "ORDER BY created_at DESC LIMIT ?",
+                (kind, role, oldest, QUESTION_BANK_MAX_SERVES, CANDIDATES_PER_LOOKUP),
+            ).fetchall()
+            matches = []
+            for row in rows:
+                similarity = _jaccard(fingerprint, set(json.loads(row["fingerprint"])))
+                if similarity >= QUESTION_BANK_MIN_SIMILARITY:
+                    matches.append((row["served"], -similarity, row["id"], row))
+            if not matches:
+                self._count("misses")
+                return None
+            # Rotation: least-served first, then the closest fingerprint
+            served, negative_similarity, entry_id, row = min(matches)
+            # Conditional update, so concurrent lookups can't overshoot MAX_SERVES
+            updated = conn.execute(
+                "UPDATE questions SET served = served + 1, last_served_at = ? "
+                "WHERE id = ? AND served < ?",
+                (time.time(), entry_id, QUESTION_BANK_MAX_SERVES),
+            ).rowcount
+            if not updated:
+                self._count("misses")
+                return None
+            content = conn.execute(
+                "SELECT content FROM questions WHERE id = ?", (entry_id,)
+            ).fetchone()["content"]
+
+        with self._lock:
+            self.counters["hits"] += 1
+            self.latency_saved_seconds += row["generation_seconds"]
+        return {
+            "id": entry_id,
+            "content": content,
+            "similarity": round(-negative_similarity, 3),
+            "generation_seconds": row["generation_seconds"],
+        }
+
+    def store(self, kind: str, role: str, resume: str, content: str, generation_seconds: float) -> None:
+        """Bank a freshly generated question set."""
+        fingerprint = skill_fingerprint(resume)
+        if len(fingerprint) < MIN_FINGERPRINT_SKILLS:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO questions (kind, role, fingerprint, content, generation_seconds, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, role, json.dumps(fingerprint), content, generation_seconds, time.time()),
+            )
+        self._count("stored")
+
+    def stats(self) -> dict:
+        oldest = time.time() - QUESTION_BANK_MAX_AGE_DAYS * 86400
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) AS entries, "
+                "SUM(CASE WHEN created_at >= ? AND served < ? THEN 1 ELSE 0 END) AS live, "
+                "COALESCE(SUM(served), 0) AS served, "
+                "COALESCE(SUM(served * generation_seconds), 0) AS saved "
+                "FROM questions",
+                (oldest, QUESTION_BANK_MAX_SERVES),
+            ).fetchone()
+        with self._lock:
+            counters = dict(self.counters)
+            saved = self.latency_saved_seconds
+        answered = counters["hits"] + counters["misses"] + counters["refreshes"]
+        return {
+            "enabled": QUESTION_BANK_ENABLED,
+            **counters,
+            "hit_rate": round(counters["hits"] / answered, 4) if answered else 0.0,
+            "latency_saved_seconds": round(saved, 2),
+            "entries": row["entries"],
+            "live_entries": row["live"] or 0,
+            "lifetime_serves": row["served"],
+            "lifetime_latency_saved_seconds": round(row["saved"], 2),
+        }
+
+
+# Process-wide bank used by crew_runner
+question_bank = QuestionBank()
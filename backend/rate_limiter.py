@@ -0,0 +1,265 @@
+"""
+Rate Limiter — client-side RPM / TPM token buckets shared across workers.
+
+Provider quotas are the real throughput ceiling, so every crew run takes
+one request token and an estimated number of LLM tokens from a pair of
+buckets before it calls the provider. When a bucket is empty the call
+waits (it is queued, not failed). Bucket state lives in a small SQLite
+file, so every uvicorn worker on the host draws from the same quota.
+
+A 429 that still gets through blocks the bucket for every worker until
+the provider's Retry-After has passed.
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import asyncio
+import logging
+import sqlite3
+from contextlib import contextmanager
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "60"))  # 0 disables
+LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "250000"))  # 0 disables
+LLM_EXPECTED_COMPLETION_TOKENS = 1024
+RATE_LIMIT_DB_PATH = os.getenv(
+    "RATE_LIMIT_DB_PATH", os.path.join(os.path.dirname(__file__), "data", "ratelimit.db")
+)
+
+RETRY_BASE_DELAY = 2.0  # seconds — first backoff step
+RETRY_MAX_DELAY = 60.0  # seconds — backoff ceiling
+
+
+# ── Error classification / backoff ──────────────────────────────────
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """
+    True if a provider error is a 429 / quota exhaustion: a LiteLLM
+    RateLimitError or an error carrying status_code 429, raised directly
+    or as the cause of the error CrewAI raised. The message is never
+    inspected.
+    """
+    litellm = sys.modules.get("litellm")  # loaded whenever a provider call was made
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if getattr(exc, "status_code", None) == 429:
+            return True
+        if litellm is not None and isinstance(exc, litellm.RateLimitError):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Provider-requested wait, from a Retry-After header or Gemini's retryDelay."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    match = re.search(
+        r"retry(?:Delay|[ _-]after| in)\W*(\d+(?:\.\d+)?)\s*s", str(exc), re.IGNORECASE
+    )
+    if match:
+        return float(match.group(1))
+    return None
+
+
+def tag_limited_model(exc: BaseException, model: str) -> None:
+    """Record on a 429 error which model's quota it hit (see limited_model)."""
+    exc.limited_model = model
+
+
+def limited_model(exc: BaseException, default: str) -> str:
+    """
+    The model whose quota a 429 error hit — the tier the call was routed
+    to, as tagged by crew_runner.py — or default if it is not tagged.
+    """
+    return getattr(exc, "limited_model", None) or default
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, never shorter than Retry-After."""
+    ceiling = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** (attempt - 1)))
+    delay = random.uniform(0, ceiling)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+# ── Shared token buckets ────────────────────────────────────────────
+
+
+class TokenBucketLimiter:
+    """RPM + TPM buckets for one model, persisted in SQLite."""
+
+    def __init__(
+        self,
+        model: str,
+        rpm: int = LLM_RPM_LIMIT,
+        tpm: int = LLM_TPM_LIMIT,
+        path: str = RATE_LIMIT_DB_PATH,
+    ):
+        self.model = model
+        self.rpm = rpm
+        self.tpm = tpm
+        self.path = path
+        self._initialised = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.rpm > 0 or self.tpm > 0
+
+    @contextmanager
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            if not self._initialised:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS buckets (
+                        model TEXT PRIMARY KEY,
+                        requests REAL NOT NULL,
+                        tokens REAL NOT NULL,
+                        blocked_until REAL NOT NULL DEFAULT 0,
+                        updated_at REAL NOT NULL
+                    )
+                    """
+                )
+                self._initialised = True
+            yield conn
+        finally:
+            conn.close()
+
+    def _refilled(self, conn, now: float) -> tuple:
+        row = conn.execute(
+            "SELECT requests, tokens, blocked_until, updated_at FROM buckets WHERE model = ?",
+            (self.model,),
+        ).fetchone()
+        if row is None:
+            return float(self.rpm), float(self.tpm), 0.0
+        requests, tokens, blocked_until, updated_at = row
+        elapsed = max(0.0, now - updated_at)
+        requests = min(self.rpm, requests + elapsed * self.rpm / 60.0)
+        tokens = min(self.tpm, tokens + elapsed * self.tpm / 60.0)
+        return requests, tokens, blocked_until
+
+    def _save(self, conn, requests, tokens, blocked_until, now) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO buckets (model, requests, tokens, blocked_until, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (self.model, requests, tokens, blocked_until, now),
+        )
+
+    def try_acquire(self, estimated_tokens: int) -> float:
+        """
+        Take one request + estimated_tokens if available.
+        Returns 0 on success, else the seconds to wait before trying again.
+        """
+        # A single call larger than the whole TPM budget must still go through
+        estimated_tokens = min(estimated_tokens, self.tpm) if self.tpm else 0
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                requests, tokens, blocked_until = self._refilled(conn, now)
+                wait = max(0.0, blocked_until - now)
+                if self.rpm and requests < 1:
+                    wait = max(wait, (1 - requests) * 60.0 / self.rpm)
+                if self.tpm and tokens < estimated_tokens:
+                    wait = max(wait, (estimated_tokens - tokens) * 60.0 / self.tpm)
+                if wait == 0:
+                    if self.rpm:
+                        requests -= 1
+                    tokens -= estimated_tokens
+                self._save(conn, requests, tokens, blocked_until, now)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def settle(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Correct the TPM bucket once the real token usage is known."""
+        if not self.tpm or not actual_tokens:
+            return
+        delta = min(estimated_tokens, self.tpm) - actual_tokens
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                requests, tokens, blocked_until = self._refilled(conn, now)
+                self._save(conn, requests, min(self.tpm, tokens + delta), blocked_until, now)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def block_for(self, seconds: float) -> None:
+        """Pause every worker's calls to this model (after a provider 429)."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                requests, tokens, blocked_until = self._refilled(conn, now)
+                self._save(conn, requests, tokens, max(blocked_until, now + seconds), now)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    async def acquire(self, estimated_tokens: int) -> float:
+        """Wait (without blocking the event loop) until the call fits the quota."""
+        if not self.enabled:
+            return 0.0
+        waited = 0.0
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire, estimated_tokens)
+            if wait == 0:
+                if waited:
+                    logger.info(f"Rate limiter queued call for {waited:.1f}s ({self.model})")
+                return waited
+            # Small jitter so queued callers don't wake in lock-step
+            wait += random.uniform(0, 0.25)
+            waited += wait
+            await asyncio.sleep(wait)
+
+
+def estimate_tokens(crew) -> int:
+    """Rough prompt + completion size of a crew run (~4 characters per token)."""
+    chars = 0
+    for task in crew.tasks:
+        agent = task.agent
+        chars += len(task.description) + len(task.expected_output or "")
+        chars += len(getattr(agent, "role", "") or "")
+        chars += len(getattr(agent, "goal", "") or "")
+        chars += len(getattr(agent, "backstory", "") or "")
+    return chars // 4 + LLM_EXPECTED_COMPLETION_TOKENS * len(crew.tasks)
+
+
+_limiters: dict = {}
+
+
+def limiter_for(model: str) -> TokenBucketLimiter:
+    """Process-wide limiter for one model (its buckets are shared on disk)."""
+    if model not in _limiters:
+        _limiters[model] = TokenBucketLimiter(model)
+    return _limiters[model]
+
+
+def crew_model(crew) -> str:
+    """Model name used by a crew's (first) agent."""
+    llm = getattr(crew.tasks[0].agent, "llm", None)
+    return str(getattr(llm, "model", llm))
@@ -0,0 +1,331 @@
+"""
+Resume Ingestion — PDF / DOCX / TXT uploads → normalized text + profile.
+
+Uploads are read in chunks (size-capped, hashed as they stream in) and
+parsed in a process pool, so PDF extraction never blocks the event loop
+and large batches use every core. Workers are spawned rather than forked:
+the API process runs threads (executors, the job queue), and a fork
+copies their locks in whatever state they happen to be in. Parsing:
+  1. extract text (pypdf / python-docx / plain decode)
+  2. normalize — unicode, whitespace, bullets, hyphenated line breaks,
+     page numbers and running headers/footers
+  3. canonicalize section headings and merge duplicate sections
+  4. compact into the later-round profile (context_compaction.py)
+
+Results are stored in SQLite keyed by SHA-256 of the file bytes (and the
+parser version), so re-uploading the same file skips parsing entirely.
+The hash doubles as the resume_id that /start accepts in place of the
+resume text: rows are never evicted, so a resume_id keeps resolving, and
+the store is separate from the LLM response cache, so a request with
+bypass_cache still finds uploaded resumes.
+"""
+
+import io
+import os
+import re
+import time
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import unicodedata
+import multiprocessing
+from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from context_compaction import compact_resume, section_heading
+
+logger = logging.getLogger(__name__)
+
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(5 * 1024 * 1024)))
+RESUME_PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", str(os.cpu_count() or 2)))
+RESUME_DB_PATH = os.getenv(
+    "RESUME_DB_PATH", os.path.join(os.path.dirname(__file__), "data", "resumes.db")
+)
+PARSER_VERSION = 1  # bump when parsing output changes, so uploads are parsed again
+
+UPLOAD_CHUNK_BYTES = 64 * 1024
+FORMATS = {".pdf": "pdf", ".docx": "docx", ".txt": "txt", ".md": "txt"}
+CONTENT_TYPES = {
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+    "text/plain": "txt",
+    "text/markdown": "txt",
+}
+GENERIC_CONTENT_TYPES = ("", "application/octet-stream")  # declare no format
+
+
+class UnsupportedResumeFormat(ValueError):
+    """The upload is not a PDF, DOCX or plain-text file."""
+
+
+# ── Extraction (runs in worker processes) ───────────────────────────
+
+
+def _declared_format(filename: str, content_type: Optional[str]) -> Optional[str]:
+    """
+    The format an upload's extension (else its content type) declares, or
+    None if it declares none. Raises UnsupportedResumeFormat for anything
+    outside FORMATS / CONTENT_TYPES.
+    """
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext:
+        if ext not in FORMATS:
+            raise UnsupportedResumeFormat(f"Unsupported resume format: {filename!r}")
+        return FORMATS[ext]
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in GENERIC_CONTENT_TYPES:
+        return None
+    if media_type not in CONTENT_TYPES:
+        raise UnsupportedResumeFormat(f"Unsupported resume content type: {media_type!r}")
+    return CONTENT_TYPES[media_type]
+
+
+def _detect_format(filename: str, data: bytes, content_type: Optional[str] = None) -> str:
+    declared = _declared_format(filename, content_type)
+    if data.startswith(b"%PDF"):
+        return "pdf"
+    if data.startswith(b"PK") and b"word/" in data[:4096]:
+        return "docx"
+    if declared is not None:
+        return declared
+    # Nothing declared: sniff for plain text
+    if b"\x00" not in data[:4096]:
+        return "txt"
+    raise UnsupportedResumeFormat(f"Unsupported resume format: {filename!r}")
+
+
+def _extract_pdf(data: bytes) -> str:
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    # Form feed between pages, so running headers/footers can be detected
+    return "\f".join(page.extract_text() or "" for page in reader.pages)
+
+
+def _extract_docx(data: bytes) -> str:
+    import docx
+
+    document = docx.Document(io.BytesIO(data))
+    lines = [p.text for p in document.paragraphs]
+    for table in document.tables:
+        for row in table.rows:
+            lines.append(" | ".join(cell.text.strip() for cell in row.cells if cell.text.strip()))
+    return "\n".join(lines)
+
+
+def _extract_txt(data: bytes) -> str:
+    for encoding in ("utf-8-sig", "cp1252"):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode("latin-1")
+
+
+_EXTRACTORS = {"pdf": _extract_pdf, "docx": _extract_docx, "txt": _extract_txt}
+
+# ── Normalization ───────────────────────────────────────────────────
+
+_PAGE_NUMBER = re.compile(r"^(?:page\s*)?\d{1,3}(?:\s*(?:/|of)\s*\d{1,3})?$", re.IGNORECASE)
+_BULLET = re.compile(r"^\s*[-*•●▪◦·–‣]\s*")
+
+
+def _running_lines(pages: list) -> set:
+    """Lines repeated on most pages — headers and footers."""
+    if len(pages) < 2:
+        return set()
+    counts = Counter(
+        line for page in pages for line in {ln.strip() for ln in page.splitlines() if ln.strip()}
+    )
+    return {line for line, n in counts.items() if n > len(pages) / 2}
+
+
+def normalize_resume(text: str) -> str:
+    """
+    Clean extracted text into one canonical layout: upper-case section
+    headings, "- " bullets, duplicate sections merged, duplicate lines dropped.
+    """
+    text = unicodedata.normalize("NFKC", text).replace("\r\n", "\n").replace("\r", "\n")
+    text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)  # words hyphenated across lines
+    pages = text.split("\f")
+    running = _running_lines(pages)
+
+    header, sections = [], {}
+    current = None
+    seen = set()
+    for page_no, page in enumerate(pages):
+        for raw_line in page.splitlines():
+            line = re.sub(r"[ \t]+", " ", raw_line).strip()
+            if not line or _PAGE_NUMBER.match(line):
+                continue
+            if line in running and page_no > 0:
+                continue
+            name = section_heading(line)
+            if name is not None:
+                current = name
+                sections.setdefault(current, [])
+                continue
+            bullet = bool(_BULLET.match(line))
+            line = _BULLET.sub("", line)
+            key = (current, line.lower())
+            if key in seen:
+                continue
+            seen.add(key)
+            line = f"- {line}" if bullet else line
+            (header if current is None else sections[current]).append(line)
+
+    parts = ["\n".join(header)] if header else []
+    for name, lines in sections.items():
+        if lines:
+            parts.append(f"{name.upper()}\n" + "\n".join(lines))
+    return "\n\n".join(parts)
+
+
+def _parse_document(filename: str, data: bytes, content_type: Optional[str] = None) -> dict:
+    """Extract, normalize and compact one document (worker-process entry point)."""
+    fmt = _detect_format(filename, data, content_type)
+    try:
+        raw = _EXTRACTORS[fmt](data)
+    except ImportError as e:
+        raise UnsupportedResumeFormat(f"{fmt.upper()} support is not installed: {e}")
+    except Exception as e:
+        raise ValueError(f"Could not read {fmt.upper()} file {filename!r}: {e}")
+    text = normalize_resume(raw)
+    if not text.strip():
+        raise ValueError(f"No text found in {filename!r} (scanned image?)")
+    return {"format": fmt, "text": text, "profile": compact_resume(text)}
+
+
+# ── Storage ─────────────────────────────────────────────────────────
+
+_initialised = False
+
+
+@contextmanager
+def _connect():
+    """Open an autocommit connection to the resume database."""
+    global _initialised
+    os.makedirs(os.path.dirname(RESUME_DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(RESUME_DB_PATH, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    try:
+        if not _initialised:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS resumes (
+                    resume_id TEXT NOT NULL,
+                    parser_version INTEGER NOT NULL,
+                    format TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    profile TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (resume_id, parser_version)
+                )
+                """
+            )
+            _initialised = True
+        yield conn
+    finally:
+        conn.close()
+
+
+def _load(resume_id: str, parser_version: Optional[int] = None) -> Optional[dict]:
+    """A stored parse of resume_id (by parser_version, else the newest), or None."""
+    query = "SELECT format, text, profile FROM resumes WHERE resume_id = ?"
+    params: tuple = (resume_id,)
+    if parser_version is not None:
+        query += " AND parser_version = ?"
+        params += (parser_version,)
+    with _connect() as conn:
+        row = conn.execute(query + " ORDER BY parser_version DESC LIMIT 1", params).fetchone()
+    return dict(row) if row is not None else None
+
+
+def _save(resume_id: str, parsed: dict) -> None:
+    with _connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO resumes "
+            "(resume_id, parser_version, format, text, profile, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                resume_id, PARSER_VERSION, parsed["format"], parsed["text"],
+                parsed["profile"], time.time(),
+            ),
+        )
+
+
+# ── Async API ───────────────────────────────────────────────────────
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _parser_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=RESUME_PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def shutdown_parser_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def read_upload(upload) -> tuple:
+    """Stream an UploadFile into memory in chunks. Returns (bytes, sha256 hex)."""
+    digest, chunks, size = hashlib.sha256(), [], 0
+    while True:
+        chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > RESUME_MAX_BYTES:
+            raise ValueError(
+                f"{upload.filename!r} is larger than {RESUME_MAX_BYTES // 1024} KB."
+            )
+        digest.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks), digest.hexdigest()
+
+
+async def parse_resume(
+    filename: str,
+    data: bytes,
+    content_hash: Optional[str] = None,
+    content_type: Optional[str] = None,
+) -> dict:
+    """
+    Parse one resume (stored by content hash, parsed once per parser version).
+    Returns {resume_id, filename, format, text, profile, cached}. Raises
+    UnsupportedResumeFormat for an unsupported extension or content type,
+    even if the same bytes were stored before under a supported one.
+    """
+    _declared_format(filename, content_type)
+    content_hash = content_hash or hashlib.sha256(data).hexdigest()
+    parsed = await asyncio.to_thread(_load, content_hash, PARSER_VERSION)
+    hit = parsed is not None
+    if not hit:
+        loop = asyncio.get_running_loop()
+        parsed = await loop.run_in_executor(
+            _parser_pool(), _parse_document, filename, data, content_type
+        )
+        await asyncio.to_thread(_save, content_hash, parsed)
+    return {"resume_id": content_hash, "filename": filename, **parsed, "cached": hit}
+
+
+def get_parsed_resume(resume_id: str) -> Optional[dict]:
+    """
+    A previously uploaded resume's parsed text + profile (its newest parse),
+    or None if unknown. Blocking — call it from a worker thread.
+    """
+    if not re.fullmatch(r"[0-9a-f]{64}", resume_id or ""):
+        return None
+    return _load(resume_id)
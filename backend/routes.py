@@ -3,20 +3,41 @@ API Routes — FastAPI endpoints for the interview pipeline.
 
 FastAPI handles orchestration only — no decision-making logic here.
 All decisions are made by CrewAI agents via crew_runner.py.
+
+Every interview is identified by the interview_id returned from /start;
+all later endpoints require it.
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-
-from state import get_state, update_state, reset_state, interview_state, AVAILABLE_ROLES
-from crew_runner import (
-    run_screening,
-    run_technical_questions,
-    run_technical_evaluation,
-    run_scenario_question,
-    run_scenario_evaluation,
-    run_hiring_committee,
+import json
+import asyncio
+from typing import List, Optional
+
+from fastapi import APIRouter, File, HTTPException, Request, UploadFile
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+
+from state import create_state, reset_state, AVAILABLE_ROLES
+from pipeline import (
+    load_state,
+    check_can_answer,
+    run_round1,
+    run_round2,
+    run_round3,
+    run_final,
+    run_screening_batch,
 )
+import jobs
+import llm_cache
+import decision_store
+import instrumentation
+import model_router
+import warmup
+import idempotency
+from context_compaction import compact_resume
+import resume_ingest
+from prescreen import prescreener
+from question_bank import question_bank
 
 router = APIRouter()
 
@@ -25,241 +46,674 @@ router = APIRouter()
 
 
 class StartRequest(BaseModel):
-    resume: str
+    resume: str = ""
+    resume_id: Optional[str] = None  # from POST /resumes, instead of the text
     role: str
+    background: bool = False  # enqueue and return a job ID instead of waiting
+    bypass_cache: bool = False  # force fresh LLM calls for this request
 
 
 class AnswerRequest(BaseModel):
+    interview_id: str
     answer: str
+    background: bool = False
+    bypass_cache: bool = False
+
+
+class BatchScreenRequest(BaseModel):
+    role: str
+    resumes: List[str]
+    bypass_cache: bool = False
+
+
+class ResetRequest(BaseModel):
+    interview_id: Optional[str] = None
+
+
+def _create_interview(req: StartRequest) -> str:
+    """
+    Fresh session; the resume is compacted once here for every later round.
+    Blocking (session store, resume store) — run it in a worker thread.
+    """
+    if req.resume_id:
+        parsed = resume_ingest.get_parsed_resume(req.resume_id)
+        if parsed is None:
+            raise HTTPException(status_code=404, detail="Unknown resume_id.")
+        resume, profile = parsed["text"], parsed["profile"]
+    else:
+        resume = req.resume.strip()
+        profile = compact_resume(resume)
+    return create_state(resume=resume, role=req.role.strip(), resume_profile=profile)
+
+
+def _validate_start(req: StartRequest) -> None:
+    if not req.resume.strip() and not req.resume_id:
+        raise HTTPException(status_code=400, detail="Resume cannot be empty.")
+    if not req.role.strip():
+        raise HTTPException(status_code=400, detail="Role must be selected.")
+    if req.role.strip() not in AVAILABLE_ROLES:
+        raise HTTPException(status_code=400, detail=f"Invalid role. Choose from: {AVAILABLE_ROLES}")
+
+
+# ── Idempotency ──────────────────────────────────────────────────────
+
+
+def _request_key(request: Request, endpoint: str, req: BaseModel) -> tuple:
+    """(key, fingerprint, replay) for a step request (idempotency.request_key)."""
+    try:
+        return idempotency.request_key(
+            endpoint, req.model_dump(), request.headers.get("Idempotency-Key")
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _as_response(result) -> Response:
+    return result if isinstance(result, Response) else JSONResponse(jsonable_encoder(result))
+
+
+async def _once(request: Request, endpoint: str, req: BaseModel, step) -> Response:
+    """
+    Run a step endpoint's body at most once per request identity
+    (idempotency.py): duplicates in flight share its response, later ones
+    get it replayed with an Idempotent-Replayed header.
+    """
+    key, request_fingerprint, replay = _request_key(request, endpoint, req)
+
+    async def execute() -> Response:
+        return _as_response(await step())
+
+    try:
+        response, outcome = await idempotency.step_flights.run(
+            key, request_fingerprint, execute, replay
+        )
+    except idempotency.IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    instrumentation.record_idempotent_request(endpoint, outcome)
+    if outcome == "executed":
+        return response
+    return Response(
+        content=response.body,
+        status_code=response.status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+@router.get("/idempotency/stats")
+async def get_idempotency_stats():
+    """Requests executed, coalesced onto one in flight, or replayed from the response cache."""
+    return idempotency.step_flights.stats()
+
+
+# ── Background jobs ──────────────────────────────────────────────────
+
+
+async def _job_round1(payload: dict) -> dict:
+    with llm_cache.bypassing(payload.get("bypass_cache", False)):
+        return await run_round1(payload["interview_id"])
+
+
+async def _job_round2(payload: dict) -> dict:
+    with llm_cache.bypassing(payload.get("bypass_cache", False)):
+        return await run_round2(payload["interview_id"], payload["answer"])
+
+
+async def _job_round3(payload: dict) -> dict:
+    with llm_cache.bypassing(payload.get("bypass_cache", False)):
+        return await run_round3(payload["interview_id"], payload["answer"])
+
+
+jobs.register_handler("round1", _job_round1)
+jobs.register_handler("round2", _job_round2)
+jobs.register_handler("round3", _job_round3)
+
+
+async def _queued(kind: str, interview_id: str, **payload) -> JSONResponse:
+    """Enqueue a pipeline step and return 202 with the job ID to poll."""
+    job_id = await jobs.enqueue(kind, {"interview_id": interview_id, **payload})
+    return JSONResponse(
+        status_code=202,
+        content={
+            "interview_id": interview_id,
+            "job_id": job_id,
+            "job_status": "queued",
+            "poll": f"/jobs/{job_id}",
+        },
+    )
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """Report a background job as queued / running / done / failed, with its result."""
+    job = await asyncio.to_thread(jobs.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
+
+
+# ── Streaming (SSE) ──────────────────────────────────────────────────
+
+
+# Steps whose SSE client went away; kept referenced until they finish
+_detached_steps: set = set()
+
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+# (stage, payload key) of the readable text a step's result carries
+RENDERED_FIELDS = (("verdict", "verdict"), ("verdict", "rationale"), ("question", "question"))
+
+
+def _rendered(result: dict) -> list:
+    """(stage, text) for each rendered verdict / question in a step result."""
+    return [
+        (stage, result[key])
+        for stage, key in RENDERED_FIELDS
+        if isinstance(result, dict) and isinstance(result.get(key), str) and result[key]
+    ]
+
+
+def _sse(step, bypass_cache: bool = False) -> StreamingResponse:
+    """
+    Run a pipeline step as a server-sent event stream.
+    Emits `token` events ({stage, text, format: "raw"}) as the LLM produces
+    them — raw model output, i.e. fragments of the task's JSON, not text to
+    show as is. When the step is done, one `rendered` event ({stage, text})
+    per readable verdict / question it produced, then a single `result`
+    event with the same payload the blocking endpoint returns (or an
+    `error` event).
+    """
+
+    async def events():
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def on_token(stage: str, chunk: str) -> None:
+            # Called from crew worker threads
+            loop.call_soon_threadsafe(
+                queue.put_nowait, ("token", {"stage": stage, "text": chunk, "format": "raw"})
+            )
+
+        async def run():
+            try:
+                with llm_cache.bypassing(bypass_cache):
+                    result = await step(on_token)
+                for stage, text in _rendered(result):
+                    queue.put_nowait(("rendered", {"stage": stage, "text": text}))
+                queue.put_nowait(("result", result))
+            except HTTPException as e:
+                queue.put_nowait(
+                    ("error", {"status_code": e.status_code, "detail": e.detail})
+                )
+            except Exception as e:
+                queue.put_nowait(("error", {"status_code": 500, "detail": str(e)}))
+
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                event, data = await queue.get()
+                yield _sse_event(event, data)
+                if event in ("result", "error"):
+                    break
+        finally:
+            # Client disconnects don't abort the step — its verdict is still persisted
+            if not task.done():
+                _detached_steps.add(task)
+                task.add_done_callback(_detached_steps.discard)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# token callbacks of the streams sharing one in-flight step, by request key
+_stream_listeners: dict = {}
+
+
+async def _once_stream(
+    request: Request, endpoint: str, req: BaseModel, check, step
+) -> StreamingResponse:
+    """
+    _once for the /stream twin of a step endpoint, under the blocking
+    endpoint's request identity: a duplicate (streamed or not) joins the
+    run in flight, receiving its remaining tokens, or gets its result
+    replayed. check() validates a request that starts a new run; step
+    is called with an on_token callback and returns the step's result.
+    """
+    key, request_fingerprint, replay = _request_key(request, endpoint, req)
+    if not idempotency.step_flights.active(key):
+        await check()
+
+    def broadcast(stage: str, chunk: str) -> None:
+        for on_token in list(_stream_listeners.get(key, ())):
+            on_token(stage, chunk)
+
+    async def execute() -> Response:
+        return _as_response(await step(broadcast))
+
+    async def shared(on_token):
+        listeners = _stream_listeners.setdefault(key, [])
+        listeners.append(on_token)
+        try:
+            response, outcome = await idempotency.step_flights.run(
+                key, request_fingerprint, execute, replay
+            )
+        except idempotency.IdempotencyConflict as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        finally:
+            listeners.remove(on_token)
+            if not listeners:
+                _stream_listeners.pop(key, None)
+        instrumentation.record_idempotent_request(endpoint, outcome)
+        return json.loads(response.body)
+
+    return _sse(shared, req.bypass_cache)
 
 
 # ── POST /reset ──────────────────────────────────────────────────────
 
 
 @router.post("/reset")
-async def reset_interview():
+async def reset_interview(req: Optional[ResetRequest] = None):
     """
-    Explicitly reset all interview state and clear verdict files.
-    Called by the frontend before starting a new interview.
+    Discard one interview's session state.
+    Its verdicts stay in the append-only DECISION MEMORY.
+    Other in-flight interviews are never touched.
     """
-    reset_state()
+    if req is None or not req.interview_id:
+        return {"status": "reset", "message": "No interview to clear."}
+
+    try:
+        await asyncio.to_thread(reset_state, req.interview_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid interview ID.")
     return {"status": "reset", "message": "Interview state cleared."}
 
 
+# ── POST /resumes ───────────────────────────────────────────────────
+
+RESUME_UPLOAD_MAX_FILES = 500
+
+
+async def _ingest_upload(upload: UploadFile) -> dict:
+    """Read and parse one uploaded file; raises HTTPException on bad input."""
+    try:
+        data, content_hash = await resume_ingest.read_upload(upload)
+        return await resume_ingest.parse_resume(
+            upload.filename or "", data, content_hash, upload.content_type
+        )
+    except resume_ingest.UnsupportedResumeFormat as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.post("/resumes")
+async def upload_resumes(files: List[UploadFile] = File(...)):
+    """
+    Upload PDF / DOCX / TXT resumes.
+    - Parsed in a process pool; an identical file re-uploaded is served from cache
+    - Returns each resume's normalized text and a resume_id for /start
+    """
+    if len(files) > RESUME_UPLOAD_MAX_FILES:
+        raise HTTPException(
+            status_code=400, detail=f"At most {RESUME_UPLOAD_MAX_FILES} files per upload."
+        )
+    results = await asyncio.gather(
+        *(_ingest_upload(f) for f in files), return_exceptions=True
+    )
+    resumes = []
+    for upload, result in zip(files, results):
+        if isinstance(result, HTTPException):
+            resumes.append({"filename": upload.filename, "error": result.detail})
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            result.pop("profile")
+            resumes.append(result)
+    if len(files) == 1 and "error" in resumes[0]:
+        raise results[0]
+    return {"resumes": resumes}
+
+
 # ── POST /start ──────────────────────────────────────────────────────
 
 
 @router.post("/start")
-async def start_interview(req: StartRequest):
+async def start_interview(req: StartRequest, request: Request):
     """
     Start a new interview.
-    - Resets session context and decision memory
+    - Creates a new SESSION CONTEXT keyed by interview_id
     - Stores resume in SESSION CONTEXT
     - Runs ScreeningAgent with resume only (AGENT CONTEXT)
-    - Writes verdict to DECISION MEMORY (verdicts/round1.txt)
-    - Returns verdict + next round info
+    - Writes verdict to DECISION MEMORY (verdicts/<interview_id>/round1)
+    - Returns interview_id + verdict + next round info
+      (or a job ID to poll when background=true)
+    - Honours Idempotency-Key; identical requests in flight share one run
     """
-    if not req.resume.strip():
-        raise HTTPException(status_code=400, detail="Resume cannot be empty.")
-    if not req.role.strip():
-        raise HTTPException(status_code=400, detail="Role must be selected.")
-    if req.role.strip() not in AVAILABLE_ROLES:
-        raise HTTPException(status_code=400, detail=f"Invalid role. Choose from: {AVAILABLE_ROLES}")
+    _validate_start(req)
 
-    # Reset everything for a fresh interview
-    reset_state()
-    update_state(resume=req.resume.strip(), role=req.role.strip())
+    async def start():
+        # Fresh, isolated session for this interview
+        interview_id = await asyncio.to_thread(_create_interview, req)
 
-    # Run Round 1 — Screening Agent (context: resume + role)
-    result = run_screening(req.resume.strip(), req.role.strip())
+        if req.background:
+            return await _queued("round1", interview_id, bypass_cache=req.bypass_cache)
+        with llm_cache.bypassing(req.bypass_cache):
+            return await run_round1(interview_id)
 
-    # Update SESSION CONTEXT
-    interview_state["verdicts"]["round1"] = "verdicts/round1.txt"
+    return await _once(request, "/start", req, start)
 
-    decision = result["decision"]
 
-    if decision == "FAIL":
-        update_state(status="REJECTED")
-        return {
-            "round": 1,
-            "decision": "FAIL",
-            "verdict": result["verdict"],
-            "status": "REJECTED",
-            "message": "The candidate did not pass the screening round.",
-        }
-
-    # PASS or BORDERLINE — generate technical questions for Round 2
-    tech_result = run_technical_questions(get_state()["resume"])
-    interview_state["questions"]["round2"] = tech_result["questions"]
-    update_state(round=2)
-
-    return {
-        "round": 1,
-        "decision": decision,
-        "verdict": result["verdict"],
-        "status": "ONGOING",
-        "next_round": 2,
-        "question": tech_result["questions"],
-    }
+@router.post("/start/stream")
+async def start_interview_stream(req: StartRequest):
+    """Same as /start, streamed as SSE: screening verdict tokens, then question tokens."""
+    _validate_start(req)
+    interview_id = await asyncio.to_thread(_create_interview, req)
+    return _sse(
+        lambda on_token: run_round1(interview_id, on_token), req.bypass_cache
+    )
 
 
 # ── POST /round/2/answer ────────────────────────────────────────────
 
 
 @router.post("/round/2/answer")
-async def round2_answer(req: AnswerRequest):
+async def round2_answer(req: AnswerRequest, request: Request):
     """
     Submit answer for Round 2 (Technical).
     - Stores answer in SESSION CONTEXT
-    - Runs TechnicalAgent with AGENT CONTEXT (resume + round1.txt)
-    - Writes verdict to verdicts/round2.txt
+    - Runs TechnicalAgent with AGENT CONTEXT (resume + round1)
+    - Writes verdict to verdicts/<interview_id>/round2
     - Returns verdict + next round or rejection
+      (or a job ID to poll when background=true)
+    - A repeated answer shares / replays the first one's response
     """
-    state = get_state()
-
-    if state["status"] != "ONGOING":
-        raise HTTPException(status_code=400, detail=f"Interview is {state['status']}.")
-    # Round number check removed — status guard above is sufficient
-    if not req.answer.strip():
-        raise HTTPException(status_code=400, detail="Answer cannot be empty.")
 
-    # Store answer in SESSION CONTEXT
-    interview_state["answers"]["round2"].append(req.answer.strip())
+    async def answer():
+        if req.background:
+            check_can_answer(await load_state(req.interview_id), req.answer, 2)
+            return await _queued(
+                "round2", req.interview_id, answer=req.answer, bypass_cache=req.bypass_cache
+            )
+        with llm_cache.bypassing(req.bypass_cache):
+            return await run_round2(req.interview_id, req.answer)
 
-    # Run Technical evaluation (context: resume + round1.txt + answers)
-    questions = interview_state["questions"]["round2"] or ""
-    result = run_technical_evaluation(
-        state["resume"], questions, req.answer.strip()
-    )
+    return await _once(request, "/round/2/answer", req, answer)
 
-    # Update SESSION CONTEXT
-    interview_state["verdicts"]["round2"] = "verdicts/round2.txt"
 
-    decision = result["decision"]
-
-    if decision == "FAIL":
-        update_state(status="REJECTED")
-        return {
-            "round": 2,
-            "decision": "FAIL",
-            "verdict": result["verdict"],
-            "status": "REJECTED",
-            "message": "The candidate did not pass the technical round.",
-        }
+@router.post("/round/2/answer/stream")
+async def round2_answer_stream(req: AnswerRequest, request: Request):
+    """
+    Same as /round/2/answer, streamed as SSE. A repeated answer joins or
+    replays the first one, like the blocking endpoint.
+    """
 
-    # PASS — generate scenario question for Round 3
-    scenario_result = run_scenario_question(state["resume"])
-    interview_state["questions"]["round3"] = scenario_result["question"]
-    update_state(round=3)
+    async def check():
+        check_can_answer(await load_state(req.interview_id), req.answer, 2)
 
-    return {
-        "round": 2,
-        "decision": decision,
-        "verdict": result["verdict"],
-        "status": "ONGOING",
-        "next_round": 3,
-        "question": scenario_result["question"],
-    }
+    return await _once_stream(
+        request,
+        "/round/2/answer",
+        req,
+        check,
+        lambda on_token: run_round2(req.interview_id, req.answer, on_token),
+    )
 
 
 # ── POST /round/3/answer ────────────────────────────────────────────
 
 
 @router.post("/round/3/answer")
-async def round3_answer(req: AnswerRequest):
+async def round3_answer(req: AnswerRequest, request: Request):
     """
     Submit answer for Round 3 (Scenario).
     - Stores answer in SESSION CONTEXT
-    - Runs ScenarioAgent with AGENT CONTEXT (resume + round1.txt + round2.txt)
-    - Writes verdict to verdicts/round3.txt
+    - Runs ScenarioAgent with AGENT CONTEXT (resume + round1 + round2)
+    - Writes verdict to verdicts/<interview_id>/round3
     - Returns completion status
+      (or a job ID to poll when background=true)
+    - A repeated answer shares / replays the first one's response
     """
-    state = get_state()
 
-    if state["status"] != "ONGOING":
-        raise HTTPException(status_code=400, detail=f"Interview is {state['status']}.")
-    # Round number check removed — status guard above is sufficient
-    if not req.answer.strip():
-        raise HTTPException(status_code=400, detail="Answer cannot be empty.")
+    async def answer():
+        if req.background:
+            check_can_answer(await load_state(req.interview_id), req.answer, 3)
+            return await _queued(
+                "round3", req.interview_id, answer=req.answer, bypass_cache=req.bypass_cache
+            )
+        with llm_cache.bypassing(req.bypass_cache):
+            return await run_round3(req.interview_id, req.answer)
 
-    # Store answer in SESSION CONTEXT
-    interview_state["answers"]["round3"].append(req.answer.strip())
+    return await _once(request, "/round/3/answer", req, answer)
 
-    # Run Scenario evaluation
-    question = interview_state["questions"]["round3"] or ""
-    result = run_scenario_evaluation(
-        state["resume"], question, req.answer.strip()
+
+@router.post("/round/3/answer/stream")
+async def round3_answer_stream(req: AnswerRequest, request: Request):
+    """
+    Same as /round/3/answer, streamed as SSE. A repeated answer joins or
+    replays the first one, like the blocking endpoint.
+    """
+
+    async def check():
+        check_can_answer(await load_state(req.interview_id), req.answer, 3)
+
+    return await _once_stream(
+        request,
+        "/round/3/answer",
+        req,
+        check,
+        lambda on_token: run_round3(req.interview_id, req.answer, on_token),
     )
 
-    # Update SESSION CONTEXT
-    interview_state["verdicts"]["round3"] = "verdicts/round3.txt"
 
-    decision = result["decision"]
+# ── POST /screen/batch ──────────────────────────────────────────────
 
-    if decision == "FAIL":
-        update_state(status="REJECTED")
-        return {
-            "round": 3,
-            "decision": "FAIL",
-            "verdict": result["verdict"],
-            "status": "REJECTED",
-            "message": "The candidate did not pass the scenario round.",
-        }
+BATCH_MAX_RESUMES = 500
 
-    # PASS or BORDERLINE — mark complete
-    update_state(status="COMPLETE", round=4)
 
-    return {
-        "round": 3,
-        "decision": decision,
-        "verdict": result["verdict"],
-        "status": "COMPLETE",
-        "next": "/final-decision",
-    }
+async def _parse_batch_request(request: Request) -> tuple:
+    """
+    Accept either a JSON body or a multipart upload (`role` + `resumes` files).
+    Returns (request, rejected): rejected maps the position of each uploaded
+    file that could not be parsed to why, so one bad file fails only itself.
+    """
+    content_type = request.headers.get("content-type", "")
+    try:
+        if content_type.startswith("multipart/form-data"):
+            form = await request.form()
+            items = form.getlist("resumes")
+            if len(items) > BATCH_MAX_RESUMES:
+                raise HTTPException(
+                    status_code=400, detail=f"At most {BATCH_MAX_RESUMES} resumes per batch."
+                )
+            # Files (PDF / DOCX / TXT) are parsed concurrently in the process pool
+            uploads = [(i, item) for i, item in enumerate(items) if not isinstance(item, str)]
+            parsed = await asyncio.gather(
+                *(_ingest_upload(upload) for _, upload in uploads), return_exceptions=True
+            )
+            resumes = [item if isinstance(item, str) else "" for item in items]
+            rejected = {}
+            for (index, upload), result in zip(uploads, parsed):
+                if isinstance(result, HTTPException):
+                    rejected[index] = f"{upload.filename}: {result.detail}"
+                elif isinstance(result, BaseException):
+                    raise result
+                else:
+                    resumes[index] = result["text"]
+            req = BatchScreenRequest(
+                role=str(form.get("role") or ""),
+                resumes=resumes,
+                bypass_cache=str(form.get("bypass_cache", "")).lower() in ("1", "true"),
+            )
+            return req, rejected
+        return BatchScreenRequest.model_validate(await request.json()), {}
+    except (ValidationError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid batch request: {e}")
+
+
+@router.post("/screen/batch")
+async def screen_batch(request: Request):
+    """
+    Bulk Round 1 triage.
+    - Takes N resumes (JSON array or multipart upload) + one role
+    - Runs the ScreeningAgent across them with bounded concurrency
+    - Persists each verdict under its own interview_id
+    - Streams SSE `result` / `error` events as candidates finish, then a
+      `done` event with the full ranking by parsed score; an empty resume
+      or a file that cannot be parsed is an `error` event of its own
+    """
+    req, rejected = await _parse_batch_request(request)
+    role = req.role.strip()
+    if role not in AVAILABLE_ROLES:
+        raise HTTPException(status_code=400, detail=f"Invalid role. Choose from: {AVAILABLE_ROLES}")
+    resumes = [r.strip() for r in req.resumes]
+    if len(resumes) > BATCH_MAX_RESUMES:
+        raise HTTPException(
+            status_code=400, detail=f"At most {BATCH_MAX_RESUMES} resumes per batch."
+        )
+    for index, resume in enumerate(resumes):
+        if not resume:
+            rejected.setdefault(index, "Resume is empty.")
+    if len(rejected) == len(resumes):
+        detail = "At least one non-empty resume is required."
+        if any(reason != "Resume is empty." for reason in rejected.values()):
+            detail += " " + "; ".join(rejected[i] for i in sorted(rejected))
+        raise HTTPException(status_code=400, detail=detail)
+
+    async def events():
+        with llm_cache.bypassing(req.bypass_cache):
+            async for event, data in run_screening_batch(resumes, role, rejected):
+                yield _sse_event(event, data)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ── GET /final-decision ─────────────────────────────────────────────
 
 
 @router.get("/final-decision")
-async def final_decision():
+async def final_decision(interview_id: str, bypass_cache: bool = False):
     """
     Get the final hiring decision.
-    - Runs HiringCommitteeAgent with AGENT CONTEXT (all verdict files ONLY)
+    - Runs HiringCommitteeAgent with AGENT CONTEXT (all verdicts ONLY)
     - The committee does NOT see the resume or raw answers
     - Returns final decision + rationale
     """
-    state = get_state()
+    with llm_cache.bypassing(bypass_cache):
+        return await run_final(interview_id)
 
-    if state["status"] == "REJECTED":
-        return {
-            "decision": "REJECT",
-            "rationale": "Candidate was rejected in an earlier round.",
-            "status": "REJECTED",
-        }
 
-    if state["status"] != "COMPLETE":
-        raise HTTPException(
-            status_code=400,
-            detail="Interview is not complete. All rounds must be finished first.",
-        )
+@router.get("/final-decision/stream")
+async def final_decision_stream(interview_id: str, bypass_cache: bool = False):
+    """Same as /final-decision, streamed as SSE."""
+    await load_state(interview_id)
+    return _sse(lambda on_token: run_final(interview_id, on_token), bypass_cache)
 
-    # Check for cached decision
-    if state["final_decision"]:
-        return state["final_decision"]
 
-    # Run Hiring Committee (context: ONLY verdict files — no resume)
-    result = run_hiring_committee()
+# ── LLM response cache ───────────────────────────────────────────────
+
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Hit/miss counters and size of the LLM response cache."""
+    return await asyncio.to_thread(llm_cache.response_cache.stats)
+
+
+@router.delete("/cache")
+async def clear_cache():
+    """Drop every cached LLM response (both tiers)."""
+    await asyncio.to_thread(llm_cache.response_cache.clear)
+    return {"status": "cleared"}
+
+
+# ── Pre-screen ───────────────────────────────────────────────────────
+
+
+@router.get("/prescreen/stats")
+async def get_prescreen_stats():
+    """Mode, thresholds, index size and routing counters of the local pre-screen."""
+    return prescreener.stats()
+
+
+# ── Metrics ──────────────────────────────────────────────────────────
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """Stage / LLM / I/O latency histograms, tokens, retries and cache hits (Prometheus text)."""
+    return PlainTextResponse(
+        instrumentation.render_metrics(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@router.get("/ready")
+async def get_ready():
+    """Readiness probe: 200 once CrewAI is imported and the agents are built, else 503."""
+    status = warmup.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
+# ── Question bank ────────────────────────────────────────────────────
+
+
+@router.get("/question-bank/stats")
+async def get_question_bank_stats():
+    """Hit rate, generation time saved and size of the question bank."""
+    return await asyncio.to_thread(question_bank.stats)
+
+
+# ── Model routing ────────────────────────────────────────────────────
+
+
+@router.get("/models/stats")
+async def get_model_stats():
+    """Latency, tokens and cost per model tier, and cascade escalation rates."""
+    return model_router.router_stats.snapshot()
+
+
+# ── Decision history ─────────────────────────────────────────────────
+
+
+@router.get("/verdicts")
+async def search_verdicts(
+    role: Optional[str] = None,
+    round: Optional[str] = None,
+    decision: Optional[str] = None,
+    min_score: Optional[float] = None,
+    since: Optional[float] = None,
+    limit: int = 50,
+):
+    """Query DECISION MEMORY across interviews (newest first)."""
+    verdicts = await asyncio.to_thread(
+        decision_store.search_verdicts,
+        role=role,
+        name=round,
+        decision=decision.upper() if decision else None,
+        min_score=min_score,
+        since=since,
+        limit=max(1, min(limit, 500)),
+    )
+    return {"verdicts": verdicts}
 
-    # Cache the result
-    final = {
-        "decision": result["decision"],
-        "rationale": result["rationale"],
-        "status": "COMPLETE",
-    }
-    interview_state["final_decision"] = final
 
-    return final
+@router.get("/verdicts/{interview_id}")
+async def get_interview_verdicts(interview_id: str):
+    """Every verdict written for one interview, including superseded re-runs."""
+    try:
+        history = await asyncio.to_thread(decision_store.interview_history, interview_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid interview ID.")
+    return {"interview_id": interview_id, "verdicts": history}
 
 
 # ── GET /status ──────────────────────────────────────────────────────
@@ -272,10 +726,11 @@ async def get_available_roles():
 
 
 @router.get("/status")
-async def get_interview_status():
-    """Return current interview state (for frontend polling / debugging)."""
-    state = get_state()
+async def get_interview_status(interview_id: str):
+    """Return one interview's state (for frontend polling / debugging)."""
+    state = await load_state(interview_id)
     return {
+        "interview_id": interview_id,
         "round": state["round"],
         "status": state["status"],
         "role": state["role"],
@@ -283,4 +738,6 @@ async def get_interview_status():
         "verdicts": {
             k: v is not None for k, v in state["verdicts"].items()
         },
+        "timings": state.get("timings", {}),
+        "version": state.get("version", 0),
     }
@@ -0,0 +1,356 @@
+"""
+Structured Outputs — Pydantic models for every task's result.
+
+Each task asks its agent for JSON matching one of these models (CrewAI
+output_pydantic). The typed record is what the pipeline reasons over —
+decision and score are fields, not regex matches. Each model can also
+render itself back into the human-readable verdict format, which is
+what is stored in DECISION MEMORY and what later agents read.
+
+If an agent returns JSON that does not validate (a score of "8/10", a
+list where a string was expected), from_output() logs it and parses the
+JSON leniently, keeping the agent's decision. Only when there is no
+usable JSON at all does it degrade to a best-effort record built from
+the "Decision:" / "Score:" lines and the labelled sections of the text
+verdict format.
+"""
+
+import re
+import abc
+import json
+import typing
+import logging
+from typing import ClassVar, List, Literal, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+logger = logging.getLogger(__name__)
+
+
+def _extract_json(raw: str) -> Optional[str]:
+    """Pull the outermost JSON object out of a response (strips ``` fences)."""
+    start, end = raw.find("{"), raw.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    return raw[start:end + 1]
+
+
+def _legacy_decision(text: str, allowed: tuple, default: str) -> str:
+    """
+    Read an explicit "Decision: X" line (or a "decision": "X" JSON key, for
+    truncated JSON) — never guess from stray keywords.
+    """
+    match = re.search(
+        r"\"?Decision\"?\s*:\s*\**\s*\"?(" + "|".join(allowed) + r")\b", text, re.IGNORECASE
+    )
+    return match.group(1).upper() if match else default
+
+
+def _legacy_score(text: str) -> Optional[float]:
+    match = re.search(r"Score:\s*\**\s*(\d+(?:\.\d+)?)\s*/\s*10", text, re.IGNORECASE)
+    if match is None:
+        match = re.search(r"\"score\"\s*:\s*\"?(\d+(?:\.\d+)?)", text, re.IGNORECASE)
+    return _coerce_score(match.group(1)) if match else None
+
+
+def _coerce_score(value) -> Optional[float]:
+    """A 0-10 score from 8, "8", "8/10" or "8.5 / 10", clamped; None if unreadable."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        match = re.match(r"\s*(\d+(?:\.\d+)?)\s*(?:/\s*(\d+(?:\.\d+)?))?", value)
+        if match is None:
+            return None
+        number = float(match.group(1))
+        scale = float(match.group(2)) if match.group(2) else 10.0
+        value = number * 10 / scale if scale else number
+    if not isinstance(value, (int, float)):
+        return None
+    return min(10.0, max(0.0, float(value)))
+
+
+_SECTION_HEADER = re.compile(
+    r"^\s*\**\s*(Strengths|Weaknesses|Reasoning|Recommended Questions[^:]*|Summary"
+    r"|Overall Assessment|Recommendation)\s*\**\s*:\s*\**\s*(.*)$",
+    re.IGNORECASE,
+)
+_ITEM_MARKER = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+
+
+def _sections(text: str) -> dict:
+    """Split a text verdict into its labelled sections (lower-cased header → body)."""
+    sections, current = {}, None
+    for line in text.splitlines():
+        match = _SECTION_HEADER.match(line)
+        if match:
+            current = match.group(1).lower()
+            sections[current] = [match.group(2)] if match.group(2).strip() else []
+        elif current is not None:
+            sections[current].append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items()}
+
+
+def _items(block: str) -> List[str]:
+    """Bullet / numbered lines of a section, without markers or bold."""
+    items = []
+    for line in block.splitlines():
+        line = _ITEM_MARKER.sub("", line).replace("**", "").strip()
+        if line and line != "(none noted)":
+            items.append(line)
+    return items
+
+
+def _bullets(items: List[str]) -> str:
+    return "\n".join(f"- {item}" for item in items) if items else "- (none noted)"
+
+
+def _numbered(items: List[str]) -> str:
+    return "\n".join(f"{i}. {item}" for i, item in enumerate(items, 1))
+
+
+class StructuredOutput(BaseModel, abc.ABC):
+    """Base for task outputs: parse agent output, fall back on free text."""
+
+    @classmethod
+    def from_json(cls, raw: str):
+        """The output's JSON answer, or None if it has no valid one."""
+        for candidate in (raw, _extract_json(raw)):
+            if not candidate:
+                continue
+            try:
+                return cls.model_validate_json(candidate)
+            except (ValidationError, ValueError):
+                continue
+        return None
+
+    @classmethod
+    def from_lenient_json(cls, raw: str):
+        """
+        The output's JSON answer with its fields coerced to the schema
+        (score "8/10" → 8, clamped to 0-10; a string where a list belongs
+        → its lines; unknown keys dropped), or None if there is no JSON
+        object or it still does not validate.
+        """
+        candidate = _extract_json(raw)
+        try:
+            data = json.loads(candidate) if candidate else None
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        cleaned = {}
+        for name, field in cls.model_fields.items():
+            value = data.get(name)
+            if value is None:
+                continue
+            if name == "score":
+                value = _coerce_score(value)
+            elif name == "decision" and isinstance(value, str):
+                value = value.strip().upper()
+            elif typing.get_origin(field.annotation) is list:
+                value = _items(value) if isinstance(value, str) else [str(v) for v in value if v]
+            elif isinstance(value, list):
+                value = "\n".join(str(v) for v in value)
+            cleaned[name] = value
+        try:
+            return cls.model_validate(cleaned)
+        except ValidationError as e:
+            logger.warning(f"{cls.__name__}: JSON output invalid even after coercion: {e}")
+            return None
+
+    @classmethod
+    def from_output(cls, raw: str):
+        parsed = cls.from_json(raw)
+        if parsed is not None:
+            return parsed
+        if _extract_json(raw) is not None:
+            parsed = cls.from_lenient_json(raw)
+            if parsed is not None:
+                logger.warning(f"{cls.__name__}: JSON output failed validation; parsed leniently")
+                return parsed
+        logger.warning(f"{cls.__name__}: no usable JSON in the output; falling back to the text format")
+        return cls.from_text(raw)
+
+    @classmethod
+    @abc.abstractmethod
+    def from_text(cls, raw: str):
+        """Parse the legacy plain-text format (output with no usable JSON)."""
+
+    def to_json(self) -> str:
+        return json.dumps(self.model_dump(), indent=2)
+
+
+# ── Verdicts ────────────────────────────────────────────────────────
+
+
+class RoundVerdict(StructuredOutput):
+    decision: str
+    score: Optional[float] = Field(None, ge=0, le=10, description="Score from 0 to 10")
+    strengths: List[str] = Field(default_factory=list, description="Key strengths")
+    weaknesses: List[str] = Field(default_factory=list, description="Key weaknesses")
+    reasoning: str = Field("", description="Detailed explanation of the decision")
+
+    DECISIONS: ClassVar[tuple] = ("PASS", "BORDERLINE", "FAIL")
+    DEFAULT_DECISION: ClassVar[str] = "BORDERLINE"
+
+    @classmethod
+    def from_text(cls, raw: str):
+        sections = _sections(raw)
+        return cls(
+            decision=_legacy_decision(raw, cls.DECISIONS, cls.DEFAULT_DECISION),
+            score=_legacy_score(raw),
+            strengths=_items(sections.get("strengths", "")),
+            weaknesses=_items(sections.get("weaknesses", "")),
+            reasoning=sections.get("reasoning") or raw.strip(),
+        )
+
+    def render_body(self) -> str:
+        score = f"{self.score:g}" if self.score is not None else "N/A"
+        return (
+            f"Decision: {self.decision}\n"
+            f"Score: {score} / 10\n\n"
+            f"Strengths:\n{_bullets(self.strengths)}\n\n"
+            f"Weaknesses:\n{_bullets(self.weaknesses)}\n\n"
+            f"Reasoning: {self.reasoning}"
+        )
+
+
+class ScreeningVerdict(RoundVerdict):
+    """Round 1 — Screening."""
+
+    decision: Literal["PASS", "BORDERLINE", "FAIL"]
+    recommended_questions: List[str] = Field(
+        default_factory=list, description="2-3 technical questions for the next round"
+    )
+
+    @classmethod
+    def from_text(cls, raw: str):
+        verdict = super().from_text(raw)
+        for name, body in _sections(raw).items():
+            if name.startswith("recommended questions"):
+                verdict.recommended_questions = _items(body)
+        return verdict
+
+    def render(self, role: str) -> str:
+        text = f"ROUND 1 — SCREENING (Role: {role})\n\n{self.render_body()}"
+        if self.recommended_questions:
+            text += (
+                "\n\nRecommended Questions for Next Round:\n"
+                f"{_numbered(self.recommended_questions)}"
+            )
+        return text
+
+
+class TechnicalVerdict(RoundVerdict):
+    """Round 2 — Technical evaluation."""
+
+    decision: Literal["PASS", "FAIL"]
+
+    DECISIONS: ClassVar[tuple] = ("PASS", "FAIL")
+    # Round 2 has no BORDERLINE; an unreadable verdict must not advance
+    DEFAULT_DECISION: ClassVar[str] = "FAIL"
+
+    def render(self) -> str:
+        return f"ROUND 2 — TECHNICAL\n\n{self.render_body()}"
+
+
+class FusedTechnicalVerdict(TechnicalVerdict):
+    """Round 2 verdict with the Round 3 scenario written in the same call (FUSED_TRANSITIONS)."""
+
+    scenario_question: Optional[str] = Field(
+        None, description="Round 3 scenario question if the decision is PASS"
+    )
+
+    def verdict(self) -> TechnicalVerdict:
+        """The plain Round 2 verdict, as stored in decision memory."""
+        return TechnicalVerdict(**self.model_dump(exclude={"scenario_question"}))
+
+
+class QuestionGrade(StructuredOutput):
+    """Round 2 — one answer graded on its own (TECHNICAL_EVALUATION=per_question)."""
+
+    score: Optional[float] = Field(None, ge=0, le=10, description="Score from 0 to 10")
+    strengths: List[str] = Field(default_factory=list, description="Strengths of this answer")
+    weaknesses: List[str] = Field(default_factory=list, description="Weaknesses of this answer")
+    reasoning: str = Field("", description="Evaluation of this answer")
+
+    @classmethod
+    def from_text(cls, raw: str):
+        sections = _sections(raw)
+        return cls(
+            score=_legacy_score(raw),
+            strengths=_items(sections.get("strengths", "")),
+            weaknesses=_items(sections.get("weaknesses", "")),
+            reasoning=sections.get("reasoning") or raw.strip(),
+        )
+
+
+class ScenarioVerdict(RoundVerdict):
+    """Round 3 — Scenario evaluation."""
+
+    decision: Literal["PASS", "BORDERLINE", "FAIL"]
+
+    def render(self) -> str:
+        return f"ROUND 3 — SCENARIO\n\n{self.render_body()}"
+
+
+class HiringDecision(StructuredOutput):
+    """Final — Hiring Committee."""
+
+    decision: Literal["HIRE", "HOLD", "REJECT"]
+    round_summaries: List[str] = Field(
+        default_factory=list,
+        description='One line per round, e.g. "Round 1 (Screening): PASS — note"',
+    )
+    overall_assessment: str = Field("", description="Detailed rationale for the decision")
+    recommendation: str = Field("", description="Final recommendation with any conditions")
+
+    @classmethod
+    def from_text(cls, raw: str):
+        sections = _sections(raw)
+        return cls(
+            decision=_legacy_decision(raw, ("HIRE", "HOLD", "REJECT"), "HOLD"),
+            round_summaries=_items(sections.get("summary", "")),
+            overall_assessment=sections.get("overall assessment") or raw.strip(),
+            recommendation=sections.get("recommendation", ""),
+        )
+
+    def render(self) -> str:
+        return (
+            "FINAL HIRING DECISION\n\n"
+            f"Decision: {self.decision}\n\n"
+            f"Summary:\n{_bullets(self.round_summaries)}\n\n"
+            f"Overall Assessment: {self.overall_assessment}\n\n"
+            f"Recommendation: {self.recommendation}"
+        )
+
+
+# ── Questions ───────────────────────────────────────────────────────
+
+
+class TechnicalQuestions(StructuredOutput):
+    """Round 2 — generated questions."""
+
+    questions: List[str] = Field(description="2-3 targeted technical questions")
+
+    @classmethod
+    def from_text(cls, raw: str):
+        return cls(questions=[raw.strip()])
+
+    def render(self) -> str:
+        if len(self.questions) == 1:
+            return self.questions[0]
+        return f"TECHNICAL INTERVIEW QUESTIONS\n\n{_numbered(self.questions)}"
+
+
+class ScenarioQuestion(StructuredOutput):
+    """Round 3 — generated scenario."""
+
+    question: str = Field(description="One realistic production scenario or behavioral question")
+
+    @classmethod
+    def from_text(cls, raw: str):
+        return cls(question=re.sub(r"^\s*SCENARIO QUESTION\s*", "", raw).strip())
+
+    def render(self) -> str:
+        return f"SCENARIO QUESTION\n\n{self.question}"
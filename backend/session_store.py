@@ -0,0 +1,267 @@
+"""
+Session Store — pluggable backends for SESSION CONTEXT.
+
+Every interview is keyed by an interview ID. The store only knows how to
+save, load and delete a JSON-serialisable state dict for that ID; the
+shape of the state itself lives in state.py.
+
+Optimistic concurrency: a state carries a "version" number. set() with
+expected_version is a compare-and-set — it raises VersionConflict if the
+stored state's version has moved on, so two workers handling the same
+interview can never both advance it.
+
+Backends:
+  - memory — in-process dict with TTL eviction (single worker)
+  - sqlite — one SQLite file shared by every worker on the host
+  - redis  — any Redis-compatible client (shared across hosts)
+"""
+
+import os
+import abc
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(6 * 60 * 60)))
+SESSION_DB_PATH = os.getenv(
+    "SESSION_DB_PATH", os.path.join(os.path.dirname(__file__), "data", "sessions.db")
+)
+
+
+class VersionConflict(Exception):
+    """A versioned save lost the race: the stored state changed since it was read."""
+
+
+def _check_version(interview_id: str, stored: Optional[int], expected: Optional[int]) -> None:
+    """
+    Raise VersionConflict unless a save expecting this version may overwrite
+    stored. A state that is gone (expired, or deleted by a reset) is not at
+    the expected version either — it must not be recreated by a stale save.
+    """
+    if expected is None:
+        return
+    if stored is None:
+        raise VersionConflict(
+            f"Interview {interview_id} is no longer stored, expected version {expected}"
+        )
+    if stored != expected:
+        raise VersionConflict(
+            f"Interview {interview_id} is at version {stored}, expected {expected}"
+        )
+
+
+class SessionBackend(abc.ABC):
+    """Interface every session backend implements."""
+
+    @abc.abstractmethod
+    def get(self, interview_id: str) -> Optional[dict]:
+        """The stored state, or None if unknown / expired."""
+
+    @abc.abstractmethod
+    def set(self, interview_id: str, state: dict, expected_version: Optional[int] = None) -> None:
+        """Store state; with expected_version, only if the stored version still matches."""
+
+    @abc.abstractmethod
+    def delete(self, interview_id: str) -> None:
+        """Forget the state (a no-op if there is none)."""
+
+
+class InMemorySessionBackend(SessionBackend):
+    """
+    In-process session store with sliding TTL eviction.
+    States are deep-copied through JSON so callers never share references.
+    """
+
+    def __init__(self, ttl_seconds: int = SESSION_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._data: dict = {}
+        self._lock = threading.Lock()
+
+    def _evict_expired(self, now: float) -> None:
+        expired = [k for k, (exp, _, _) in self._data.items() if exp <= now]
+        for key in expired:
+            del self._data[key]
+
+    def get(self, interview_id: str) -> Optional[dict]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(interview_id)
+            if entry is None:
+                return None
+            expires_at, version, payload = entry
+            if expires_at <= now:
+                del self._data[interview_id]
+                return None
+            self._data[interview_id] = (now + self.ttl_seconds, version, payload)
+        return json.loads(payload)
+
+    def set(self, interview_id: str, state: dict, expected_version: Optional[int] = None) -> None:
+        payload = json.dumps(state)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            entry = self._data.get(interview_id)
+            _check_version(interview_id, entry[1] if entry else None, expected_version)
+            self._data[interview_id] = (now + self.ttl_seconds, state.get("version"), payload)
+
+    def delete(self, interview_id: str) -> None:
+        with self._lock:
+            self._data.pop(interview_id, None)
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """
+    Session store in one SQLite file, shared by every worker process on the
+    host (no Redis needed). Versioned saves are a conditional UPDATE.
+    """
+
+    def __init__(self, path: str = SESSION_DB_PATH, ttl_seconds: int = SESSION_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._initialised = False
+
+    @contextmanager
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            if not self._initialised:
+                conn.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS sessions (
+                        interview_id TEXT PRIMARY KEY,
+                        version INTEGER,
+                        state TEXT NOT NULL,
+                        expires_at REAL NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_sessions_expiry ON sessions (expires_at);
+                    """
+                )
+                self._initialised = True
+            yield conn
+        finally:
+            conn.close()
+
+    def get(self, interview_id: str) -> Optional[dict]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT state FROM sessions WHERE interview_id = ? AND expires_at > ?",
+                (interview_id, now),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE sessions SET expires_at = ? WHERE interview_id = ?",
+                (now + self.ttl_seconds, interview_id),
+            )
+        return json.loads(row["state"])
+
+    def set(self, interview_id: str, state: dict, expected_version: Optional[int] = None) -> None:
+        now = time.time()
+        payload = json.dumps(state)
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+                row = conn.execute(
+                    "SELECT version FROM sessions WHERE interview_id = ?", (interview_id,)
+                ).fetchone()
+                _check_version(interview_id, row["version"] if row else None, expected_version)
+                conn.execute(
+                    "INSERT OR REPLACE INTO sessions (interview_id, version, state, expires_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (interview_id, state.get("version"), payload, now + self.ttl_seconds),
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def delete(self, interview_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sessions WHERE interview_id = ?", (interview_id,))
+
+
+def _is_watch_error(error: BaseException) -> bool:
+    """
+    Whether error is a client's aborted WATCH transaction: redis-py's
+    WatchError, or the same-named exception of a compatible client / fake
+    (matched by name so the redis package stays optional).
+    """
+    return any(cls.__name__ == "WatchError" for cls in type(error).__mro__)
+
+
+class RedisSessionBackend(SessionBackend):
+    """
+    Redis-backed session store. Accepts any client exposing
+    get / set(ex=) / expire / delete, so a local fake works in tests;
+    versioned saves also need pipeline() with WATCH / MULTI, aborting
+    with an exception named WatchError when the key changed.
+    """
+
+    KEY_PREFIX = "interview:"
+
+    def __init__(self, client=None, ttl_seconds: int = SESSION_TTL_SECONDS):
+        if client is None:
+            import redis  # optional dependency — only needed for this backend
+
+            client = redis.Redis.from_url(
+                os.getenv("REDIS_URL", "redis://localhost:6379/0")
+            )
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, interview_id: str) -> str:
+        return f"{self.KEY_PREFIX}{interview_id}"
+
+    def get(self, interview_id: str) -> Optional[dict]:
+        key = self._key(interview_id)
+        payload = self.client.get(key)
+        if payload is None:
+            return None
+        self.client.expire(key, self.ttl_seconds)
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8")
+        return json.loads(payload)
+
+    def set(self, interview_id: str, state: dict, expected_version: Optional[int] = None) -> None:
+        key = self._key(interview_id)
+        if expected_version is None:
+            self.client.set(key, json.dumps(state), ex=self.ttl_seconds)
+            return
+
+        with self.client.pipeline() as pipe:
+            try:
+                # WATCH aborts the MULTI below if another worker writes the key first
+                pipe.watch(key)
+                current = pipe.get(key)
+                stored = json.loads(current).get("version") if current is not None else None
+                _check_version(interview_id, stored, expected_version)
+                pipe.multi()
+                pipe.set(key, json.dumps(state), ex=self.ttl_seconds)
+                pipe.execute()
+            except Exception as e:
+                if _is_watch_error(e):
+                    raise VersionConflict(f"Interview {interview_id} changed during save")
+                raise
+
+    def delete(self, interview_id: str) -> None:
+        self.client.delete(self._key(interview_id))
+
+
+def create_backend(name: Optional[str] = None) -> SessionBackend:
+    """Build the backend selected by SESSION_BACKEND (memory | sqlite | redis)."""
+    name = (name or os.getenv("SESSION_BACKEND", "memory")).lower()
+    if name == "memory":
+        return InMemorySessionBackend()
+    if name == "sqlite":
+        return SQLiteSessionBackend()
+    if name == "redis":
+        return RedisSessionBackend()
+    raise ValueError(f"Unknown SESSION_BACKEND: {name}")
@@ -1,16 +1,23 @@
 """
-SESSION CONTEXT — In-memory interview state.
+SESSION CONTEXT — Per-interview session state.
 
 This is short-lived, mutable, session-scoped state that tracks
-the current interview progress. In production this would be
-backed by Redis or a session store; in-memory is correct for
-this scope.
+interview progress. Each interview is keyed by an interview ID
+returned from /start, and stored through a pluggable backend
+(see session_store.py) so concurrent interviews never clobber
+each other. With a shared backend (sqlite / redis) API workers keep
+no session state of their own, so any worker can serve any request.
+
+Every save bumps the state's "version" and only succeeds if the stored
+version is still the one that was read (VersionConflict otherwise).
 """
 
-import os
-import shutil
+import uuid
+from typing import Optional
 
-VERDICTS_DIR = os.path.join(os.path.dirname(__file__), "verdicts")
+from decision_store import check_interview_id
+from instrumentation import io_timer
+from session_store import SessionBackend, create_backend
 
 
 # Available interview roles
@@ -23,9 +30,11 @@ AVAILABLE_ROLES = [
 
 def _empty_state() -> dict:
     return {
+        "version": 0,  # bumped on every save (optimistic concurrency)
         "round": 1,
         "status": "ONGOING",  # ONGOING | REJECTED | COMPLETE
         "resume": "",
+        "resume_profile": "",  # compacted resume for rounds 2+ (context_compaction.py)
         "role": "",
         "answers": {
             "round1": [],
@@ -43,35 +52,70 @@ def _empty_state() -> dict:
             "round3": None,
         },
         "final_decision": None,
+        "timings": {},  # per-step time / token breakdown (instrumentation.py)
+        "claim": None,  # {"step", "expires_at"} while a round is being evaluated (pipeline.py)
     }
 
 
-# Global in-memory state for the current interview session
-interview_state: dict = _empty_state()
+# Session backend shared by every interview in this process
+_backend: SessionBackend = create_backend()
 
 
-def reset_state() -> None:
-    """Reset session context and clear verdict files for a new interview."""
-    global interview_state
-    interview_state = _empty_state()
+def set_backend(backend: SessionBackend) -> None:
+    """Swap the session backend (e.g. for a Redis fake in tests)."""
+    global _backend
+    _backend = backend
 
-    # Clear and recreate verdicts directory (DECISION MEMORY)
-    if os.path.exists(VERDICTS_DIR):
-        shutil.rmtree(VERDICTS_DIR)
-    os.makedirs(VERDICTS_DIR, exist_ok=True)
 
-
-def get_state() -> dict:
-    """Return the current interview state."""
-    return interview_state
-
-
-def update_state(**kwargs) -> None:
-    """Update specific keys in the interview state."""
+def create_state(**kwargs) -> str:
+    """Create a fresh interview session and return its interview ID."""
+    interview_id = uuid.uuid4().hex
+    state = _empty_state()
     for key, value in kwargs.items():
-        if key in interview_state:
-            interview_state[key] = value
-
-
-# Ensure verdicts directory exists on import
-os.makedirs(VERDICTS_DIR, exist_ok=True)
+        if key in state:
+            state[key] = value
+    _backend.set(interview_id, state)
+    return interview_id
+
+
+def get_state(interview_id: str) -> Optional[dict]:
+    """Return the interview state, or None if unknown / expired."""
+    with io_timer("session_load"):
+        return _backend.get(interview_id)
+
+
+def save_state(interview_id: str, state: dict) -> None:
+    """
+    Persist a full interview state, as the next version of the one it was
+    read as. Raises VersionConflict (state's version left as it was) if
+    another request saved this interview in between.
+    """
+    expected = state.get("version", 0)
+    state["version"] = expected + 1
+    try:
+        with io_timer("session_save"):
+            _backend.set(interview_id, state, expected_version=expected)
+    except BaseException:
+        state["version"] = expected
+        raise
+
+
+def update_state(interview_id: str, **kwargs) -> dict:
+    """Update specific keys in the interview state and return it."""
+    state = _backend.get(interview_id)
+    if state is None:
+        raise KeyError(interview_id)
+    for key, value in kwargs.items():
+        if key in state:
+            state[key] = value
+    save_state(interview_id, state)
+    return state
+
+
+def reset_state(interview_id: str) -> None:
+    """
+    Drop one interview's session context.
+    Its verdicts stay in DECISION MEMORY, which is append-only.
+    """
+    check_interview_id(interview_id)
+    _backend.delete(interview_id)
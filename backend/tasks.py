@@ -2,40 +2,52 @@
 CrewAI Task Definitions — one task per interview round.
 
 Tasks encode what each agent must produce and the format of their output.
+Every task returns JSON matching a model in schemas.py (output_pydantic);
+crew_runner.py renders it back into the human-readable verdict format.
 Context is injected at runtime by crew_runner.py (AGENT CONTEXT principle).
+Descriptions are laid out by prompts.py so an agent's calls share a
+cacheable prefix: its rubric, then the candidate's context, then the
+per-call request.
 """
 
-from crewai import Task, Agent
+from typing import TYPE_CHECKING
+
+from prompts import (
+    build_prompt,
+    SCREENING_RUBRIC,
+    TECHNICAL_RUBRIC,
+    SCENARIO_RUBRIC,
+    HIRING_RUBRIC,
+)
+from schemas import (
+    ScreeningVerdict,
+    TechnicalQuestions,
+    TechnicalVerdict,
+    ScenarioQuestion,
+    ScenarioVerdict,
+    FusedTechnicalVerdict,
+    QuestionGrade,
+    HiringDecision,
+)
+
+if TYPE_CHECKING:  # CrewAI is imported on first use (warmup.py)
+    from crewai import Agent, Task
 
 
 # ── Round 1: Screening ──────────────────────────────────────────────
 
-def create_screening_task(agent: Agent, resume: str, role: str) -> Task:
+def create_screening_task(agent: "Agent", resume: str, role: str) -> "Task":
     """
     Screening task — agent evaluates resume against a specific role.
     """
+    from crewai import Task
+
     return Task(
-        description=(
-            f"You are conducting a resume screening for the **{role}** role.\n\n"
-            f"## TARGET ROLE\n{role}\n\n"
-            f"## CANDIDATE RESUME\n{resume}\n\n"
-            f"## YOUR TASK\n"
-            f"1. Evaluate the resume specifically for the **{role}** role — assess role fit, relevant skills, and experience.\n"
-            f"2. Identify strengths and weaknesses relative to the {role} position.\n"
-            f"3. Decide: PASS, BORDERLINE, or FAIL.\n"
-            f"4. Assign a score from 0 to 10.\n"
-            f"5. Generate 2-3 technical questions you would recommend for the next round, tailored to the {role} role.\n\n"
-            f"## REQUIRED OUTPUT FORMAT (follow exactly)\n"
-            f"ROUND 1 — SCREENING (Role: {role})\n\n"
-            f"Decision: [PASS|BORDERLINE|FAIL]\n"
-            f"Score: [X] / 10\n\n"
-            f"Strengths: [key strengths for {role}]\n"
-            f"Weaknesses: [key weaknesses for {role}]\n\n"
-            f"Reasoning: [detailed explanation of fit for {role}]\n\n"
-            f"Recommended Questions for Next Round:\n"
-            f"1. [question]\n"
-            f"2. [question]\n"
-            f"3. [question]"
+        description=build_prompt(
+            SCREENING_RUBRIC,
+            stable=[("TARGET ROLE", role), ("CANDIDATE RESUME", resume)],
+            request=f"Screen this resume for the **{role}** role.",
+            output_format="SCREENING VERDICT",
         ),
         expected_output=(
             "A structured verdict with Decision (PASS/BORDERLINE/FAIL), "
@@ -43,189 +55,210 @@ def create_screening_task(agent: Agent, resume: str, role: str) -> Task:
             "Recommended Questions for the next round."
         ),
         agent=agent,
+        output_pydantic=ScreeningVerdict,
     )
 
 
 # ── Round 2: Technical ──────────────────────────────────────────────
 
+def _technical_context(resume: str, round1_verdict: str) -> list:
+    return [("CANDIDATE RESUME", resume), ("SCREENING VERDICT (Round 1)", round1_verdict)]
+
+
 def create_technical_question_task(
-    agent: Agent,
+    agent: "Agent",
     resume: str,
     round1_verdict: str,
-) -> Task:
+) -> "Task":
     """
     Technical round — generate questions based on resume + screening verdict.
     """
+    from crewai import Task
+
     return Task(
-        description=(
-            f"You are conducting a technical interview.\n\n"
-            f"## CANDIDATE RESUME\n{resume}\n\n"
-            f"## SCREENING VERDICT (Round 1)\n{round1_verdict}\n\n"
-            f"## YOUR TASK\n"
-            f"Based on the resume and the screening verdict, generate exactly "
-            f"2-3 targeted technical questions. The questions should probe the "
-            f"candidate's claimed skills and address any weaknesses noted in "
-            f"the screening.\n\n"
-            f"## REQUIRED OUTPUT FORMAT\n"
-            f"TECHNICAL INTERVIEW QUESTIONS\n\n"
-            f"1. [question]\n"
-            f"2. [question]\n"
-            f"3. [question]"
+        description=build_prompt(
+            TECHNICAL_RUBRIC,
+            stable=_technical_context(resume, round1_verdict),
+            request="Write the technical questions for this candidate.",
+            output_format="TECHNICAL QUESTIONS",
         ),
         expected_output="2-3 targeted technical questions.",
         agent=agent,
+        output_pydantic=TechnicalQuestions,
     )
 
 
 def create_technical_evaluation_task(
-    agent: Agent,
+    agent: "Agent",
     resume: str,
     round1_verdict: str,
     questions: str,
     answer: str,
-) -> Task:
+    with_scenario_question: bool = False,
+) -> "Task":
     """
     Technical round — evaluate candidate's answers.
+    with_scenario_question also asks for the Round 3 scenario in the same
+    call (FUSED_TRANSITIONS), saving the separate question round-trip.
     """
+    from crewai import Task
+
+    if with_scenario_question:
+        request = "Evaluate the candidate's answers, and write the next round's scenario."
+        output_format = "TECHNICAL VERDICT WITH SCENARIO"
+    else:
+        request = "Evaluate the candidate's answers."
+        output_format = "TECHNICAL VERDICT"
     return Task(
-        description=(
-            f"You are evaluating a candidate's technical interview answers.\n\n"
-            f"## CANDIDATE RESUME\n{resume}\n\n"
-            f"## SCREENING VERDICT (Round 1)\n{round1_verdict}\n\n"
-            f"## TECHNICAL QUESTIONS ASKED\n{questions}\n\n"
-            f"## CANDIDATE'S ANSWERS\n{answer}\n\n"
-            f"## YOUR TASK\n"
-            f"1. Evaluate each answer for correctness, depth, and clarity.\n"
-            f"2. Identify strengths and weaknesses.\n"
-            f"3. Decide: PASS or FAIL.\n"
-            f"4. Assign a score from 0 to 10.\n\n"
-            f"## REQUIRED OUTPUT FORMAT (follow exactly)\n"
-            f"ROUND 2 — TECHNICAL\n\n"
-            f"Decision: [PASS|FAIL]\n"
-            f"Score: [X] / 10\n\n"
-            f"Strengths: [key strengths]\n"
-            f"Weaknesses: [key weaknesses]\n\n"
-            f"Reasoning: [detailed evaluation of answers]"
+        description=build_prompt(
+            TECHNICAL_RUBRIC,
+            stable=_technical_context(resume, round1_verdict),
+            request=request,
+            output_format=output_format,
+            delta=[("TECHNICAL QUESTIONS ASKED", questions), ("CANDIDATE'S ANSWERS", answer)],
         ),
         expected_output=(
             "A structured verdict with Decision (PASS/FAIL), "
             "Score (0-10), Strengths, Weaknesses, and Reasoning."
         ),
         agent=agent,
+        output_pydantic=FusedTechnicalVerdict if with_scenario_question else TechnicalVerdict,
+    )
+
+
+def create_question_grade_task(
+    agent: "Agent",
+    resume: str,
+    round1_verdict: str,
+    question: str,
+    answer: str,
+    number: int,
+    total: int,
+) -> "Task":
+    """
+    Technical round — grade the answer to one question
+    (TECHNICAL_EVALUATION=per_question, see per_question.py).
+    """
+    from crewai import Task
+
+    return Task(
+        description=build_prompt(
+            TECHNICAL_RUBRIC,
+            stable=_technical_context(resume, round1_verdict),
+            request=f"Grade the candidate's answer to technical question {number} of {total}.",
+            output_format="QUESTION GRADE",
+            delta=[("TECHNICAL QUESTION", question), ("CANDIDATE'S ANSWER", answer)],
+        ),
+        expected_output="A score (0-10) for this answer, with Strengths, Weaknesses, and Reasoning.",
+        agent=agent,
+        output_pydantic=QuestionGrade,
     )
 
 
 # ── Round 3: Scenario ───────────────────────────────────────────────
 
+def _scenario_context(resume: str, round1_verdict: str, round2_verdict: str) -> list:
+    return [
+        ("CANDIDATE RESUME", resume),
+        ("SCREENING VERDICT (Round 1)", round1_verdict),
+        ("TECHNICAL VERDICT (Round 2)", round2_verdict),
+    ]
+
+
 def create_scenario_question_task(
-    agent: Agent,
+    agent: "Agent",
     resume: str,
     round1_verdict: str,
     round2_verdict: str,
-) -> Task:
+) -> "Task":
     """
     Scenario round — generate a realistic production scenario question.
     """
+    from crewai import Task
+
     return Task(
-        description=(
-            f"You are designing a scenario-based interview question.\n\n"
-            f"## CANDIDATE RESUME\n{resume}\n\n"
-            f"## SCREENING VERDICT (Round 1)\n{round1_verdict}\n\n"
-            f"## TECHNICAL VERDICT (Round 2)\n{round2_verdict}\n\n"
-            f"## YOUR TASK\n"
-            f"Based on the candidate's background and previous round performance, "
-            f"create ONE realistic production scenario or behavioral question that "
-            f"tests decision-making, trade-off analysis, and practical judgment.\n\n"
-            f"The scenario should be specific to their skill set and level.\n\n"
-            f"## REQUIRED OUTPUT FORMAT\n"
-            f"SCENARIO QUESTION\n\n"
-            f"[Your detailed scenario/question here]"
+        description=build_prompt(
+            SCENARIO_RUBRIC,
+            stable=_scenario_context(resume, round1_verdict, round2_verdict),
+            request="Write the scenario question for this candidate.",
+            output_format="SCENARIO QUESTION",
         ),
         expected_output="One realistic production scenario or behavioral question.",
         agent=agent,
+        output_pydantic=ScenarioQuestion,
     )
 
 
 def create_scenario_evaluation_task(
-    agent: Agent,
+    agent: "Agent",
     resume: str,
     round1_verdict: str,
     round2_verdict: str,
     question: str,
     answer: str,
-) -> Task:
+) -> "Task":
     """
     Scenario round — evaluate candidate's response.
     """
+    from crewai import Task
+
     return Task(
-        description=(
-            f"You are evaluating a candidate's scenario interview response.\n\n"
-            f"## CANDIDATE RESUME\n{resume}\n\n"
-            f"## SCREENING VERDICT (Round 1)\n{round1_verdict}\n\n"
-            f"## TECHNICAL VERDICT (Round 2)\n{round2_verdict}\n\n"
-            f"## SCENARIO QUESTION ASKED\n{question}\n\n"
-            f"## CANDIDATE'S RESPONSE\n{answer}\n\n"
-            f"## YOUR TASK\n"
-            f"1. Evaluate the response for decision-making quality, trade-off "
-            f"awareness, communication clarity, and practical judgment.\n"
-            f"2. Identify strengths and weaknesses.\n"
-            f"3. Decide: PASS, BORDERLINE, or FAIL.\n"
-            f"4. Assign a score from 0 to 10.\n\n"
-            f"## REQUIRED OUTPUT FORMAT (follow exactly)\n"
-            f"ROUND 3 — SCENARIO\n\n"
-            f"Decision: [PASS|BORDERLINE|FAIL]\n"
-            f"Score: [X] / 10\n\n"
-            f"Strengths: [key strengths]\n"
-            f"Weaknesses: [key weaknesses]\n\n"
-            f"Reasoning: [detailed evaluation]"
+        description=build_prompt(
+            SCENARIO_RUBRIC,
+            stable=_scenario_context(resume, round1_verdict, round2_verdict),
+            request="Evaluate the candidate's response.",
+            output_format="SCENARIO VERDICT",
+            delta=[("SCENARIO QUESTION ASKED", question), ("CANDIDATE'S RESPONSE", answer)],
         ),
         expected_output=(
             "A structured verdict with Decision (PASS/BORDERLINE/FAIL), "
             "Score (0-10), Strengths, Weaknesses, and Reasoning."
         ),
         agent=agent,
+        output_pydantic=ScenarioVerdict,
     )
 
 
 # ── Final: Hiring Committee ─────────────────────────────────────────
 
 def create_hiring_decision_task(
-    agent: Agent,
+    agent: "Agent",
     round1_verdict: str,
     round2_verdict: str,
     round3_verdict: str,
-) -> Task:
+    member: int = 1,
+    members: int = 1,
+) -> "Task":
     """
     Hiring Committee — makes final decision based ONLY on verdicts.
     Does NOT receive the resume or raw answers.
+    member / members numbers one sample of a committee ensemble
+    (COMMITTEE_SAMPLES, see committee.py).
     """
+    from crewai import Task
+
+    request = "Make the final hiring decision."
+    if members > 1:
+        request = (
+            f"Make the final hiring decision as committee member {member} of {members}, "
+            "independently of the other members."
+        )
+
     return Task(
-        description=(
-            f"You are the hiring committee chair making the final hiring decision.\n\n"
-            f"## IMPORTANT\n"
-            f"You must base your decision ONLY on the interview verdicts below. "
-            f"You do NOT have access to the candidate's resume or raw answers.\n\n"
-            f"## ROUND 1 — SCREENING VERDICT\n{round1_verdict}\n\n"
-            f"## ROUND 2 — TECHNICAL VERDICT\n{round2_verdict}\n\n"
-            f"## ROUND 3 — SCENARIO VERDICT\n{round3_verdict}\n\n"
-            f"## YOUR TASK\n"
-            f"1. Synthesize all three round verdicts.\n"
-            f"2. Identify patterns across feedback.\n"
-            f"3. Make a final decision: HIRE, HOLD, or REJECT.\n"
-            f"4. Provide detailed rationale.\n\n"
-            f"## REQUIRED OUTPUT FORMAT (follow exactly)\n"
-            f"FINAL HIRING DECISION\n\n"
-            f"Decision: [HIRE|HOLD|REJECT]\n\n"
-            f"Summary:\n"
-            f"- Round 1 (Screening): [PASS/BORDERLINE/FAIL] — [brief note]\n"
-            f"- Round 2 (Technical): [PASS/FAIL] — [brief note]\n"
-            f"- Round 3 (Scenario): [PASS/BORDERLINE/FAIL] — [brief note]\n\n"
-            f"Overall Assessment: [detailed rationale for final decision]\n\n"
-            f"Recommendation: [final recommendation with any conditions or notes]"
+        description=build_prompt(
+            HIRING_RUBRIC,
+            stable=[
+                ("ROUND 1 — SCREENING VERDICT", round1_verdict),
+                ("ROUND 2 — TECHNICAL VERDICT", round2_verdict),
+                ("ROUND 3 — SCENARIO VERDICT", round3_verdict),
+            ],
+            request=request,
+            output_format="HIRING DECISION",
         ),
         expected_output=(
             "A final hiring decision (HIRE/HOLD/REJECT) with summary of all "
             "rounds, overall assessment, and recommendation."
         ),
         agent=agent,
+        output_pydantic=HiringDecision,
     )
@@ -0,0 +1,72 @@
+"""Committee Ballot: early stopping, ties and agreement."""
+
+from committee import TIE_DECISION, Ballot, sampling
+
+
+def ballot(samples, *decisions, failed=0):
+    result = Ballot(samples)
+    for decision in decisions:
+        result.add(decision)
+    for _ in range(failed):
+        result.abstain()
+    return result
+
+
+def test_not_settled_while_the_outcome_can_change():
+    assert not ballot(5).settled()
+    assert not ballot(5, "HIRE", "HIRE").settled()  # 3 outstanding could still outvote
+    assert not ballot(5, "HIRE", "HIRE", "REJECT").settled()
+
+
+def test_settles_early_once_the_leader_cannot_be_caught():
+    votes = ballot(5, "HIRE", "HIRE", "HIRE")
+    assert votes.outstanding == 2
+    assert votes.settled()
+    assert votes.winner() == "HIRE"
+
+
+def test_abstentions_count_towards_settling():
+    votes = ballot(3, "REJECT", failed=1)
+    assert votes.outstanding == 1
+    assert not votes.settled()  # one more vote could tie it
+    votes.abstain()
+    assert votes.settled()
+    assert votes.winner() == "REJECT"
+    assert votes.summary(cancelled=0)["failed"] == 2
+
+
+def test_tie_goes_to_hold():
+    votes = ballot(4, "HIRE", "HIRE", "REJECT", "REJECT")
+    assert votes.settled()
+    assert votes.winner() == TIE_DECISION == "HOLD"
+    assert votes.agreement() == 0.0  # no vote went to HOLD
+
+
+def test_three_way_split_is_a_tie():
+    assert ballot(3, "HIRE", "HOLD", "REJECT").winner() == TIE_DECISION
+
+
+def test_no_votes_has_no_winner():
+    votes = ballot(2, failed=2)
+    assert votes.settled()
+    assert votes.winner() is None
+    assert votes.agreement() == 0.0
+
+
+def test_agreement_and_render():
+    votes = ballot(5, "HIRE", "HIRE", "HIRE", "REJECT")
+    assert votes.agreement() == 0.75
+    assert votes.render() == "Committee Vote: HIRE 3, REJECT 1 of 5 samples (agreement 75%)"
+    assert votes.summary(cancelled=1) == {
+        "samples": 5,
+        "votes": {"HIRE": 3, "HOLD": 0, "REJECT": 1},
+        "votes_cast": 4,
+        "failed": 0,
+        "cancelled": 1,
+        "agreement": 0.75,
+    }
+
+
+def test_each_member_samples_with_its_own_seed():
+    assert sampling(1)["seed"] != sampling(2)["seed"]
+    assert sampling(1)["temperature"] == sampling(2)["temperature"]
@@ -0,0 +1,138 @@
+"""SingleFlight coalescing / replay and request identities."""
+
+import asyncio
+
+import pytest
+
+from idempotency import IdempotencyConflict, SingleFlight, fingerprint, request_key
+
+
+class Step:
+    """A step that counts its executions and finishes when released."""
+
+    def __init__(self, result="done", error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.release = None
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_concurrent_duplicates_share_one_execution():
+    async def scenario():
+        flights, step = SingleFlight(), Step()
+        step.release = asyncio.Event()
+        first = asyncio.ensure_future(flights.run("k", "fp", step))
+        second = asyncio.ensure_future(flights.run("k", "fp", step))
+        await asyncio.sleep(0)
+        step.release.set()
+        return await first, await second, step.calls, flights.stats()
+
+    first, second, calls, stats = run(scenario())
+    assert first == ("done", "executed")
+    assert second == ("done", "coalesced")
+    assert calls == 1
+    assert stats["in_flight"] == 0 and stats["stored"] == 1
+
+
+def test_finished_request_is_replayed():
+    async def scenario():
+        flights, step = SingleFlight(), Step()
+        step.release = asyncio.Event()
+        step.release.set()
+        await flights.run("k", "fp", step)
+        return await flights.run("k", "fp", step), step.calls
+
+    assert run(scenario()) == (("done", "replayed"), 1)
+
+
+def test_replay_false_only_coalesces():
+    async def scenario():
+        flights, step = SingleFlight(), Step()
+        step.release = asyncio.Event()
+        step.release.set()
+        await flights.run("k", "fp", step, replay=False)
+        return await flights.run("k", "fp", step, replay=False), step.calls
+
+    assert run(scenario()) == (("done", "executed"), 2)
+
+
+def test_failures_are_shared_but_not_stored():
+    async def scenario():
+        flights, step = SingleFlight(), Step(error=RuntimeError("provider down"))
+        step.release = asyncio.Event()
+        first = asyncio.ensure_future(flights.run("k", "fp", step))
+        second = asyncio.ensure_future(flights.run("k", "fp", step))
+        await asyncio.sleep(0)
+        step.release.set()
+        outcomes = await asyncio.gather(first, second, return_exceptions=True)
+        step.error = None
+        return outcomes, await flights.run("k", "fp", step), step.calls
+
+    outcomes, retry, calls = run(scenario())
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert retry == ("done", "executed")
+    assert calls == 2
+
+
+def test_key_reused_for_another_request_conflicts():
+    async def scenario():
+        flights, step = SingleFlight(), Step()
+        step.release = asyncio.Event()
+        step.release.set()
+        await flights.run("k", "fp-1", step)
+        with pytest.raises(IdempotencyConflict):
+            await flights.run("k", "fp-2", step)
+        return flights.stats()["conflicts"]
+
+    assert run(scenario()) == 1
+
+
+def test_stored_results_expire_and_are_bounded():
+    async def scenario():
+        flights, step = SingleFlight(ttl_seconds=0, max_entries=1), Step()
+        step.release = asyncio.Event()
+        step.release.set()
+        await flights.run("a", "fp", step)
+        return await flights.run("a", "fp", step)
+
+    assert run(scenario()) == ("done", "executed")
+
+    async def bounded():
+        flights, step = SingleFlight(max_entries=1), Step()
+        step.release = asyncio.Event()
+        step.release.set()
+        await flights.run("a", "fp", step)
+        await flights.run("b", "fp", step)
+        return flights.active("a"), flights.active("b")
+
+    assert run(bounded()) == (False, True)
+
+
+def test_request_key_scopes_client_keys_to_the_endpoint():
+    body = {"interview_id": "i", "answer": "a"}
+    round2 = request_key("/round/2/answer", body, "key-1")
+    round3 = request_key("/round/3/answer", body, "key-1")
+    assert round2[0] != round3[0]
+    assert round2[1] == fingerprint("/round/2/answer", body)
+    assert round2[2] and round3[2]
+
+
+def test_request_key_without_a_client_key():
+    body = {"resume": "r", "role": "Backend Developer"}
+    key, request_fingerprint, replay = request_key("/start", body, None)
+    assert key == f"request:{request_fingerprint}"
+    assert replay is False  # a repeated /start after the first finished is a new interview
+    assert request_key("/round/2/answer", body, None)[2] is True
+    with pytest.raises(ValueError):
+        request_key("/start", body, "x" * 256)
@@ -0,0 +1,138 @@
+"""Token-bucket accounting and rate-limit error classification."""
+
+import pytest
+
+import rate_limiter
+from rate_limiter import (
+    TokenBucketLimiter,
+    backoff_delay,
+    is_rate_limit_error,
+    retry_after_seconds,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limiter.time, "time", clock.time)
+    return clock
+
+
+@pytest.fixture
+def limiter(tmp_path, clock):
+    return TokenBucketLimiter("test-model", rpm=60, tpm=6000, path=str(tmp_path / "ratelimit.db"))
+
+
+def buckets(limiter):
+    """(requests, tokens, blocked_until) as stored, refilled to now."""
+    with limiter._connect() as conn:
+        return limiter._refilled(conn, rate_limiter.time.time())
+
+
+def test_acquire_takes_one_request_and_the_estimate(limiter):
+    assert limiter.try_acquire(1000) == 0
+    requests, tokens, _ = buckets(limiter)
+    assert requests == 59
+    assert tokens == 5000
+
+
+def test_call_waits_for_the_token_deficit(limiter):
+    assert limiter.try_acquire(5000) == 0
+    # 1000 left; 3000 more needed at 6000 tokens / minute
+    assert limiter.try_acquire(4000) == pytest.approx(30.0)
+    _, tokens, _ = buckets(limiter)
+    assert tokens == 1000  # a call that must wait takes nothing
+
+
+def test_buckets_refill_with_time(limiter, clock):
+    assert limiter.try_acquire(6000) == 0
+    clock.now += 30
+    requests, tokens, _ = buckets(limiter)
+    assert tokens == pytest.approx(3000)
+    assert requests == 60  # capped at the RPM limit
+
+
+def test_request_bucket_limits_calls(tmp_path, clock):
+    limiter = TokenBucketLimiter("m", rpm=2, tpm=0, path=str(tmp_path / "r.db"))
+    assert limiter.try_acquire(10) == 0
+    assert limiter.try_acquire(10) == 0
+    assert limiter.try_acquire(10) == pytest.approx(30.0)
+
+
+def test_call_larger_than_the_whole_budget_still_goes_through(limiter):
+    assert limiter.try_acquire(50_000) == 0
+    _, tokens, _ = buckets(limiter)
+    assert tokens == 0
+
+
+def test_settle_refunds_an_overestimate(limiter):
+    limiter.try_acquire(3000)
+    limiter.settle(3000, 1200)
+    _, tokens, _ = buckets(limiter)
+    assert tokens == 4800
+
+
+def test_settle_charges_an_underestimate(limiter):
+    limiter.try_acquire(1000)
+    limiter.settle(1000, 2500)
+    _, tokens, _ = buckets(limiter)
+    assert tokens == 3500
+
+
+def test_settle_never_overfills_and_ignores_unknown_usage(limiter):
+    limiter.try_acquire(100)
+    limiter.settle(100, None)
+    assert buckets(limiter)[1] == 5900
+    limiter.settle(50_000, 1)
+    assert buckets(limiter)[1] == 6000
+
+
+def test_block_for_pauses_every_caller(limiter, clock):
+    limiter.block_for(20)
+    other_worker = TokenBucketLimiter("test-model", rpm=60, tpm=6000, path=limiter.path)
+    assert other_worker.try_acquire(10) == pytest.approx(20.0)
+    clock.now += 20
+    assert other_worker.try_acquire(10) == 0
+
+
+def test_models_have_separate_buckets(limiter):
+    limiter.try_acquire(6000)
+    other_model = TokenBucketLimiter("other-model", rpm=60, tpm=6000, path=limiter.path)
+    assert other_model.try_acquire(6000) == 0
+
+
+class ProviderError(Exception):
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def test_rate_limit_errors_are_classified_by_type_not_message():
+    assert is_rate_limit_error(ProviderError("slow down", status_code=429))
+    assert not is_rate_limit_error(ProviderError("HTTP 429 in request id 4290", status_code=500))
+    assert not is_rate_limit_error(ValueError("quota field missing; rate limit unknown"))
+
+
+def test_rate_limit_error_wrapped_by_another_is_found():
+    try:
+        try:
+            raise ProviderError("too many requests", status_code=429)
+        except ProviderError as e:
+            raise RuntimeError("crew failed") from e
+    except RuntimeError as wrapped:
+        assert is_rate_limit_error(wrapped)
+
+
+def test_backoff_respects_retry_after():
+    assert backoff_delay(1, retry_after=7.5) >= 7.5
+    for attempt in range(1, 10):
+        assert 0 <= backoff_delay(attempt) <= rate_limiter.RETRY_MAX_DELAY
+    assert retry_after_seconds(ProviderError('{"retryDelay": "12s"}')) == 12.0
@@ -0,0 +1,88 @@
+"""StructuredOutput.from_output: strict JSON, lenient JSON, then the text format."""
+
+import json
+
+import pytest
+
+from schemas import HiringDecision, QuestionGrade, ScreeningVerdict, TechnicalVerdict
+
+
+def test_valid_json_is_used_as_is():
+    raw = json.dumps({"decision": "PASS", "score": 8, "strengths": ["Go"], "reasoning": "Solid."})
+    verdict = TechnicalVerdict.from_output(raw)
+    assert verdict.decision == "PASS"
+    assert verdict.score == 8.0
+    assert verdict.strengths == ["Go"]
+
+
+def test_json_inside_fences_and_prose():
+    raw = 'Here is my verdict:\n```json\n{"decision": "FAIL", "score": 3}\n```\nThanks.'
+    verdict = TechnicalVerdict.from_output(raw)
+    assert (verdict.decision, verdict.score) == ("FAIL", 3.0)
+
+
+@pytest.mark.parametrize(
+    "score, expected",
+    [("8/10", 8.0), ("8.5 / 10", 8.5), ("4/5", 8.0), ("7", 7.0), (14, 10.0), (-2, 0.0), ("n/a", None)],
+)
+def test_lenient_score_coercion(score, expected):
+    raw = json.dumps({"decision": "PASS", "score": score, "reasoning": "ok"})
+    verdict = TechnicalVerdict.from_output(raw)
+    assert verdict.decision == "PASS"  # the agent's decision survives a bad score
+    assert verdict.score == expected
+
+
+def test_lenient_list_and_string_fields():
+    raw = json.dumps({
+        "decision": "borderline",
+        "score": "6/10",
+        "strengths": "- Python\n- SQL",
+        "weaknesses": ["No tests", ""],
+        "reasoning": ["Good fit.", "Needs mentoring."],
+        "recommended_questions": "1. Explain indexing\n2. Design a queue",
+        "confidence": "high",
+    })
+    verdict = ScreeningVerdict.from_output(raw)
+    assert verdict.decision == "BORDERLINE"
+    assert verdict.score == 6.0
+    assert verdict.strengths == ["Python", "SQL"]
+    assert verdict.weaknesses == ["No tests"]
+    assert verdict.reasoning == "Good fit.\nNeeds mentoring."
+    assert verdict.recommended_questions == ["Explain indexing", "Design a queue"]
+
+
+def test_json_with_an_unknown_decision_falls_back_to_the_text_format():
+    raw = '{"decision": "MAYBE", "score": 5}\nDecision: FAIL\nScore: 4 / 10'
+    verdict = TechnicalVerdict.from_output(raw)
+    assert (verdict.decision, verdict.score) == ("FAIL", 4.0)
+
+
+def test_text_format_without_json():
+    raw = (
+        "Decision: PASS\nScore: 7 / 10\n\n"
+        "Strengths:\n- Clear answers\n\nWeaknesses:\n- (none noted)\n\n"
+        "Reasoning: Meets the bar."
+    )
+    verdict = TechnicalVerdict.from_output(raw)
+    assert verdict.decision == "PASS"
+    assert verdict.score == 7.0
+    assert verdict.strengths == ["Clear answers"]
+    assert verdict.weaknesses == []
+    assert verdict.reasoning == "Meets the bar."
+
+
+def test_unreadable_output_uses_the_safe_default():
+    assert TechnicalVerdict.from_output("I think they did fine.").decision == "FAIL"
+    assert HiringDecision.from_output("No idea.").decision == "HOLD"
+
+
+def test_truncated_json_keeps_its_decision_and_score():
+    raw = '{"decision": "PASS", "score": 9, "reasoning": "Strong on distrib'
+    verdict = TechnicalVerdict.from_output(raw)
+    assert (verdict.decision, verdict.score) == ("PASS", 9.0)
+
+
+def test_question_grade_without_decision():
+    grade = QuestionGrade.from_output('{"score": "9/10", "strengths": "Correct"}')
+    assert grade.score == 9.0
+    assert grade.strengths == ["Correct"]
@@ -0,0 +1,73 @@
+"""POST /screen/batch: per-resume events and the final ranking by score."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import pipeline
+import routes
+
+ROLE = "Backend Developer"
+
+# resume text -> (decision, score, seconds until its screening finishes)
+VERDICTS = {
+    "resume a": ("BORDERLINE", 5.0, 0.00),
+    "resume b": ("PASS", None, 0.05),
+    "resume c": ("PASS", 9.0, 0.20),
+    "resume d": ("PASS", 7.0, 0.10),
+    "resume e": ("FAIL", 2.0, 0.15),
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def fake_screening(interview_id, resume, role):
+        decision, score, delay = VERDICTS[resume]
+        await asyncio.sleep(delay)
+        return {"decision": decision, "score": score, "verdict": f"{decision}: {resume}", "prescreen": None}
+
+    monkeypatch.setattr(pipeline, "run_screening", fake_screening)
+    app = FastAPI()
+    app.include_router(routes.router)
+    return TestClient(app)
+
+
+def events(response) -> list:
+    parsed = []
+    for block in response.text.split("\n\n"):
+        if not block.strip():
+            continue
+        event, data = block.split("\n", 1)
+        parsed.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return parsed
+
+
+def test_ranking_orders_by_score_with_unscored_last(client):
+    resumes = ["resume a", "resume b", "  ", "resume c", "resume d", "resume e"]
+    response = client.post("/screen/batch", json={"resumes": resumes, "role": ROLE})
+    assert response.status_code == 200
+    stream = events(response)
+
+    assert stream[0] == ("error", {"index": 2, "detail": "Resume is empty."})
+    event, summary = stream[-1]
+    assert event == "done"
+    assert [entry["index"] for entry in summary["ranking"]] == [3, 4, 0, 5, 1]
+    assert [entry["score"] for entry in summary["ranking"]] == [9.0, 7.0, 5.0, 2.0, None]
+    assert summary["screened"] == 5 and summary["failed"] == 1
+
+
+def test_result_events_carry_the_rank_so_far(client):
+    resumes = ["resume a", "resume b", "resume c", "resume d", "resume e"]
+    response = client.post("/screen/batch", json={"resumes": resumes, "role": ROLE})
+    results = [data for event, data in events(response) if event == "result"]
+
+    # Finish order a, b, d, e, c: each rank is among those screened so far
+    assert [(r["index"], r["rank"]) for r in results] == [(0, 1), (1, 2), (3, 1), (4, 3), (2, 1)]
+
+
+def test_batch_of_only_empty_resumes_is_rejected(client):
+    response = client.post("/screen/batch", json={"resumes": ["", " "], "role": ROLE})
+    assert response.status_code == 400
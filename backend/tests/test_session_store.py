@@ -0,0 +1,146 @@
+"""Session backends, with a local fake standing in for Redis."""
+
+import pytest
+
+from session_store import (
+    InMemorySessionBackend,
+    RedisSessionBackend,
+    SQLiteSessionBackend,
+    VersionConflict,
+)
+
+
+class WatchError(Exception):
+    """A fake client's own WATCH abort (not redis.exceptions.WatchError)."""
+
+
+class FakeRedis:
+    """Just enough of a Redis client for RedisSessionBackend."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttl = {}
+        self.on_multi = None  # called between WATCH and EXEC, to simulate a racing writer
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode("utf-8") if isinstance(value, str) else value
+        self.ttl[key] = ex
+
+    def expire(self, key, seconds):
+        self.ttl[key] = seconds
+
+    def delete(self, key):
+        self.data.pop(key, None)
+        self.ttl.pop(key, None)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedis):
+        self.client = client
+        self.watched = {}
+        self.queued = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def watch(self, key):
+        self.watched[key] = self.client.data.get(key)
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def multi(self):
+        if self.client.on_multi is not None:
+            self.client.on_multi()
+
+    def set(self, key, value, ex=None):
+        self.queued.append((key, value, ex))
+
+    def execute(self):
+        for key, seen in self.watched.items():
+            if self.client.data.get(key) != seen:
+                raise WatchError(f"{key} changed")
+        for key, value, ex in self.queued:
+            self.client.set(key, value, ex=ex)
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return InMemorySessionBackend(ttl_seconds=60)
+    if request.param == "sqlite":
+        return SQLiteSessionBackend(str(tmp_path / "sessions.db"), ttl_seconds=60)
+    return RedisSessionBackend(FakeRedis(), ttl_seconds=60)
+
+
+def test_round_trip_and_delete(backend):
+    backend.set("a", {"version": 0, "round": 1})
+    assert backend.get("a") == {"version": 0, "round": 1}
+    assert backend.get("b") is None
+    backend.delete("a")
+    assert backend.get("a") is None
+    backend.delete("a")
+
+
+def test_versioned_save_advances(backend):
+    backend.set("a", {"version": 0})
+    backend.set("a", {"version": 1}, expected_version=0)
+    backend.set("a", {"version": 2}, expected_version=1)
+    assert backend.get("a")["version"] == 2
+
+
+def test_stale_save_conflicts(backend):
+    backend.set("a", {"version": 0})
+    backend.set("a", {"version": 1, "by": "first"}, expected_version=0)
+    with pytest.raises(VersionConflict):
+        backend.set("a", {"version": 1, "by": "second"}, expected_version=0)
+    assert backend.get("a")["by"] == "first"
+
+
+def test_save_of_a_missing_state_conflicts(backend):
+    backend.set("a", {"version": 0})
+    backend.delete("a")
+    with pytest.raises(VersionConflict):
+        backend.set("a", {"version": 1}, expected_version=0)
+    assert backend.get("a") is None
+
+
+def test_redis_write_during_save_conflicts():
+    client = FakeRedis()
+    backend = RedisSessionBackend(client, ttl_seconds=60)
+    backend.set("a", {"version": 0})
+    client.on_multi = lambda: client.set("interview:a", '{"version": 1, "by": "racer"}')
+    with pytest.raises(VersionConflict):
+        backend.set("a", {"version": 1, "by": "us"}, expected_version=0)
+    assert backend.get("a")["by"] == "racer"
+
+
+def test_redis_other_errors_propagate():
+    client = FakeRedis()
+    backend = RedisSessionBackend(client, ttl_seconds=60)
+    backend.set("a", {"version": 0})
+
+    def fail():
+        raise ConnectionError("connection lost")
+
+    client.on_multi = fail
+    with pytest.raises(ConnectionError):
+        backend.set("a", {"version": 1}, expected_version=0)
+
+
+def test_redis_get_refreshes_ttl():
+    client = FakeRedis()
+    backend = RedisSessionBackend(client, ttl_seconds=60)
+    backend.set("a", {"version": 0})
+    client.ttl["interview:a"] = 5
+    backend.get("a")
+    assert client.ttl["interview:a"] == 60
@@ -0,0 +1,106 @@
+"""
+Warm-up — when CrewAI is imported and the agents are built.
+
+CrewAI (and LiteLLM under it) is most of the app's import time, so no
+module imports it at load: agents.py, tasks.py, prompts.py and
+crew_runner.py import it on first use. STARTUP_WARMUP decides when that
+first use happens:
+  - blocking   (default) — at startup, before the worker accepts requests
+  - background — in a background task; the worker serves at once and
+                 GET /ready answers 503 until it is warm
+  - lazy       — not until the first crew run (serverless cold starts);
+                 /ready answers 200 straight away
+A crew run that arrives before the warm-up finishes waits for it, off
+the event loop.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "blocking")
+if STARTUP_WARMUP not in ("blocking", "background", "lazy"):
+    raise ValueError(
+        f"STARTUP_WARMUP must be blocking, background or lazy, not {STARTUP_WARMUP!r}"
+    )
+
+_lock = threading.Lock()
+_loaded = threading.Event()
+_warm = threading.Event()
+_timings: dict = {}
+_error: dict = {}
+_background_task = None
+
+
+def load() -> None:
+    """Import CrewAI and the modules built on it (idempotent, thread-safe)."""
+    if _loaded.is_set():
+        return
+    with _lock:
+        if _loaded.is_set():
+            return
+        started = time.perf_counter()
+        import crewai  # noqa: F401
+        import litellm  # noqa: F401
+
+        _timings["import_seconds"] = round(time.perf_counter() - started, 3)
+        _loaded.set()
+        logger.info(f"CrewAI imported in {_timings['import_seconds']}s")
+
+
+async def ensure_loaded() -> None:
+    """load(), off the event loop — a no-op once loaded."""
+    if not _loaded.is_set():
+        await asyncio.to_thread(load)
+
+
+def warm(agent_pool) -> None:
+    """load(), then build one agent of every kind in agent_pool."""
+    try:
+        load()
+        started = time.perf_counter()
+        agent_pool.warm()
+        _timings["agents_seconds"] = round(time.perf_counter() - started, 3)
+    except Exception as e:
+        _error["detail"] = f"{type(e).__name__}: {e}"
+        logger.error(f"Warm-up failed: {e}")
+        raise
+    _warm.set()
+    logger.info(f"Warm: {_timings}")
+
+
+async def start(agent_pool) -> None:
+    """Run the warm-up the way STARTUP_WARMUP asks (app startup)."""
+    global _background_task
+    if STARTUP_WARMUP == "blocking":
+        await asyncio.to_thread(warm, agent_pool)
+    elif STARTUP_WARMUP == "background":
+        _background_task = asyncio.create_task(_warm_in_background(agent_pool))
+
+
+async def _warm_in_background(agent_pool) -> None:
+    try:
+        await asyncio.to_thread(warm, agent_pool)
+    except Exception:
+        pass  # logged and reported by status(); crew runs still load on first use
+
+
+def is_ready() -> bool:
+    """Warm, or STARTUP_WARMUP=lazy (nothing to wait for before serving)."""
+    return _warm.is_set() or STARTUP_WARMUP == "lazy"
+
+
+def status() -> dict:
+    """Readiness and warm-up timings for GET /ready."""
+    return {
+        "ready": is_ready(),
+        "warm": _warm.is_set(),
+        "mode": STARTUP_WARMUP,
+        "crewai_loaded": _loaded.is_set(),
+        **dict(_timings),
+        **({"error": _error["detail"]} if _error else {}),
+    }
@@ -38,6 +38,9 @@ const itemVariants = {
 export default function InterviewPage() {
   const router = useRouter();
   const [resume, setResume] = useState("");
+  // Set when the resume came from an uploaded file and is unchanged since
+  const [resumeId, setResumeId] = useState<string | null>(null);
+  const [uploading, setUploading] = useState(false);
   const [role, setRole] = useState("");
   const [roles, setRoles] = useState<string[]>([]);
   const [loading, setLoading] = useState(false);
@@ -53,6 +56,28 @@ export default function InterviewPage() {
       .catch(() => setRoles(["SDE 1", "AI Engineer", "Backend Developer"]));
   }, []);
 
+  const handleUpload = async (e: React.ChangeEvent<HTMLInputElement>) => {
+    const file = e.target.files?.[0];
+    e.target.value = "";
+    if (!file) return;
+
+    setUploading(true);
+    setError(null);
+    try {
+      const form = new FormData();
+      form.append("files", file);
+      const res = await fetch(`${API_BASE}/resumes`, { method: "POST", body: form });
+      const data = await res.json();
+      if (!res.ok) throw new Error(data.detail || "Could not read that file.");
+      setResume(data.resumes[0].text);
+      setResumeId(data.resumes[0].resume_id);
+    } catch (err: any) {
+      setError(err.message || "Could not read that file.");
+    } finally {
+      setUploading(false);
+    }
+  };
+
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     if (!resume.trim() || !role) return;
@@ -68,13 +93,13 @@ export default function InterviewPage() {
     await enterFullscreen();
 
     try {
-      // Reset backend state
-      await fetch(`${API_BASE}/reset`, { method: "POST" });
-
+      // Each /start creates its own isolated interview session
       const res = await fetch(`${API_BASE}/start`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ resume: resume.trim(), role }),
+        body: JSON.stringify(
+          resumeId ? { resume_id: resumeId, role } : { resume: resume.trim(), role }
+        ),
       });
 
       if (!res.ok) {
@@ -91,6 +116,7 @@ export default function InterviewPage() {
       const data = await res.json();
 
       // Store screening result and next question for round 2
+      sessionStorage.setItem("interview_id", data.interview_id || "");
       sessionStorage.setItem("round1_verdict", data.verdict || "");
       sessionStorage.setItem("round1_decision", data.decision || "");
       sessionStorage.setItem("interview_role", role);
@@ -244,7 +270,7 @@ export default function InterviewPage() {
               Start Your Interview
             </motion.h2>
             <motion.p className="text-gray-400 mb-4 text-sm leading-relaxed">
-              Paste your resume below. Our AI interview panel will evaluate your
+              Paste or upload your resume below. Our AI interview panel will evaluate your
               qualifications through a multi-round process.
             </motion.p>
 
@@ -281,19 +307,34 @@ export default function InterviewPage() {
               </motion.div>
 
               <motion.div variants={itemVariants}>
-                <label
-                  htmlFor="resume"
-                  className="block text-sm font-medium text-white mb-2"
-                >
-                  Resume / CV
-                </label>
+                <div className="flex items-center justify-between mb-2">
+                  <label
+                    htmlFor="resume"
+                    className="block text-sm font-medium text-white"
+                  >
+                    Resume / CV
+                  </label>
+                  <label className="text-xs text-orange-400 hover:text-orange-300 cursor-pointer">
+                    {uploading ? "Reading file..." : "Upload PDF / DOCX / TXT"}
+                    <input
+                      type="file"
+                      accept=".pdf,.docx,.txt,.md"
+                      className="hidden"
+                      onChange={handleUpload}
+                      disabled={loading || uploading}
+                    />
+                  </label>
+                </div>
                 <textarea
                   id="resume"
                   rows={8}
                   className="w-full rounded-lg border border-white/10 bg-white/5 px-3 py-2 text-sm text-white placeholder-gray-500 focus:outline-none focus:ring-2 focus:ring-orange-500 focus:border-transparent resize-y backdrop-blur-sm transition-all"
                   placeholder={`Paste your resume here...\n\nExample:\nJohn Doe - Software Engineer | 5 years experience\nSkills: Python, TypeScript, React, PostgreSQL, AWS\n\nExperience:\n- Senior Engineer at TechCorp (2022-present)\n- Software Engineer at StartupXYZ (2019-2022)`}
                   value={resume}
-                  onChange={(e) => setResume(e.target.value)}
+                  onChange={(e) => {
+                    setResume(e.target.value);
+                    setResumeId(null);
+                  }}
                   disabled={loading}
                 />
               </motion.div>
@@ -310,7 +351,7 @@ export default function InterviewPage() {
 
               <motion.button
                 type="submit"
-                disabled={loading || !resume.trim() || !role}
+                disabled={loading || uploading || !resume.trim() || !role}
                 className="w-full py-2.5 px-4 rounded-lg bg-gradient-to-r from-orange-600 to-orange-700 hover:from-orange-500 hover:to-orange-600 disabled:from-gray-700 disabled:to-gray-800 text-white font-medium text-sm transition-all flex items-center justify-center gap-2 disabled:opacity-50"
                 whileHover={{ scale: 1.01 }}
                 whileTap={{ scale: 0.99 }}
@@ -97,7 +97,10 @@ export default function ResultPage() {
     setLoading(true);
     setError(null);
     try {
-      const res = await fetch(`${API_BASE}/final-decision`);
+      const interviewId = sessionStorage.getItem("interview_id") || "";
+      const res = await fetch(
+        `${API_BASE}/final-decision?interview_id=${encodeURIComponent(interviewId)}`
+      );
       if (!res.ok) {
         let detail = "Failed to fetch final decision.";
         try {
@@ -10,6 +10,7 @@ import FullscreenWarning from "../../components/FullscreenWarning";
 // import GazeWarning from "../../components/GazeWarning";
 import WebcamPreview from "../../components/WebcamPreview";
 import { WebcamPixelGrid } from "../../components/ui/webcam-pixel-grid";
+import { postStream, reasoningPreview } from "../../../lib/sse";
 
 const API_BASE = "/api";
 
@@ -55,6 +56,9 @@ export default function RoundPage() {
   const [answer, setAnswer] = useState("");
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  // Live assessment while the answer is evaluated: the verdict's reasoning
+  // as it streams, then the rendered verdict
+  const [preview, setPreview] = useState("");
   const { showWarning, dismissWarning } = useFullscreen();
 
   // Simple webcam stream (no face-api.js / gaze tracking for now)
@@ -103,26 +107,28 @@ export default function RoundPage() {
 
     setLoading(true);
     setError(null);
+    setPreview("");
+    let raw = "";
 
     try {
-      const res = await fetch(`${API_BASE}/round/${roundId}/answer`, {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ answer: answer.trim() }),
-      });
-
-      if (!res.ok) {
-        let detail = "Failed to submit answer.";
-        try {
-          const data = await res.json();
-          detail = data.detail || detail;
-        } catch {
-          if (res.status === 429) detail = "AI rate limit reached. Please wait a minute and try again.";
-        }
-        throw new Error(detail);
-      }
-
-      const data = await res.json();
+      const data = await postStream(
+        `${API_BASE}/round/${roundId}/answer/stream`,
+        {
+          interview_id: sessionStorage.getItem("interview_id") || "",
+          answer: answer.trim(),
+        },
+        {
+          // Token events are raw JSON: only show the reasoning text in it
+          onToken: (stage, text) => {
+            if (stage !== "verdict") return;
+            raw += text;
+            setPreview(reasoningPreview(raw));
+          },
+          onRendered: (stage, text) => {
+            if (stage === "verdict") setPreview(text);
+          },
+        },
+      );
 
       // Store verdict
       sessionStorage.setItem(`round${roundId}_verdict`, data.verdict || "");
@@ -240,6 +246,17 @@ export default function RoundPage() {
             />
           </motion.div>
 
+          {loading && preview && (
+            <motion.div initial={{ opacity: 0 }} animate={{ opacity: 1 }} className="rounded-xl bg-white/5 border border-white/10 px-4 py-3">
+              <div className="text-xs font-semibold text-orange-400 uppercase tracking-wider mb-2">
+                Live Assessment
+              </div>
+              <div className="text-gray-300 text-sm whitespace-pre-wrap leading-relaxed">
+                {preview}
+              </div>
+            </motion.div>
+          )}
+
           {error && (
             <motion.div initial={{ opacity: 0, y: -10 }} animate={{ opacity: 1, y: 0 }} className="rounded-xl bg-red-500/10 border border-red-500/20 px-4 py-3 text-sm text-red-400">
               {error}
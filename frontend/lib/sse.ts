@@ -0,0 +1,111 @@
+// Client for the backend's server-sent event endpoints (`/start/stream`,
+// `/round/{2,3}/answer/stream`, `/final-decision/stream`).
+//
+// `token` events are raw model output — fragments of the task's JSON — and
+// are not meant to be shown as is; `rendered` events carry the readable
+// verdict / question once a step is done; `result` carries the same payload
+// as the blocking endpoint, and `error` a {status_code, detail}.
+
+export type StreamHandlers = {
+  onToken?: (stage: string, text: string) => void;
+  onRendered?: (stage: string, text: string) => void;
+};
+
+export class StreamError extends Error {
+  status: number;
+
+  constructor(message: string, status: number) {
+    super(message);
+    this.status = status;
+  }
+}
+
+function parseEvent(block: string): { event: string; data: any } | null {
+  let event = "message";
+  const data: string[] = [];
+  for (const line of block.split("\n")) {
+    if (line.startsWith("event:")) event = line.slice(6).trim();
+    else if (line.startsWith("data:")) data.push(line.slice(5).trimStart());
+  }
+  if (!data.length) return null;
+  try {
+    return { event, data: JSON.parse(data.join("\n")) };
+  } catch {
+    return null;
+  }
+}
+
+/** POST `body` to an SSE endpoint; resolves with the `result` payload. */
+export async function postStream(url: string, body: unknown, handlers: StreamHandlers = {}): Promise<any> {
+  const res = await fetch(url, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", Accept: "text/event-stream" },
+    body: JSON.stringify(body),
+  });
+  if (!res.ok || !res.body) {
+    let detail = "Request failed.";
+    try {
+      const data = await res.json();
+      detail = data.detail || detail;
+    } catch {
+      if (res.status === 429) detail = "AI rate limit reached. Please wait a minute and try again.";
+    }
+    throw new StreamError(detail, res.status);
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary !== -1) {
+      const parsed = parseEvent(buffer.slice(0, boundary));
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf("\n\n");
+      if (!parsed) continue;
+      const { event, data } = parsed;
+      if (event === "token") handlers.onToken?.(data.stage, data.text);
+      else if (event === "rendered") handlers.onRendered?.(data.stage, data.text);
+      else if (event === "result") return data;
+      else if (event === "error") throw new StreamError(data.detail || "Something went wrong.", data.status_code || 500);
+    }
+  }
+  throw new StreamError("The stream ended before a result arrived.", 502);
+}
+
+const ESCAPES: Record<string, string> = { n: "\n", t: "\t", r: "", '"': '"', "\\": "\\", "/": "/" };
+
+/**
+ * The readable part of a verdict's raw JSON so far: the (possibly still
+ * incomplete) "reasoning" string, unescaped. Empty until it starts.
+ */
+export function reasoningPreview(raw: string): string {
+  const key = raw.indexOf('"reasoning"');
+  if (key === -1) return "";
+  const start = raw.indexOf('"', raw.indexOf(":", key) + 1);
+  if (start === -1) return "";
+  let text = "";
+  for (let i = start + 1; i < raw.length; i++) {
+    const ch = raw[i];
+    if (ch === '"') break;
+    if (ch !== "\\") {
+      text += ch;
+      continue;
+    }
+    const next = raw[i + 1];
+    if (next === undefined) break;
+    if (next === "u") {
+      const hex = raw.slice(i + 2, i + 6);
+      if (hex.length < 4) break;
+      text += String.fromCharCode(parseInt(hex, 16));
+      i += 5;
+    } else {
+      text += ESCAPES[next] ?? next;
+      i += 1;
+    }
+  }
+  return text;
+}